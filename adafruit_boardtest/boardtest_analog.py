@@ -0,0 +1,293 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_boardtest.boardtest_analog`
+====================================================
+Characterises the ADC on every analog pin in one pass. A known voltage is put
+on all of the pins at once, either swept by the DAC or held by a resistor
+divider on the fixture. Every pin reads it in batches, and the offset, gain
+error and integral nonlinearity (INL) of each pin are worked out from the
+readings, along with how long one conversion takes.
+
+Run this script as its own main.py to individually run the test, or compile
+with mpy-cross and call from separate test script.
+
+* Author(s): Adafruit Industries
+
+Implementation Notes
+--------------------
+
+**Hardware:**
+
+* 1x 1k Ohm resistor per analog pin, from the DAC pin to the analog pin
+* or, on boards without a DAC, 2x 10k Ohm resistors as a divider from 3.3V
+  to GND, with 1x 1k Ohm resistor from the middle to each analog pin
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://github.com/adafruit/circuitpython/releases
+
+"""
+
+import array
+import time
+
+import board
+import analogio
+
+from adafruit_boardtest import pincatalog, pinnames, timing
+
+try:
+    from typing import Any, Dict, Optional, Sequence, Tuple, List
+    from adafruit_boardtest.fixture import Instrument
+    from adafruit_boardtest.timing import PhaseTimer
+except ImportError:
+    pass
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_BoardTest.git"
+
+# Constants
+DAC_PIN_NAME = pinnames.DAC
+ANALOG_REF = 3.3  # Reference analog voltage
+ANALOGIN_BITS = 16  # ADC resolution (bits) for CircuitPython
+DIVIDER_VOLTAGE = ANALOG_REF / 2  # Fixture divider made of two equal resistors
+SWEEP_STEPS = 8  # DAC levels in a sweep
+SWEEP_LOW = 0.1  # Lowest DAC level, as a fraction of full scale
+SWEEP_HIGH = 0.9  # Highest DAC level, as a fraction of full scale
+BATCH_SIZE = 32  # Readings averaged per pin at each level
+SETTLE_TIME = 0.001  # Seconds to wait after changing the DAC level
+MAX_OFFSET = 0.05  # Largest acceptable offset, in volts
+MAX_GAIN_ERROR = 0.03  # Largest acceptable gain error, as a fraction
+MAX_INL = 0.03  # Largest acceptable distance from the fitted line, in volts
+
+# Test result strings
+PASS = "PASS"
+FAIL = "FAIL"
+NA = "N/A"
+
+
+# Release pins
+def _deinit_pins(adcs: Sequence[analogio.AnalogIn]) -> None:
+    for adc in adcs:
+        adc.deinit()
+
+
+# Convert a 16-bit reading to volts
+def _volts(value: float) -> float:
+    return (value * ANALOG_REF) / (2**ANALOGIN_BITS)
+
+
+# Use the DAC as the reference if the pin has one
+def _open_dac(dac_pin: str) -> Optional[analogio.AnalogOut]:
+    if not hasattr(analogio, "AnalogOut") or not hasattr(board, dac_pin):
+        return None
+    try:
+        return analogio.AnalogOut(getattr(board, dac_pin))
+    except ValueError:
+        return None
+
+
+# Fill the buffer with readings. Returns the sum of the readings and the time
+# taken in nanoseconds
+def _read_batch(adc: analogio.AnalogIn, samples: array.array) -> Tuple[int, int]:
+    count = len(samples)
+    start = time.monotonic_ns()
+    for i in range(count):
+        samples[i] = adc.value
+    duration_ns = time.monotonic_ns() - start
+    total = 0
+    for value in samples:
+        total += value
+    return total, duration_ns
+
+
+# Least squares line through the readings. Returns the offset, the gain and
+# the largest distance of a reading from the line
+def _fit(
+    expected: Sequence[float], measured: Sequence[float]
+) -> Tuple[float, float, float]:
+    count = len(expected)
+    sum_x = sum(expected)
+    sum_y = sum(measured)
+    sum_xx = 0.0
+    sum_xy = 0.0
+    for i in range(count):
+        sum_xx += expected[i] * expected[i]
+        sum_xy += expected[i] * measured[i]
+    gain = (count * sum_xy - sum_x * sum_y) / (count * sum_xx - sum_x * sum_x)
+    offset = (sum_y - gain * sum_x) / count
+    inl = 0.0
+    for i in range(count):
+        inl = max(inl, abs(measured[i] - (gain * expected[i] + offset)))
+    return offset, gain, inl
+
+
+# Read every pin at every reference level, one level at a time
+def _sweep(
+    adcs: Sequence[analogio.AnalogIn],
+    dac: Optional[analogio.AnalogOut],
+    levels: Sequence[float],
+    batch_size: int,
+) -> Tuple[List[List[float]], List[int]]:
+    samples = array.array("H", (0 for _ in range(batch_size)))
+    measured = [[] for _ in adcs]
+    conversion_ns = [0] * len(adcs)
+    for level in levels:
+        if dac is not None:
+            dac.value = min(int(level * (2**ANALOGIN_BITS) / ANALOG_REF), 65535)
+            time.sleep(SETTLE_TIME)
+        for i, adc in enumerate(adcs):
+            total, duration_ns = _read_batch(adc, samples)
+            measured[i].append(_volts(total / batch_size))
+            conversion_ns[i] += duration_ns
+    reads = batch_size * len(levels)
+    return measured, [duration_ns // reads for duration_ns in conversion_ns]
+
+
+# Work out the errors of one pin from its readings and print them. With a
+# single level, only the offset can be found
+def _evaluate(
+    pin: str, levels: Sequence[float], readings: Sequence[float], conversion_ns: int
+) -> Dict[str, Any]:
+    if len(levels) > 1:
+        offset, gain, inl = _fit(levels, readings)
+        gain_error = gain - 1
+    else:
+        offset = readings[0] - levels[0]
+        gain_error = None
+        inl = None
+    ok = (
+        abs(offset) <= MAX_OFFSET
+        and (gain_error is None or abs(gain_error) <= MAX_GAIN_ERROR)
+        and (inl is None or inl <= MAX_INL)
+    )
+
+    print(pin + ": offset {:.1f}".format(offset * 1000) + " mV", end=", ")
+    if gain_error is not None:
+        print("gain error {:.2f}".format(gain_error * 100) + " %", end=", ")
+        print("INL {:.1f}".format(inl * 1000) + " mV", end=", ")
+    print(str(conversion_ns // 1000) + " us/read", end=" ")
+    print(PASS if ok else FAIL)
+    return {
+        "offset": offset,
+        "gain_error": gain_error,
+        "inl": inl,
+        "conversion_ns": conversion_ns,
+        "readings": readings,
+        "passed": ok,
+    }
+
+
+def run_test(  # pylint: disable=too-many-arguments,too-many-locals
+    pins: Sequence[str],
+    instrument: Optional[Instrument] = None,
+    report: Optional[Dict[str, Any]] = None,
+    timer: Optional[PhaseTimer] = None,
+    dac_pin: str = DAC_PIN_NAME,
+    divider_voltage: float = DIVIDER_VOLTAGE,
+    batch_size: int = BATCH_SIZE,
+) -> Tuple[str, List[str]]:
+    """
+    Measures the offset, gain error, INL and conversion time of the ADC on
+    every analog pin.
+
+    If ``dac_pin`` has a DAC, it is swept through `SWEEP_STEPS` levels
+    between `SWEEP_LOW` and `SWEEP_HIGH` of full scale, and every analog pin
+    reads each level ``batch_size`` times. A straight line fitted through the
+    averages gives the offset and gain, and the reading furthest from the
+    line gives the INL. Without a DAC, every pin reads the fixture divider at
+    ``divider_voltage`` instead, which only gives the offset.
+
+    :param list[str] pins: list of pins to run the test on
+    :param instrument: optional callable from `adafruit_boardtest.fixture`.
+        When given, the prompt to connect the fixture is skipped
+    :param dict report: optional dictionary that is filled with the offset,
+        gain error, INL and conversion time of every pin
+    :param PhaseTimer timer: optional `adafruit_boardtest.timing.PhaseTimer`
+        that records how long each phase takes
+    :param str dac_pin: pin name of the DAC output
+    :param float divider_voltage: voltage of the fixture divider, used on
+        boards without a DAC
+    :param int batch_size: readings averaged per pin at each level
+    :return: tuple(str, list[str]): test result followed by list of pins tested
+    """
+
+    # Use the DAC as the reference if there is one
+    timer = timing.resolve(timer)
+    timer.phase("setup")
+    dac = _open_dac(dac_pin) if dac_pin in pins else None
+
+    # Create a list of analog pins, one name per physical pin, leaving out
+    # the DAC
+    catalog = pincatalog.catalog(pins)
+    analog_pins = [
+        p
+        for p in catalog.with_class(pincatalog.CLASS_ANALOG)
+        if dac is None or catalog.primary(p) != catalog.primary(dac_pin)
+    ]
+    if not analog_pins:
+        if dac is not None:
+            dac.deinit()
+        timer.stop()
+        print("No analog pins found")
+        return NA, []
+
+    # Print out the analog pins found
+    print("Analog pins found:", end=" ")
+    for pin in analog_pins:
+        print(pin, end=" ")
+    print("\n")
+
+    # Tell user to connect the reference
+    if instrument is None:
+        timer.phase("prompt")
+        if dac is not None:
+            print("Connect " + dac_pin + " to every analog pin listed above", end="")
+            print(" through a 1k resistor each.")
+        else:
+            print("Connect the middle of a resistor divider between 3.3V and", end="")
+            print(" GND to every analog pin listed above through a 1k resistor")
+            print("each.")
+        print("Press enter to continue.")
+        input()
+
+    # Read every pin at every level
+    timer.phase("setup")
+    adcs = [analogio.AnalogIn(getattr(board, p)) for p in analog_pins]
+    if dac is not None:
+        step = (SWEEP_HIGH - SWEEP_LOW) / (SWEEP_STEPS - 1)
+        levels = [(SWEEP_LOW + i * step) * ANALOG_REF for i in range(SWEEP_STEPS)]
+    else:
+        levels = [divider_voltage]
+    timer.phase("test")
+    measured, conversion_ns = _sweep(adcs, dac, levels, batch_size)
+
+    # Release pins
+    timer.phase("teardown")
+    _deinit_pins(adcs)
+    if dac is not None:
+        dac.deinit()
+
+    # Work out the errors of every pin
+    timer.phase("verify")
+    results = {}
+    for i, pin in enumerate(analog_pins):
+        results[pin] = _evaluate(pin, levels, measured[i], conversion_ns[i])
+    print()
+    timer.stop()
+
+    if report is not None:
+        report["reference"] = "dac" if dac is not None else "divider"
+        report["levels"] = levels
+        report["pins"] = results
+
+    # The DAC pin was exercised too
+    tested_pins = analog_pins if dac is None else [dac_pin] + analog_pins
+    if all(result["passed"] for result in results.values()):
+        return PASS, tested_pins
+
+    return FAIL, tested_pins
@@ -8,6 +8,16 @@
 Toggles all available GPIO on a board. Verify their operation with an LED,
 multimeter, another microcontroller, etc.
 
+In matrix mode, the pins are wired together in pairs on a loopback fixture
+instead. One pin of each pair drives a walking ones and then a walking zeros
+pattern while the other pin reads it back, which finds open, stuck and
+shorted pins without anyone watching.
+
+Rate mode toggles the pins as fast as possible and measures the toggle rate
+and how much the duration of a block of toggles varies. With a loopback
+fixture, the edges are counted on the other pin of each pair with ``countio``
+where the board has it.
+
 Run this script as its own main.py to individually run the test, or compile
 with mpy-cross and call from separate test script.
 
@@ -23,14 +33,23 @@ Implementation Notes
 
 """
 
+import array
 import time
 
 import board
 import digitalio
-import supervisor
 
 try:
-    from typing import Any, Sequence, Tuple, List
+    import countio
+except ImportError:
+    countio = None
+
+from adafruit_boardtest import fixture, pincatalog, scheduler, timing
+
+try:
+    from typing import Any, Dict, Optional, Sequence, Tuple, List
+    from adafruit_boardtest.fixture import Instrument
+    from adafruit_boardtest.timing import PhaseTimer
 except ImportError:
     pass
 
@@ -41,6 +60,22 @@ __repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_BoardTest.git"
 LED_ON_DELAY_TIME = 0.2  # Seconds
 LED_OFF_DELAY_TIME = 0.2  # Seconds
 LED_PIN_NAMES = ["L", "LED", "RED_LED", "GREEN_LED", "BLUE_LED"]
+SETTLE_TIME = 0.001  # Seconds to let the levels settle before reading back
+RATE_WINDOW = 0.5  # Seconds each rate measurement toggles for
+RATE_BLOCK = 64  # Toggles between two timestamps in rate mode
+MAX_RATE_BLOCKS = 512  # Timestamps kept per rate measurement
+
+# Test modes
+MODE_TOGGLE = "toggle"
+MODE_MATRIX = "matrix"
+MODE_RATE = "rate"
+
+# Pin faults found by the matrix mode
+FAULT_OK = "ok"
+FAULT_OPEN = "open"
+FAULT_STUCK_LOW = "stuck low"
+FAULT_STUCK_HIGH = "stuck high"
+FAULT_SHORT = "short"
 
 # Test result strings
 PASS = "PASS"
@@ -48,77 +83,446 @@ FAIL = "FAIL"
 NA = "N/A"
 
 
-# Determine if given value is a number
-def _is_number(val: Any) -> bool:
-    try:
-        float(val)
-        return True
-    except ValueError:
-        return False
-
-
 # Release pins
 def _deinit_pins(gpios: Sequence[digitalio.DigitalInOut]) -> None:
     for g in gpios:
         g.deinit()
 
 
-# Toggle IO pins while waiting for answer
-def _toggle_wait(gpios: Sequence[digitalio.DigitalInOut]) -> bool:
+# Blink all the pins together while waiting for answer
+def _toggle_wait(
+    blinker: scheduler.BlinkScheduler, instrument: Optional[Instrument]
+) -> bool:
+    question = "Are the pins listed above toggling? [y/n]"
+    timeout = None if instrument is None else fixture.INSTRUMENT_TIMEOUT
+    print(question)
+    answer = blinker.run(lambda: fixture.poll_answer(question, instrument), timeout)
+    if answer is None:
+        print("No answer from instrument")
+        return False
+    return answer
+
+
+# Blink the pins until someone confirms they are toggling
+def _run_toggle_test(
+    gpio_pins: Sequence[str],
+    instrument: Optional[Instrument],
+    report: Optional[Dict[str, Any]],
+    timer: PhaseTimer,
+) -> bool:
+    # Set up every pin as an output once, off for the first half period
+    timer.phase("setup")
+    blinker = scheduler.BlinkScheduler()
+    for pin in gpio_pins:
+        blinker.add(
+            pin,
+            LED_OFF_DELAY_TIME + LED_ON_DELAY_TIME,
+            LED_ON_DELAY_TIME,
+            LED_OFF_DELAY_TIME,
+        )
+
+    # Print out the LEDs found
+    print("GPIO pins found:", end=" ")
+    for pin in gpio_pins:
+        print(pin, end=" ")
+    print("\n")
+
+    # Toggle pins while waiting for user to verify LEDs blinking
+    timer.phase("test")
     timestamp = time.monotonic()
-    led_state = False
-    print("Are the pins listed above toggling? [y/n]")
-    while True:
-        if led_state:
-            if time.monotonic() > timestamp + LED_ON_DELAY_TIME:
-                led_state = False
-                timestamp = time.monotonic()
-        else:
-            if time.monotonic() > timestamp + LED_OFF_DELAY_TIME:
-                led_state = True
-                timestamp = time.monotonic()
-        for gpio in gpios:
-            gpio.value = led_state
-        if supervisor.runtime.serial_bytes_available:
-            answer = input()
-            return bool(answer == "y")
-
-
-def run_test(pins: Sequence[str]) -> Tuple[str, List[str]]:
+    result = _toggle_wait(blinker, instrument)
+    if report is not None:
+        report["response_s"] = time.monotonic() - timestamp
+
+    # Release pins
+    timer.phase("teardown")
+    blinker.deinit()
+    timer.stop()
+
+    return result
+
+
+# Pair each pin with the next one, dropping the last pin if there is an odd
+# number of them
+def _default_pairs(gpio_pins: Sequence[str]) -> List[Tuple[str, str]]:
+    return [(gpio_pins[i], gpio_pins[i + 1]) for i in range(0, len(gpio_pins) - 1, 2)]
+
+
+# Walk one level across the outputs: each step drives it on one output and
+# the opposite level on all the others, then reads every input. Counts, for
+# each input, the steps where it read the walking level on its own step and
+# on other steps, and notes which other outputs it followed
+def _walk(  # pylint: disable=too-many-arguments
+    drives: Sequence[digitalio.DigitalInOut],
+    senses: Sequence[digitalio.DigitalInOut],
+    level: bool,
+    followed: bytearray,
+    others: List[int],
+    partners: List[List[int]],
+) -> None:
+    # Pull the inputs to the opposite level, so an open input never reads
+    # the walking level
+    pull = digitalio.Pull.DOWN if level else digitalio.Pull.UP
+    for sense in senses:
+        sense.pull = pull
+
+    for step in range(len(drives)):
+        for i, drive in enumerate(drives):
+            drive.value = level if i == step else not level
+        time.sleep(SETTLE_TIME)
+        for i, sense in enumerate(senses):
+            if sense.value != level:
+                continue
+            if i == step:
+                followed[i] += 1
+            else:
+                others[i] += 1
+                if step not in partners[i]:
+                    partners[i].append(step)
+
+
+# Work out the fault of a pair from what its input read during both walks
+def _classify(
+    count: int, one: int, zero: int, high_elsewhere: int, low_elsewhere: int
+) -> str:
+    elsewhere = high_elsewhere or low_elsewhere
+    if one and zero and not elsewhere:
+        return FAULT_OK
+    if not one and not zero and not elsewhere:
+        return FAULT_OPEN
+    if not one and zero and not high_elsewhere and low_elsewhere == count - 1:
+        return FAULT_STUCK_LOW
+    if one and not zero and high_elsewhere == count - 1 and not low_elsewhere:
+        return FAULT_STUCK_HIGH
+    return FAULT_SHORT
+
+
+# Set up the first pin of each pair as an output and the second as an input
+def _matrix_pins(
+    pairs: Sequence[Tuple[str, str]]
+) -> Tuple[List[digitalio.DigitalInOut], List[digitalio.DigitalInOut]]:
+    drives = []
+    senses = []
+    for drive_pin, sense_pin in pairs:
+        drive = digitalio.DigitalInOut(getattr(board, drive_pin))
+        drive.direction = digitalio.Direction.OUTPUT
+        drives.append(drive)
+        sense = digitalio.DigitalInOut(getattr(board, sense_pin))
+        sense.direction = digitalio.Direction.INPUT
+        senses.append(sense)
+    return drives, senses
+
+
+# Drive walking ones and walking zeros through every pair of pins on a
+# loopback fixture and map the faults
+def _run_matrix_test(  # pylint: disable=too-many-locals
+    pairs: Sequence[Tuple[str, str]],
+    instrument: Optional[Instrument],
+    report: Optional[Dict[str, Any]],
+    timer: PhaseTimer,
+) -> bool:
+    # Tell user to connect the loopback fixture
+    print("Loopback pairs:", end=" ")
+    for drive_pin, sense_pin in pairs:
+        print(drive_pin + "-" + sense_pin, end=" ")
+    print("\n")
+    if instrument is None:
+        timer.phase("prompt")
+        print("Wire each pair of pins together. Press enter to continue.")
+        input()
+
+    # First pin of each pair drives, the second one reads back
+    timer.phase("setup")
+    drives, senses = _matrix_pins(pairs)
+
+    # Walk ones, then zeros
+    timer.phase("test")
+    count = len(pairs)
+    followed_ones = bytearray(count)
+    followed_zeros = bytearray(count)
+    high_elsewhere = [0] * count
+    low_elsewhere = [0] * count
+    partners = [[] for _ in range(count)]
+    _walk(drives, senses, True, followed_ones, high_elsewhere, partners)
+    _walk(drives, senses, False, followed_zeros, low_elsewhere, partners)
+
+    # Release pins
+    timer.phase("teardown")
+    _deinit_pins(drives)
+    _deinit_pins(senses)
+
+    # Map the faults to both pins of each pair
+    timer.phase("verify")
+    faults = {}
+    shorts = {}
+    passed = True
+    for i, (drive_pin, sense_pin) in enumerate(pairs):
+        fault = _classify(
+            count,
+            followed_ones[i],
+            followed_zeros[i],
+            high_elsewhere[i],
+            low_elsewhere[i],
+        )
+        faults[drive_pin] = fault
+        faults[sense_pin] = fault
+        line = drive_pin + "-" + sense_pin + ":\t" + fault
+        if fault == FAULT_SHORT:
+            shorted = []
+            for step in partners[i]:
+                shorted.extend(pairs[step])
+            shorts[drive_pin] = shorted
+            shorts[sense_pin] = shorted
+            line += " to " + " ".join(shorted)
+        print(line)
+        passed = passed and fault == FAULT_OK
+    timer.stop()
+
+    if report is not None:
+        report["pairs"] = [list(pair) for pair in pairs]
+        report["steps"] = 2 * count
+        report["faults"] = faults
+        report["shorts"] = shorts
+
+    return passed
+
+
+# Count edges on each pin given, where countio can. Pins that cannot be
+# counted get None
+def _counters(sense_pins: Sequence[Optional[str]]) -> List[Any]:
+    counters = []
+    for pin in sense_pins:
+        counter = None
+        if countio is not None and pin is not None:
+            try:
+                counter = countio.Counter(
+                    getattr(board, pin), edge=countio.Edge.RISE_AND_FALL
+                )
+            except (ValueError, RuntimeError):
+                pass
+        counters.append(counter)
+    return counters
+
+
+# Mean, spread (longest minus shortest) and standard deviation of the
+# durations of the first blocks timed in stamps, in nanoseconds
+def _block_stats(stamps: array.array, blocks: int) -> Tuple[int, int, int]:
+    duration = stamps[blocks] - stamps[0]
+    mean = duration / max(blocks, 1)
+    shortest = duration
+    longest = 0
+    squares = 0.0
+    for i in range(blocks):
+        block = stamps[i + 1] - stamps[i]
+        shortest = min(shortest, block)
+        longest = max(longest, block)
+        squares += (block - mean) * (block - mean)
+    return int(mean), longest - shortest, int((squares / max(blocks - 1, 1)) ** 0.5)
+
+
+# Toggle pins together as fast as possible for a window and check the edge
+# counts on their loopback inputs. The loop only toggles, taking a timestamp
+# every RATE_BLOCK toggles, and the statistics are worked out once the window
+# is over. Returns a dictionary describing the run
+def _rate_step(  # pylint: disable=too-many-locals
+    drive_pins: Sequence[str],
+    gpios: Sequence[digitalio.DigitalInOut],
+    sense_pins: Sequence[Optional[str]],
+    window_ns: int,
+    stamps: array.array,
+) -> Dict[str, Any]:
+    # Start low so that the first toggle makes an edge
+    for gpio in gpios:
+        gpio.value = False
+    counters = _counters(sense_pins)
+    for counter in counters:
+        if counter is not None:
+            counter.reset()
+
+    state = False
+    blocks = 0
+    max_blocks = len(stamps) - 1
+    stamps[0] = time.monotonic_ns()
+    end = stamps[0] + window_ns
+    while blocks < max_blocks and stamps[blocks] < end:
+        for _ in range(RATE_BLOCK):
+            state = not state
+            for gpio in gpios:
+                gpio.value = state
+        blocks += 1
+        stamps[blocks] = time.monotonic_ns()
+    toggles = blocks * RATE_BLOCK
+    duration = stamps[blocks] - stamps[0]
+    truncated = stamps[blocks] < end
+
+    mean, spread, stddev = _block_stats(stamps, blocks)
+
+    # Every toggle should have made one edge on each loopback input
+    counted = []
+    for counter in counters:
+        if counter is not None:
+            counted.append(counter.count)
+            counter.deinit()
+    for gpio in gpios:
+        gpio.value = False
+    verified = None
+    if counted:
+        verified = min(counted) == max(counted) == toggles
+
+    step = {
+        "pins": list(drive_pins),
+        "toggles": toggles,
+        "frequency_hz": (toggles * 500000000) // max(duration, 1),
+        "block_toggles": RATE_BLOCK,
+        "mean_interval_ns": mean // RATE_BLOCK,
+        "block_spread_ns": spread,
+        "stddev_ns": stddev,
+        "duration_ns": duration,
+        "truncated": truncated,
+        "counted": counted,
+        "verified": verified,
+    }
+    line = (
+        " ".join(drive_pins)
+        + ":\t"
+        + str(step["frequency_hz"])
+        + " Hz, block spread "
+        + timing.format_ns(step["block_spread_ns"])
+        + ", std dev "
+        + timing.format_ns(step["stddev_ns"])
+    )
+    if counted:
+        line += ", counted " + str(min(counted)) + "/" + str(toggles) + " edges"
+    print(line)
+    if truncated:
+        print(
+            "Stopped after "
+            + str(blocks)
+            + " blocks, "
+            + timing.format_ns(duration)
+            + " of the window"
+        )
+    return step
+
+
+# Measure the toggle rate of every pin on its own, then of all of them at
+# once
+def _run_rate_test(
+    gpio_pins: Sequence[str],
+    pairs: Optional[Sequence[Tuple[str, str]]],
+    window: float,
+    report: Optional[Dict[str, Any]],
+    timer: PhaseTimer,
+) -> bool:
+    # With a loopback fixture, toggle the first pin of each pair and count
+    # the edges on the second one
+    if pairs:
+        drive_pins = [pair[0] for pair in pairs]
+        sense_pins = [pair[1] for pair in pairs]
+    else:
+        drive_pins = list(gpio_pins)
+        sense_pins = [None] * len(drive_pins)
+
+    timer.phase("setup")
+    gpios = [digitalio.DigitalInOut(getattr(board, p)) for p in drive_pins]
+    for gpio in gpios:
+        gpio.direction = digitalio.Direction.OUTPUT
+
+    stamps = array.array("Q", (0 for _ in range(MAX_RATE_BLOCKS + 1)))
+
+    timer.phase("test")
+    window_ns = int(window * 1000000000)
+    steps = []
+    for i, gpio in enumerate(gpios):
+        steps.append(
+            _rate_step([drive_pins[i]], [gpio], [sense_pins[i]], window_ns, stamps)
+        )
+    if len(gpios) > 1:
+        steps.append(_rate_step(drive_pins, gpios, sense_pins, window_ns, stamps))
+
+    timer.phase("teardown")
+    _deinit_pins(gpios)
+    timer.stop()
+
+    if report is not None:
+        report["window_s"] = window
+        report["steps"] = steps
+
+    for step in steps:
+        if not step["toggles"] or step["verified"] is False:
+            print("FAIL: Missed edges on " + " ".join(step["pins"]))
+            return False
+
+    return True
+
+
+def run_test(  # pylint: disable=too-many-arguments
+    pins: Sequence[str],
+    instrument: Optional[Instrument] = None,
+    report: Optional[Dict[str, Any]] = None,
+    timer: Optional[PhaseTimer] = None,
+    mode: str = MODE_TOGGLE,
+    pairs: Optional[Sequence[Tuple[str, str]]] = None,
+    window: float = RATE_WINDOW,
+) -> Tuple[str, List[str]]:
     """
     Toggles all available GPIO on and off repeatedly.
 
+    In ``MODE_MATRIX``, each pair of pins in ``pairs`` is expected to be wired
+    together. The first pin of every pair drives a walking ones and then a
+    walking zeros pattern, one pair at a time, and the second pin reads it
+    back. This takes two steps per pair and tells apart open pairs, pins
+    stuck low or high and pairs shorted to other pairs. The fault of every
+    pin and the pins each one is shorted to are printed and stored in
+    ``report``.
+
+    ``MODE_RATE`` toggles every pin as fast as it can for ``window`` seconds,
+    then all of them together. The loop does nothing but toggle, taking a
+    timestamp every `RATE_BLOCK` toggles, so that the measurement does not
+    slow the pins down. The toggle frequency, the mean time between edges,
+    and the spread (longest minus shortest block) and standard deviation of
+    the block durations are printed and stored in ``report``. These describe
+    whole blocks, not single edges. A measurement stops early once
+    `MAX_RATE_BLOCKS` blocks are timed, in which case it is printed and the
+    step is stored with ``truncated`` set and the time it actually took in
+    ``duration_ns``. If ``pairs`` is given, only the first pin of each pair
+    is toggled and, on boards with ``countio``, the edges on the second pin
+    are counted to check that none were missed.
+
     :param list[str] pins: list of pins to run the test on
+    :param instrument: optional callable from `adafruit_boardtest.fixture`
+        that answers the question instead of the operator. In matrix mode,
+        it skips the prompt to connect the fixture
+    :param dict report: optional dictionary that is filled with the time it
+        took to get an answer, or with the fault map in matrix mode
+    :param PhaseTimer timer: optional `adafruit_boardtest.timing.PhaseTimer`
+        that records how long each phase takes
+    :param str mode: ``MODE_TOGGLE``, ``MODE_MATRIX`` or ``MODE_RATE``
+    :param list[tuple(str, str)] pairs: pins wired together on the loopback
+        fixture, as (driving pin, reading pin). Defaults to pairing each GPIO
+        pin with the next one in matrix mode, and to no fixture in rate mode
+    :param float window: seconds each rate measurement lasts
     :return: tuple(str, list[str]): test result followed by list of pins tested
     """
 
-    # Create a list of analog GPIO pins
-    analog_pins = [p for p in pins if p[0] == "A" and _is_number(p[1])]
-
-    # Create a list of digital GPIO
-    digital_pins = [p for p in pins if p[0] == "D" and _is_number(p[1])]
+    # Create a list of analog and digital GPIO, one name per physical pin
+    catalog = pincatalog.catalog(pins)
+    gpio_pins = catalog.with_class(pincatalog.CLASS_DIGITAL)
 
     # Toggle LEDs if we find any
-    gpio_pins = analog_pins + digital_pins
+    if mode == MODE_MATRIX and pairs is None:
+        pairs = _default_pairs(gpio_pins)
+    if pairs is not None:
+        pairs = [pair for pair in pairs if pair[0] in pins and pair[1] in pins]
+        gpio_pins = [pin for pair in pairs for pin in pair]
     if gpio_pins:
-        # Create a list of IO objects for us to toggle
-        gpios = [digitalio.DigitalInOut(getattr(board, p)) for p in gpio_pins]
-
-        # Print out the LEDs found
-        print("GPIO pins found:", end=" ")
-        for pin in gpio_pins:
-            print(pin, end=" ")
-        print("\n")
-
-        # Set all IO to output
-        for gpio in gpios:
-            gpio.direction = digitalio.Direction.OUTPUT
-
-        # Toggle pins while waiting for user to verify LEDs blinking
-        result = _toggle_wait(gpios)
-
-        # Release pins
-        _deinit_pins(gpios)
+        timer = timing.resolve(timer)
+        if mode == MODE_MATRIX:
+            result = _run_matrix_test(pairs, instrument, report, timer)
+        elif mode == MODE_RATE:
+            result = _run_rate_test(gpio_pins, pairs, window, report, timer)
+        else:
+            result = _run_toggle_test(gpio_pins, instrument, report, timer)
 
         if result:
             return PASS, gpio_pins
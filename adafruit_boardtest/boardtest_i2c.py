@@ -5,7 +5,14 @@
 """
 `adafruit_boardtest.boardtest_i2c`
 ====================================================
-Performs random writes and reads to I2C EEPROM.
+Performs random writes and reads to I2C EEPROM. A page mode is also available
+that writes whole EEPROM pages and reads the test region back in a single
+transaction, reporting bus throughput and write-cycle latency, and a March
+mode that runs a March C- memory test over all 512 bytes of the EEPROM,
+reporting coverage and every faulty address. A sweep mode scans the bus and
+verifies the EEPROM at several bus frequencies, reporting every device found
+and the highest frequency that works. Every mode reports how many ACK polls
+and how many microseconds each EEPROM write cycle took.
 
 Run this script as its own main.py to individually run the test, or compile
 with mpy-cross and call from separate test script.
@@ -29,12 +36,17 @@ microchip-technology/AT24HC04B-PU/AT24HC04B-PU-ND/1886137>`_
 
 import random
 import time
+from array import array
 
 import board
 import busio
 
+from adafruit_boardtest import payload, pinnames, timing
+
 try:
-    from typing import Tuple, Sequence, List
+    from typing import Any, Dict, Optional, Tuple, Sequence, List
+    from adafruit_boardtest.fixture import Instrument
+    from adafruit_boardtest.timing import PhaseTimer
 except ImportError:
     pass
 
@@ -42,10 +54,35 @@ __version__ = "0.0.0+auto.0"
 __repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_BoardTest.git"
 
 # Constants
-SDA_PIN_NAME = "SDA"
-SCL_PIN_NAME = "SCL"
+SDA_PIN_NAME = pinnames.I2C_SDA
+SCL_PIN_NAME = pinnames.I2C_SCL
 NUM_I2C_TESTS = 10  # Number of times to write and read EEPROM values
 EEPROM_I2C_MAX_ADDR = 255  # Self-imposed max memory address
+EEPROM_I2C_PAGE_SIZE = 16  # Bytes per AT24HC04B page write
+EEPROM_I2C_SIZE = 512  # Bytes in the AT24HC04B, as two 256 byte blocks
+MARCH_BACKGROUNDS = (0x00, 0x55)  # Data backgrounds, each also used inverted
+MAX_PRINTED_FAULTS = 16  # Faulty addresses printed, the report has them all
+POLL_BACKOFF_MIN = 0.0001  # Seconds between the first two ACK polls
+POLL_BACKOFF_MAX = 0.001  # Longest wait between ACK polls, in seconds
+CYCLE_PERCENTILES = (50, 90, 99)  # Reported write cycle percentiles
+SWEEP_FREQUENCIES = (100000, 400000, 1000000)  # Standard, fast and fast plus
+
+# Test modes
+MODE_RANDOM = "random"  # Single byte writes and reads to random addresses
+MODE_PAGE = "page"  # Page writes and one sequential read of the test region
+MODE_MARCH = "march"  # March C- over the whole EEPROM, one page at a time
+MODE_SWEEP = "sweep"  # Bus scan and page verify at every frequency in a list
+
+# March C- elements as (ascending, read, write). Read and write are 0 for the
+# data background and 1 for its inverse, or None if the element skips them
+MARCH_C_MINUS = (
+    (True, None, 0),
+    (True, 0, 1),
+    (True, 1, 0),
+    (False, 0, 1),
+    (False, 1, 0),
+    (True, 0, None),
+)
 
 # Microchip AT24HC04B EEPROM I2C address
 EEPROM_I2C_ADDR = 0x50
@@ -56,20 +93,93 @@ FAIL = "FAIL"
 NA = "N/A"
 
 
-# Open comms to I2C EEPROM by trying a write to memory address
+# One byte buffer reused by every ACK poll
+_POLL_BUF = bytearray(1)
+
+
+# Pick a value from a sorted sequence at the given percentile
+def _percentile(sorted_values: Sequence[int], percent: int) -> int:
+    index = min(len(sorted_values) - 1, (len(sorted_values) * percent) // 100)
+    return sorted_values[index]
+
+
+class _WriteCycles:
+    """ACK polls and duration of every EEPROM write cycle waited on."""
+
+    def __init__(self) -> None:
+        self.polls = array("L")
+        self.cycle_us = array("L")
+        self.timeouts = 0
+
+    def add(self, polls: int, cycle_us: int, acked: bool) -> None:
+        """Records one write cycle."""
+        self.polls.append(polls)
+        self.cycle_us.append(cycle_us)
+        if not acked:
+            self.timeouts += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """Summarizes the polls and durations, and prints the durations."""
+        count = len(self.cycle_us)
+        result = {"count": count, "timeouts": self.timeouts}
+        if not count:
+            return result
+        polls = sorted(self.polls)
+        cycle_us = sorted(self.cycle_us)
+        result["polls"] = {"min": polls[0], "avg": sum(polls) / count}
+        result["polls"]["max"] = polls[-1]
+        result["us"] = {"min": cycle_us[0], "avg": sum(cycle_us) // count}
+        for percent in CYCLE_PERCENTILES:
+            result["us"]["p" + str(percent)] = _percentile(cycle_us, percent)
+        result["us"]["max"] = cycle_us[-1]
+        print(
+            "Write cycle:\t"
+            + str(count)
+            + " cycles, p50 "
+            + str(result["us"]["p50"])
+            + " us, p99 "
+            + str(result["us"]["p99"])
+            + " us, max "
+            + str(result["us"]["max"])
+            + " us, "
+            + "{:.1f}".format(result["polls"]["avg"])
+            + " polls avg"
+        )
+        return result
+
+
+# Open comms to I2C EEPROM by polling for an ACK on a write to memory
+# address. The wait between polls doubles from POLL_BACKOFF_MIN up to
+# POLL_BACKOFF_MAX. If given, cycles records the polls and the time waited
 def _eeprom_i2c_wait(
-    i2c: busio.I2C, i2c_addr: int, mem_addr: int, timeout: float = 1.0
+    i2c: busio.I2C,
+    i2c_addr: int,
+    mem_addr: int,
+    timeout: float = 1.0,
+    cycles: Optional[_WriteCycles] = None,
 ) -> bool:
     # Try to access the I2C EEPROM (it becomes unresonsive during a write)
-    timestamp = time.monotonic()
-    while time.monotonic() < timestamp + timeout:
+    _POLL_BUF[0] = mem_addr
+    start = time.monotonic_ns()
+    deadline = start + int(timeout * 1000000000)
+    backoff = POLL_BACKOFF_MIN
+    polls = 0
+    while True:
+        polls += 1
         try:
-            i2c.writeto(i2c_addr, bytearray([mem_addr]), end=1)
-            return True
+            i2c.writeto(i2c_addr, _POLL_BUF)
+            acked = True
         except OSError:
-            pass
+            acked = False
+        now = time.monotonic_ns()
+        if acked or now >= deadline:
+            break
+        time.sleep(backoff)
+        backoff = min(backoff * 2, POLL_BACKOFF_MAX)
 
-    return False
+    if cycles is not None:
+        cycles.add(polls, (now - start) // 1000, acked)
+    return acked
 
 
 # Write to address. Returns status (True for successful write, False otherwise)
@@ -112,67 +222,545 @@ def _eeprom_i2c_read_byte(
     return True, buf
 
 
-def run_test(
-    pins: Sequence[str], sda_pin: str = SDA_PIN_NAME, scl_pin: str = SCL_PIN_NAME
+# Write one page. Buffer holds the memory address followed by the page data.
+# Returns status (True for successful write, False otherwise)
+def _eeprom_i2c_write_page(i2c: busio.I2C, i2c_addr: int, page_buf: bytearray) -> bool:
+    # Make sure the write does not wrap around within the page
+    if (page_buf[0] % EEPROM_I2C_PAGE_SIZE) + len(page_buf) - 1 > EEPROM_I2C_PAGE_SIZE:
+        return False
+
+    # Write address and data in a single transaction
+    try:
+        i2c.writeto(i2c_addr, page_buf)
+    except OSError:
+        return False
+
+    return True
+
+
+# Sequential read into buffer, starting at the address held in addr_buf.
+# Returns status (True for successful read, False otherwise)
+def _eeprom_i2c_read_block(
+    i2c: busio.I2C,
+    i2c_addr: int,
+    addr_buf: bytearray,
+    buf: bytearray,
+    timeout: float = 1.0,
+) -> bool:
+    # Make sure the read stays within the one byte address space
+    if addr_buf[0] + len(buf) > 256:
+        return False
+
+    # Try writing to address (EEPROM is unresponsive while writing)
+    if not _eeprom_i2c_wait(i2c, i2c_addr, addr_buf[0], timeout):
+        return False
+
+    # Read the whole block
+    try:
+        i2c.writeto_then_readfrom(i2c_addr, addr_buf, buf)
+    except OSError:
+        return False
+
+    return True
+
+
+class I2CPageBuffers:  # pylint: disable=too-few-public-methods
+    """
+    Buffers for writing the I2C EEPROM test region page by page and reading
+    it back in one go. They are allocated once so that a verify does not
+    allocate.
+
+    :param int size: number of bytes in the test region
+    """
+
+    def __init__(self, size: int = EEPROM_I2C_MAX_ADDR + 1) -> None:
+        self.size = size
+        self.test_data = bytearray(size)
+        self.read_buf = bytearray(size)
+        self.page_buf = bytearray(EEPROM_I2C_PAGE_SIZE + 1)
+        self.addr_buf = bytearray(1)
+
+
+# Write the test data to the EEPROM page by page, waiting out each write
+# cycle, and read it back in one go.
+# Returns tuple [status, errors, first error address, write ns, read ns]
+def _page_verify(
+    i2c: busio.I2C, bufs: I2CPageBuffers, cycles: _WriteCycles
+) -> Tuple[bool, int, int, int, int]:
+    # Write every page
+    write_start = time.monotonic_ns()
+    for mem_addr in range(0, bufs.size, EEPROM_I2C_PAGE_SIZE):
+        bufs.page_buf[0] = mem_addr
+        for i in range(EEPROM_I2C_PAGE_SIZE):
+            bufs.page_buf[i + 1] = bufs.test_data[mem_addr + i]
+        if not _eeprom_i2c_write_page(i2c, EEPROM_I2C_ADDR, bufs.page_buf):
+            return False, 0, -1, 0, 0
+        if not _eeprom_i2c_wait(i2c, EEPROM_I2C_ADDR, mem_addr, cycles=cycles):
+            return False, 0, -1, 0, 0
+    write_ns = time.monotonic_ns() - write_start
+
+    # Read the whole region back in a single transaction
+    read_start = time.monotonic_ns()
+    bufs.addr_buf[0] = 0
+    if not _eeprom_i2c_read_block(i2c, EEPROM_I2C_ADDR, bufs.addr_buf, bufs.read_buf):
+        return False, 0, -1, 0, 0
+    read_ns = time.monotonic_ns() - read_start
+
+    # Compare the read values to the original values
+    errors, first_error = payload.compare(bufs.test_data, bufs.read_buf)
+
+    return True, errors, first_error, write_ns, read_ns
+
+
+# Convert a byte count and a duration to bytes per second
+def _bytes_per_s(num_bytes: int, duration_ns: int) -> int:
+    return (num_bytes * 1000000000) // max(duration_ns, 1)
+
+
+# Write the test region page by page, read it back in one go and compare
+def _run_page_test(
+    i2c: busio.I2C, report: Optional[Dict[str, Any]], cycles: _WriteCycles
+) -> bool:
+    # Preallocate all buffers and generate random test data
+    bufs = I2CPageBuffers()
+    num_bytes = bufs.size
+    seed = payload.random_seed()
+    payload.fill(bufs.test_data, seed)
+
+    # Write each page, timing how long the EEPROM takes to finish the write
+    print(
+        "Writing "
+        + str(num_bytes // EEPROM_I2C_PAGE_SIZE)
+        + " pages of "
+        + str(EEPROM_I2C_PAGE_SIZE)
+        + " bytes"
+    )
+    status, errors, first_error, write_ns, read_ns = _page_verify(i2c, bufs, cycles)
+    if not status:
+        print("FAIL: I2C could not communicate")
+        return False
+
+    # Print out bus statistics
+    write_rate = _bytes_per_s(num_bytes, write_ns)
+    read_rate = _bytes_per_s(num_bytes, read_ns)
+    print("Write:\t\t" + str(write_rate) + " bytes/s")
+    print("Read:\t\t" + str(read_rate) + " bytes/s")
+
+    if report is not None:
+        report["seed"] = seed
+        report["bytes"] = num_bytes
+        report["write_bytes_per_s"] = write_rate
+        report["read_bytes_per_s"] = read_rate
+        report["write_cycle_us"] = list(cycles.cycle_us)
+        report["errors"] = errors
+        report["first_error"] = first_error
+
+    if errors:
+        print("FAIL: Data does not match at address " + hex(first_error))
+        return False
+
+    return True
+
+
+# Device address and word address of a memory address. Addresses above 255
+# select the second block through the A8 bit of the device address
+def _eeprom_i2c_locate(i2c_addr: int, mem_addr: int) -> Tuple[int, int]:
+    return i2c_addr | (mem_addr >> 8), mem_addr & 0xFF
+
+
+# Name of a March element, such as "up(r0,w1)"
+def _march_name(element: Tuple[bool, Optional[int], Optional[int]]) -> str:
+    ascending, read, write = element
+    operations = []
+    if read is not None:
+        operations.append("r" + str(read))
+    if write is not None:
+        operations.append("w" + str(write))
+    return ("up" if ascending else "down") + "(" + ",".join(operations) + ")"
+
+
+# Run one March element over every page, in ascending or descending order.
+# Every page is read in one transaction and written in one transaction. The
+# data of each byte is the background XOR-ed with the low byte of its address,
+# so no two bytes of a page hold the same value and a decoder fault inside a
+# page reads back another byte's data. Bits that read wrong are OR-ed into
+# faults by address, and every byte read is counted in reads. Returns False if
+# the EEPROM stopped answering
+def _march_element(  # pylint: disable=too-many-arguments,too-many-locals
+    i2c: busio.I2C,
+    element: Tuple[bool, Optional[int], Optional[int]],
+    background: int,
+    bufs: I2CPageBuffers,
+    faults: Dict[int, int],
+    reads: bytearray,
+    cycles: _WriteCycles,
+) -> bool:
+    ascending, read, write = element
+    addr_buf = bufs.addr_buf
+    read_buf = bufs.read_buf
+    page_buf = bufs.page_buf
+    num_pages = EEPROM_I2C_SIZE // EEPROM_I2C_PAGE_SIZE
+    pages = range(num_pages) if ascending else range(num_pages - 1, -1, -1)
+    for page in pages:
+        mem_addr = page * EEPROM_I2C_PAGE_SIZE
+        i2c_addr, word_addr = _eeprom_i2c_locate(EEPROM_I2C_ADDR, mem_addr)
+        addr_buf[0] = word_addr
+
+        # Read the page and compare it with what the last element wrote
+        if read is not None:
+            expected = background ^ (0xFF * read) ^ word_addr
+            if not _eeprom_i2c_read_block(i2c, i2c_addr, addr_buf, read_buf):
+                return False
+            for i in range(EEPROM_I2C_PAGE_SIZE):
+                reads[mem_addr + i] += 1
+                wrong = read_buf[i] ^ expected ^ i
+                if wrong:
+                    faults[mem_addr + i] = faults.get(mem_addr + i, 0) | wrong
+
+        # Write the page and wait for the write cycle to end
+        if write is not None:
+            value = background ^ (0xFF * write) ^ word_addr
+            page_buf[0] = word_addr
+            for i in range(EEPROM_I2C_PAGE_SIZE):
+                page_buf[i + 1] = value ^ i
+            if not _eeprom_i2c_write_page(i2c, i2c_addr, page_buf):
+                return False
+            if not _eeprom_i2c_wait(i2c, i2c_addr, word_addr, cycles=cycles):
+                return False
+
+    return True
+
+
+# Run March C- over the whole EEPROM once per data background
+def _run_march_test(  # pylint: disable=too-many-locals
+    i2c: busio.I2C,
+    report: Optional[Dict[str, Any]],
+    cycles: _WriteCycles,
+    backgrounds: Sequence[int] = MARCH_BACKGROUNDS,
+) -> bool:
+    # Preallocate all buffers, reading one page at a time
+    bufs = I2CPageBuffers(EEPROM_I2C_PAGE_SIZE)
+    reads = bytearray(EEPROM_I2C_SIZE)
+    faults = {}
+
+    # Run every element with every background, stopping if the EEPROM stops
+    # answering
+    completed = True
+    start = time.monotonic_ns()
+    for background in backgrounds:
+        for element in MARCH_C_MINUS:
+            print("Background " + hex(background) + ":\t" + _march_name(element))
+            if not _march_element(
+                i2c, element, background, bufs, faults, reads, cycles
+            ):
+                completed = False
+                break
+        if not completed:
+            print("FAIL: I2C could not communicate")
+            break
+    duration_ns = time.monotonic_ns() - start
+
+    # An address is covered once every read element has read it
+    read_elements = [element for element in MARCH_C_MINUS if element[1] is not None]
+    expected_reads = len(read_elements) * len(backgrounds)
+    verified = 0
+    for count in reads:
+        if count == expected_reads:
+            verified += 1
+    faulty = sorted(faults)
+
+    # Print out coverage and faults
+    print(
+        "Coverage:\t"
+        + str(verified)
+        + "/"
+        + str(EEPROM_I2C_SIZE)
+        + " bytes ("
+        + str(verified * 100 // EEPROM_I2C_SIZE)
+        + "%)"
+    )
+    print("Duration:\t" + str(duration_ns // 1000000) + " ms")
+    for mem_addr in faulty[:MAX_PRINTED_FAULTS]:
+        print("Fault at " + hex(mem_addr) + ", bits " + hex(faults[mem_addr]))
+    if len(faulty) > MAX_PRINTED_FAULTS:
+        print("... and " + str(len(faulty) - MAX_PRINTED_FAULTS) + " more")
+
+    if report is not None:
+        report["bytes"] = EEPROM_I2C_SIZE
+        report["backgrounds"] = list(backgrounds)
+        report["verified"] = verified
+        report["coverage"] = verified / EEPROM_I2C_SIZE
+        report["faulty_addresses"] = faulty
+        report["fault_bits"] = faults
+        report["duration_ns"] = duration_ns
+
+    if faulty:
+        print("FAIL: " + str(len(faulty)) + " faulty addresses")
+        return False
+
+    return completed
+
+
+# Scan the bus and time how long every device found takes to ACK an empty
+# write (or a one byte read, for devices that NAK empty writes). Returns the
+# ACK times in microseconds by address, None where both probes failed
+def _scan(i2c: busio.I2C, probe_buf: bytearray) -> Dict[int, Optional[int]]:
+    devices = {}
+    for address in i2c.scan():
+        ack_us = None
+        start = time.monotonic_ns()
+        try:
+            i2c.writeto(address, b"")
+            ack_us = (time.monotonic_ns() - start) // 1000
+        except OSError:
+            start = time.monotonic_ns()
+            try:
+                i2c.readfrom_into(address, probe_buf)
+                ack_us = (time.monotonic_ns() - start) // 1000
+            except OSError:
+                pass
+        devices[address] = ack_us
+    return devices
+
+
+# Set up the bus at one frequency, scan it and run a page verify of the
+# EEPROM. A bus error fails the step, and the bus is always released so the
+# next step can claim the pins. Returns a dictionary describing the step
+def _sweep_step(
+    scl: Any, sda: Any, frequency: int, bufs: I2CPageBuffers, timer: PhaseTimer
+) -> Dict[str, Any]:
+    step = {
+        "frequency": frequency,
+        "passed": False,
+        "devices": {},
+        "errors": 0,
+        "read_bytes_per_s": 0,
+    }
+    try:
+        i2c = timer.wrap(busio.I2C(scl, sda, frequency=frequency))
+    except ValueError:
+        print(str(frequency) + " Hz:\tnot supported")
+        return step
+    while not i2c.try_lock():
+        pass
+
+    # Use fresh data every step so stale EEPROM contents cannot pass
+    cycles = _WriteCycles()
+    try:
+        step["devices"] = _scan(i2c, bufs.addr_buf)
+        if EEPROM_I2C_ADDR in step["devices"]:
+            payload.fill(bufs.test_data, payload.random_seed())
+            status, errors, _, _, read_ns = _page_verify(i2c, bufs, cycles)
+            if not status:
+                errors = bufs.size
+            step["passed"] = status and not errors
+            step["errors"] = errors
+            if status:
+                step["read_bytes_per_s"] = _bytes_per_s(bufs.size, read_ns)
+    except OSError:
+        step["errors"] = bufs.size
+        print(str(frequency) + " Hz:\tbus error")
+    finally:
+        i2c.unlock()
+        i2c.deinit()
+
+    print(
+        str(frequency)
+        + " Hz:\t"
+        + (PASS if step["passed"] else FAIL)
+        + ", "
+        + str(step["errors"])
+        + " errors, "
+        + str(step["read_bytes_per_s"])
+        + " bytes/s, "
+        + str(len(step["devices"]))
+        + " devices"
+    )
+    for address, ack_us in step["devices"].items():
+        print("\t" + hex(address) + ":\t", end="")
+        print("no ACK" if ack_us is None else "ACK in " + str(ack_us) + " us")
+    step["write_cycles"] = cycles.summary()
+    return step
+
+
+# Scan and verify at every frequency in a list and report the highest one
+# that passed
+def _run_sweep_test(
+    scl: Any,
+    sda: Any,
+    frequencies: Sequence[int],
+    report: Optional[Dict[str, Any]],
+    timer: PhaseTimer,
+) -> bool:
+    bufs = I2CPageBuffers()
+    steps = []
+    for frequency in frequencies:
+        steps.append(_sweep_step(scl, sda, frequency, bufs, timer))
+    print()
+
+    # Find the fastest step that passed, and every device seen at any speed
+    best = {"frequency": 0, "read_bytes_per_s": 0}
+    devices = []
+    for step in steps:
+        if step["passed"] and step["frequency"] > best["frequency"]:
+            best = step
+        for address in step["devices"]:
+            if address not in devices:
+                devices.append(address)
+
+    if report is not None:
+        report["steps"] = steps
+        report["devices"] = sorted(devices)
+        report["max_frequency"] = best["frequency"]
+        report["read_bytes_per_s"] = best["read_bytes_per_s"]
+
+    if not best["frequency"]:
+        print("FAIL: No frequency passed")
+        return False
+
+    print("Highest reliable frequency:\t" + str(best["frequency"]) + " Hz")
+    return True
+
+
+# Pick random addresses, write to them, read from them, and see if they match
+def _run_random_test(i2c: busio.I2C, cycles: _WriteCycles) -> bool:
+    for _ in range(NUM_I2C_TESTS):
+        # Randomly pick an address and a data value (one byte)
+        mem_addr = random.randint(0, EEPROM_I2C_MAX_ADDR)
+        mem_data = random.randint(0, 255)
+        print("Address:\t" + hex(mem_addr))
+        print("Writing:\t" + hex(mem_data))
+
+        # Try writing this random value to the random address
+        result = _eeprom_i2c_write_byte(i2c, EEPROM_I2C_ADDR, mem_addr, mem_data)
+        if not result:
+            print("FAIL: I2C could not communicate")
+            return False
+
+        # Wait for the write cycle to end
+        if not _eeprom_i2c_wait(i2c, EEPROM_I2C_ADDR, mem_addr, cycles=cycles):
+            print("FAIL: I2C EEPROM write cycle timed out")
+            return False
+
+        # Try reading the written value back from EEPROM
+        result = _eeprom_i2c_read_byte(i2c, EEPROM_I2C_ADDR, mem_addr)
+        if not result[0]:
+            print("FAIL: I2C could not communicate")
+            return False
+        print("Read:\t\t" + hex(result[1][0]))
+        print()
+
+        # Compare the read value to the original value
+        if result[1][0] != mem_data:
+            print("FAIL: Data does not match")
+            return False
+
+    return True
+
+
+def run_test(  # pylint: disable=too-many-arguments
+    pins: Sequence[str],
+    sda_pin: str = SDA_PIN_NAME,
+    scl_pin: str = SCL_PIN_NAME,
+    mode: str = MODE_RANDOM,
+    report: Optional[Dict[str, Any]] = None,
+    instrument: Optional[Instrument] = None,
+    timer: Optional[PhaseTimer] = None,
+    frequencies: Sequence[int] = SWEEP_FREQUENCIES,
 ) -> Tuple[str, List[str]]:
     """
     Performs random writes and reads to I2C EEPROM.
 
+    In ``MODE_PAGE``, the test region is written one page per transaction and
+    read back with a single sequential read. Throughput and per-page
+    write-cycle latency are printed and, if given, stored in ``report``.
+
+    In ``MODE_MARCH``, a March C- test runs over all `EEPROM_I2C_SIZE` bytes,
+    reaching the upper block through the block select bit of the device
+    address. Each element reads and writes one page at a time, so a fault is
+    found at the address level while the EEPROM only does one write cycle per
+    page. Each byte holds the data background XOR-ed with the low byte of its
+    address, so that a decoder fault between two bytes of the same page reads
+    back the wrong data. The test runs once for each of `MARCH_BACKGROUNDS`
+    and catches stuck bits and address decoder faults that random sampling
+    misses. The coverage and every faulty address, with the bits that read
+    wrong, are printed and, if given, stored in ``report``.
+
+    In every mode, the EEPROM is polled for an ACK after each write, waiting
+    longer between polls up to `POLL_BACKOFF_MAX`. The distribution of the
+    write cycle times and the number of polls are printed and, if given,
+    stored in ``report["write_cycles"]``, or per frequency in sweep mode.
+
+    ``MODE_SWEEP`` sets the bus up at every frequency in ``frequencies``. At
+    each one it scans the bus, times how long every device found takes to
+    ACK, and verifies the EEPROM test region with fresh data. The list of
+    steps (frequency, devices with their ACK times, errors, read throughput
+    and write cycle statistics), every device seen and the highest passing
+    frequency are stored in ``report``.
+
     :param list[str] pins: list of pins to run the test on
     :param str sda_pin: pin name of I2C SDA
     :param str scl_pin: pin name of I2C SCL
+    :param str mode: ``MODE_RANDOM``, ``MODE_PAGE``, ``MODE_MARCH`` or
+        ``MODE_SWEEP``
+    :param dict report: optional dictionary that is filled with measurements
+    :param instrument: optional callable from `adafruit_boardtest.fixture`.
+        When given, the prompt to connect the hardware is skipped
+    :param PhaseTimer timer: optional `adafruit_boardtest.timing.PhaseTimer`
+        that records how long each phase and bus transaction takes
+    :param list[int] frequencies: bus frequencies used by the sweep mode, in
+        Hz
     :return: tuple(str, list[str]): test result followed by list of pins tested
     """
 
     # Write values to I2C EEPROM and verify the values match
     if list(set(pins).intersection(set([sda_pin, scl_pin]))):
-        # Tell user to connect EEPROM chip
-        print(
-            "Connect a Microchip AT24HC04B EEPROM I2C chip. "
-            + "Press enter to continue."
-        )
-        input()
-
-        # Set up I2C
-        i2c = busio.I2C(getattr(board, scl_pin), getattr(board, sda_pin))
-
-        # Wait for I2C lock
-        while not i2c.try_lock():
-            pass
-
-        # Pick a random address, write to it, read from it, and see if they match
-        pass_test = True
-        for _ in range(NUM_I2C_TESTS):
-            # Randomly pick an address and a data value (one byte)
-            mem_addr = random.randint(0, EEPROM_I2C_MAX_ADDR)
-            mem_data = random.randint(0, 255)
-            print("Address:\t" + hex(mem_addr))
-            print("Writing:\t" + hex(mem_data))
-
-            # Try writing this random value to the random address
-            result = _eeprom_i2c_write_byte(i2c, EEPROM_I2C_ADDR, mem_addr, mem_data)
-            if not result:
-                print("FAIL: I2C could not communicate")
-                pass_test = False
-                break
+        timer = timing.resolve(timer)
 
-            # Try reading the written value back from EEPROM
-            result = _eeprom_i2c_read_byte(i2c, EEPROM_I2C_ADDR, mem_addr)
-            print("Read:\t\t" + hex(result[1][0]))
+        # Tell user to connect EEPROM chip
+        if instrument is None:
+            timer.phase("prompt")
+            print(
+                "Connect a Microchip AT24HC04B EEPROM I2C chip. "
+                + "Press enter to continue."
+            )
+            input()
+
+        # The sweep sets up I2C itself, once per frequency
+        timer.phase("setup")
+        scl = getattr(board, scl_pin)
+        sda = getattr(board, sda_pin)
+        if mode == MODE_SWEEP:
+            timer.phase("test")
+            pass_test = _run_sweep_test(scl, sda, frequencies, report, timer)
+        else:
+            # Set up I2C
+            i2c = timer.wrap(busio.I2C(scl, sda))
+
+            # Wait for I2C lock
+            while not i2c.try_lock():
+                pass
+
+            # Run the selected test
+            timer.phase("test")
+            cycles = _WriteCycles()
+            if mode == MODE_PAGE:
+                pass_test = _run_page_test(i2c, report, cycles)
+            elif mode == MODE_MARCH:
+                pass_test = _run_march_test(i2c, report, cycles)
+            else:
+                pass_test = _run_random_test(i2c, cycles)
+
+            # Release I2C pins
+            timer.phase("teardown")
+            i2c.deinit()
+
+            # Print out the write cycle statistics
+            write_cycles = cycles.summary()
             print()
-            if not result[0]:
-                print("FAIL: I2C could not communicate")
-                pass_test = False
-                break
-
-            # Compare the read value to the original value
-            if result[1][0] != mem_data:
-                print("FAIL: Data does not match")
-                pass_test = False
-                break
-
-        # Release I2C pins
-        i2c.deinit()
+            if report is not None:
+                report["write_cycles"] = write_cycles
+        timer.stop()
 
         # Store results
         if pass_test:
@@ -24,12 +24,12 @@ Implementation Notes
 """
 import time
 
-import board
-import digitalio
-import supervisor
+from adafruit_boardtest import fixture, pinnames, scheduler, timing
 
 try:
-    from typing import Sequence, Tuple, List
+    from typing import Any, Dict, Optional, Sequence, Tuple, List
+    from adafruit_boardtest.fixture import Instrument
+    from adafruit_boardtest.timing import PhaseTimer
 except ImportError:
     pass
 
@@ -39,7 +39,7 @@ __repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_BoardTest.git"
 # Constants
 LED_ON_DELAY_TIME = 0.2  # Seconds
 LED_OFF_DELAY_TIME = 0.2  # Seconds
-LED_PIN_NAMES = ["L", "LED", "RED_LED", "YELLOW_LED", "GREEN_LED", "BLUE_LED"]
+LED_PIN_NAMES = list(pinnames.LEDS)
 
 # Test result strings
 PASS = "PASS"
@@ -47,46 +47,45 @@ FAIL = "FAIL"
 NA = "N/A"
 
 
-# Toggle IO pins while waiting for answer
-def _toggle_wait(led_pins: Sequence[str]) -> bool:
-    timestamp = time.monotonic()
-    led_state = False
-    print("Are the pins listed above toggling? [y/n]")
-    while True:
-        # Cycle through each pin in the list
-        for pin in led_pins:
-            led = digitalio.DigitalInOut(getattr(board, pin))
-            led.direction = digitalio.Direction.OUTPUT
-            blinking = True
-
-            # Blink each LED once while looking for input
-            while blinking:
-                if led_state:
-                    if time.monotonic() > timestamp + LED_ON_DELAY_TIME:
-                        led_state = False
-                        led.value = led_state
-                        led.deinit()
-                        blinking = False
-                        timestamp = time.monotonic()
-                else:
-                    if time.monotonic() > timestamp + LED_OFF_DELAY_TIME:
-                        led_state = True
-                        led.value = led_state
-                        timestamp = time.monotonic()
-
-                # Look for user input
-                if supervisor.runtime.serial_bytes_available:
-                    answer = input()
-                    if answer == "y":
-                        return True
-                    return False
-
-
-def run_test(pins: Sequence[str]) -> Tuple[str, List[str]]:
+# Blink the LEDs one after another while waiting for answer
+def _toggle_wait(led_pins: Sequence[str], instrument: Optional[Instrument]) -> bool:
+    question = "Are the pins listed above toggling? [y/n]"
+    blink_time = LED_OFF_DELAY_TIME + LED_ON_DELAY_TIME
+    timeout = None if instrument is None else fixture.INSTRUMENT_TIMEOUT
+    with scheduler.BlinkScheduler() as blinker:
+        # Each LED gets its own slot in a period long enough for all of them
+        for i, pin in enumerate(led_pins):
+            blinker.add(
+                pin,
+                blink_time * len(led_pins),
+                LED_ON_DELAY_TIME,
+                i * blink_time + LED_OFF_DELAY_TIME,
+            )
+        print(question)
+        answer = blinker.run(lambda: fixture.poll_answer(question, instrument), timeout)
+
+    if answer is None:
+        print("No answer from instrument")
+        return False
+    return answer
+
+
+def run_test(
+    pins: Sequence[str],
+    instrument: Optional[Instrument] = None,
+    report: Optional[Dict[str, Any]] = None,
+    timer: Optional[PhaseTimer] = None,
+) -> Tuple[str, List[str]]:
     """
     Toggles the onboard LED(s) on and off.
 
     :param list[str] pins: list of pins to run the test on
+    :param instrument: optional callable from `adafruit_boardtest.fixture`
+        that answers the question instead of the operator
+    :param dict report: optional dictionary that is filled with the time it
+        took to get an answer
+    :param PhaseTimer timer: optional `adafruit_boardtest.timing.PhaseTimer`
+        that records how long each phase takes
     :return: tuple(str, list[str]): test result followed by list of pins tested
     """
 
@@ -102,7 +101,13 @@ def run_test(pins: Sequence[str]) -> Tuple[str, List[str]]:
         print("\n")
 
         # Blink LEDs and wait for user to verify test
-        result = _toggle_wait(led_pins)
+        timer = timing.resolve(timer)
+        timer.phase("test")
+        timestamp = time.monotonic()
+        result = _toggle_wait(led_pins, instrument)
+        timer.stop()
+        if report is not None:
+            report["response_s"] = time.monotonic() - timestamp
 
         if result:
             return PASS, led_pins
@@ -5,7 +5,10 @@
 """
 `adafruit_boardtest.boardtest_sd`
 ====================================================
-Performs random writes and reads to SD card over SPI.
+Performs random writes and reads to SD card over SPI. A benchmark mode is also
+available that measures sequential and random-offset throughput and per-block
+latency, and a sweep mode that remounts the card at increasing SPI clocks to
+find the fastest stable one.
 
 Run this script as its own main.py to individually run the test, or compile
 with mpy-cross and call from separate test script.
@@ -30,15 +33,16 @@ Implementation Notes
 
 """
 import random
+import time
+from array import array
 
-import board
-import busio
-import digitalio
-import adafruit_sdcard
-import storage
+from adafruit_boardtest import payload, pinnames, timing
+from adafruit_boardtest.sdsession import SDSession
 
 try:
-    from typing import Sequence, Tuple, List
+    from typing import Any, Dict, Optional, Sequence, Tuple, List
+    from adafruit_boardtest.fixture import Instrument
+    from adafruit_boardtest.timing import PhaseTimer
 except ImportError:
     pass
 
@@ -46,15 +50,32 @@ __version__ = "0.0.0+auto.0"
 __repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_BoardTest.git"
 
 # Constants
-MOSI_PIN_NAME = "SD_MOSI"
-MISO_PIN_NAME = "SD_MISO"
-SCK_PIN_NAME = "SD_SCK"
-CS_PIN_NAME = "SD_CS"
+MOSI_PIN_NAME = pinnames.SD_MOSI
+MISO_PIN_NAME = pinnames.SD_MISO
+SCK_PIN_NAME = pinnames.SD_SCK
+CS_PIN_NAME = pinnames.SD_CS
 FILENAME = "test.txt"  # File that will be written to
-BAUD_RATE = 100000  # Bits per second
+BAUD_RATE = 1320000  # Bits per second (adafruit_sdcard default)
 NUM_UART_BYTES = 40  # Number of bytes to transmit over UART
 ASCII_MIN = 0x21  # '!' Lowest ASCII char in random range (inclusive)
 ASCII_MAX = 0x7E  # '~' Highest ASCII char in random range (inclusive)
+BENCH_FILE_SIZES = (16384, 131072)  # File sizes (bytes) used by the benchmark
+BENCH_BLOCK_SIZE = 512  # Bytes per write or read in the benchmark
+BENCH_PERCENTILES = (50, 90, 99)  # Reported block latency percentiles
+SWEEP_BAUD_RATES = (400000, 1320000, 4000000, 8000000, 12000000, 16000000, 24000000)
+SWEEP_BYTES = 4096  # Bytes written and read back at each sweep step
+SWEEP_REPEATS = 3  # Number of verifies that must pass at each sweep step
+
+# Test modes
+MODE_RANDOM = "random"  # Write and read back one small file
+MODE_BENCHMARK = "benchmark"  # Sequential and random-offset throughput
+MODE_SWEEP = "sweep"  # Remount and verify at every baud rate in a list
+
+# Benchmark access patterns
+SEQ_WRITE = "seq_write"
+SEQ_READ = "seq_read"
+RANDOM_WRITE = "random_write"
+RANDOM_READ = "random_read"
 
 # Test result strings
 PASS = "PASS"
@@ -62,87 +83,431 @@ FAIL = "FAIL"
 NA = "N/A"
 
 
-def run_test(  # pylint: disable=too-many-arguments,too-many-locals
+# Write a payload to a file, read it back and compare
+def _run_random_test(path: str, num_bytes: int) -> bool:
+    # Generate test payload
+    test_buf = bytearray(num_bytes)
+    read_buf = bytearray(num_bytes)
+    payload.fill(test_buf, payload.random_seed(), ASCII_MIN, ASCII_MAX)
+
+    # Write test payload to a file on the card
+    try:
+        with open(path, "wb") as file:
+            print("Writing:\t" + str(num_bytes) + " bytes")
+            file.write(test_buf)
+    except OSError:
+        print("Could not write to SD card")
+        return False
+
+    # Read from test file on the card
+    try:
+        with open(path, "rb") as file:
+            num_read = file.readinto(read_buf)
+        print("Read:\t\t" + str(num_read) + " bytes")
+    except OSError:
+        print("Could not read from SD card")
+        return False
+
+    # Compare payloads
+    errors, first_error = payload.compare(test_buf, read_buf)
+    if errors:
+        print("Mismatch at byte " + str(first_error))
+
+    return num_read == num_bytes and not errors
+
+
+# Pick a value from a sorted sequence at the given percentile
+def _percentile(sorted_values: Sequence[int], percent: int) -> int:
+    index = min(len(sorted_values) - 1, (len(sorted_values) * percent) // 100)
+    return sorted_values[index]
+
+
+# Time one benchmark pass over a file. Blocks are visited in order, or at the
+# offsets given. Every block holds data seeded by its block number, so a read
+# from the wrong offset does not match. Returns tuple [total ns, bad bytes]
+def _bench_pass(  # pylint: disable=too-many-arguments,too-many-locals
+    file: Any,
+    buf: bytearray,
+    expected: bytearray,
+    latency_us: array,
+    offsets: Optional[array],
+    write: bool,
+    seed: int,
+) -> Tuple[int, int]:
+    block_size = len(buf)
+    num_blocks = len(latency_us)
+    generator = payload.Xorshift16(seed)
+    blank = bytearray(block_size)
+    total = 0
+    errors = 0
+    if offsets is None:
+        file.seek(0)
+    for block in range(num_blocks):
+        # Prepare the block's data outside of the timed part of the loop
+        number = offsets[block] if offsets is not None else block
+        generator.seed((seed + number) % 0xFFFF + 1)
+        if write:
+            generator.fill(buf)
+        else:
+            generator.fill(expected)
+            buf[:] = blank
+
+        block_start = time.monotonic_ns()
+        if offsets is not None:
+            file.seek(number * block_size)
+        if write:
+            file.write(buf)
+        else:
+            num_read = file.readinto(buf)
+        duration = time.monotonic_ns() - block_start
+        latency_us[block] = duration // 1000
+        total += duration
+
+        # Verify reads outside of the timed part of the loop. A short read
+        # counts as a whole bad block
+        if not write:
+            if num_read != block_size:
+                errors += block_size
+            else:
+                errors += payload.compare(expected, buf)[0]
+
+    # Count the time it takes to get written data out to the card
+    if write:
+        flush_start = time.monotonic_ns()
+        file.flush()
+        total += time.monotonic_ns() - flush_start
+
+    return total, errors
+
+
+# Summarize a benchmark pass
+def _bench_result(
+    pattern: str, file_size: int, block_size: int, duration: int, latency_us: array
+) -> Dict[str, Any]:
+    latencies = sorted(latency_us)
+    result = {
+        "pattern": pattern,
+        "file_size": file_size,
+        "block_size": block_size,
+        "mb_per_s": (file_size * 1000) / max(duration, 1),
+        "latency_us": {"max": latencies[-1]},
+    }
+    for percent in BENCH_PERCENTILES:
+        result["latency_us"]["p" + str(percent)] = _percentile(latencies, percent)
+    print(
+        pattern
+        + " "
+        + str(file_size)
+        + " bytes:\t"
+        + "{:.3f}".format(result["mb_per_s"])
+        + " MB/s, p50 "
+        + str(result["latency_us"]["p50"])
+        + " us, p99 "
+        + str(result["latency_us"]["p99"])
+        + " us, max "
+        + str(latencies[-1])
+        + " us"
+    )
+    return result
+
+
+# True if the block size is positive and every file holds at least one block
+def _bench_sizes_valid(file_sizes: Sequence[int], block_size: int) -> bool:
+    if block_size <= 0 or not file_sizes:
+        return False
+    for file_size in file_sizes:
+        if file_size < block_size:
+            return False
+    return True
+
+
+# Benchmark sequential and random-offset access for every file size
+def _run_benchmark(  # pylint: disable=too-many-locals
+    path: str,
+    file_sizes: Sequence[int],
+    block_size: int,
+    report: Optional[Dict[str, Any]],
+) -> bool:
+    # One block buffer is reused for every write and read
+    expected = bytearray(block_size)
+    buf = bytearray(block_size)
+    seed = payload.random_seed()
+    results = []
+    errors = 0
+
+    try:
+        for file_size in file_sizes:
+            num_blocks = file_size // block_size
+            latency_us = array("L", [0] * num_blocks)
+            offsets = array("L", [0] * num_blocks)
+            for i in range(num_blocks):
+                offsets[i] = random.randint(0, num_blocks - 1)
+            size = num_blocks * block_size
+
+            with open(path, "wb") as file:
+                duration, _ = _bench_pass(
+                    file, buf, expected, latency_us, None, True, seed
+                )
+            results.append(
+                _bench_result(SEQ_WRITE, size, block_size, duration, latency_us)
+            )
+
+            with open(path, "r+b") as file:
+                duration, _ = _bench_pass(
+                    file, buf, expected, latency_us, offsets, True, seed
+                )
+                results.append(
+                    _bench_result(RANDOM_WRITE, size, block_size, duration, latency_us)
+                )
+
+                duration, bad = _bench_pass(
+                    file, buf, expected, latency_us, None, False, seed
+                )
+                errors += bad
+                results.append(
+                    _bench_result(SEQ_READ, size, block_size, duration, latency_us)
+                )
+
+                duration, bad = _bench_pass(
+                    file, buf, expected, latency_us, offsets, False, seed
+                )
+                errors += bad
+                results.append(
+                    _bench_result(RANDOM_READ, size, block_size, duration, latency_us)
+                )
+    except OSError:
+        print("Could not access SD card")
+        return False
+    print()
+
+    if report is not None:
+        report["results"] = results
+        report["errors"] = errors
+
+    if errors:
+        print("FAIL: " + str(errors) + " bytes read back did not match")
+        return False
+
+    return True
+
+
+# Write and read back a binary file a few times. Returns tuple
+# [mismatched or missing bytes, total write ns, total read ns]
+def _sweep_verify(
+    path: str, test_buf: bytearray, read_buf: bytearray
+) -> Tuple[int, int, int]:
+    errors = 0
+    write_ns = 0
+    read_ns = 0
+    for _ in range(SWEEP_REPEATS):
+        payload.fill(test_buf, payload.random_seed())
+
+        start = time.monotonic_ns()
+        with open(path, "wb") as file:
+            file.write(test_buf)
+        write_ns += time.monotonic_ns() - start
+
+        start = time.monotonic_ns()
+        with open(path, "rb") as file:
+            num_read = file.readinto(read_buf)
+        read_ns += time.monotonic_ns() - start
+
+        errors += payload.compare(test_buf, read_buf)[0] + len(test_buf) - num_read
+
+    return errors, write_ns, read_ns
+
+
+# Remount the card at one baud rate and verify it. Returns a dictionary
+# describing the step
+def _sweep_step(
+    session: SDSession,
+    path: str,
+    baud_rate: int,
+    bufs: Tuple[bytearray, bytearray],
+) -> Dict[str, Any]:
+    step = {
+        "baud_rate": baud_rate,
+        "passed": False,
+        "errors": 0,
+        "write_bytes_per_s": 0,
+        "read_bytes_per_s": 0,
+    }
+    if not session.mount(baud_rate):
+        print(str(baud_rate) + " baud:\tFAIL, could not mount SD card")
+        return step
+
+    num_bytes = len(bufs[0]) * SWEEP_REPEATS
+    try:
+        errors, write_ns, read_ns = _sweep_verify(path, bufs[0], bufs[1])
+        step["errors"] = errors
+        step["passed"] = not errors
+        step["write_bytes_per_s"] = (num_bytes * 1000000000) // max(write_ns, 1)
+        step["read_bytes_per_s"] = (num_bytes * 1000000000) // max(read_ns, 1)
+    except OSError:
+        step["errors"] = num_bytes
+    session.unmount()
+
+    print(
+        str(baud_rate)
+        + " baud:\t"
+        + (PASS if step["passed"] else FAIL)
+        + ", "
+        + str(step["errors"])
+        + " errors, write "
+        + str(step["write_bytes_per_s"])
+        + " bytes/s, read "
+        + str(step["read_bytes_per_s"])
+        + " bytes/s"
+    )
+    return step
+
+
+# Remount and verify the card at every baud rate
+def _run_sweep(
+    session: SDSession,
+    path: str,
+    baud_rates: Sequence[int],
+    report: Optional[Dict[str, Any]],
+) -> bool:
+    bufs = (bytearray(SWEEP_BYTES), bytearray(SWEEP_BYTES))
+    steps = []
+    for baud_rate in baud_rates:
+        steps.append(_sweep_step(session, path, baud_rate, bufs))
+    print()
+
+    # Find the fastest stable baud rate
+    best = {"baud_rate": 0, "write_bytes_per_s": 0, "read_bytes_per_s": 0}
+    for step in steps:
+        if step["passed"] and step["baud_rate"] > best["baud_rate"]:
+            best = step
+
+    if report is not None:
+        report["steps"] = steps
+        report["max_baud_rate"] = best["baud_rate"]
+
+    if not best["baud_rate"]:
+        print("FAIL: No baud rate passed")
+        return False
+
+    print("Fastest stable clock:\t" + str(best["baud_rate"]) + " baud")
+    return True
+
+
+def run_test(  # pylint: disable=too-many-arguments,too-many-locals,too-many-branches
     pins: Sequence[str],
     mosi_pin: str = MOSI_PIN_NAME,
     miso_pin: str = MISO_PIN_NAME,
     sck_pin: str = SCK_PIN_NAME,
     cs_pin: str = CS_PIN_NAME,
     filename: str = FILENAME,
+    num_bytes: int = NUM_UART_BYTES,
+    mode: str = MODE_RANDOM,
+    report: Optional[Dict[str, Any]] = None,
+    file_sizes: Sequence[int] = BENCH_FILE_SIZES,
+    block_size: int = BENCH_BLOCK_SIZE,
+    baud_rate: int = BAUD_RATE,
+    baud_rates: Sequence[int] = SWEEP_BAUD_RATES,
+    session: Optional[SDSession] = None,
+    instrument: Optional[Instrument] = None,
+    timer: Optional[PhaseTimer] = None,
 ) -> Tuple[str, List[str]]:
     """
     Performs random writes and reads to file on attached SD card.
 
+    In ``MODE_BENCHMARK``, a file of each size in ``file_sizes`` is written
+    and read in blocks of ``block_size`` bytes, sequentially and at random
+    block offsets, reusing a single block buffer. Throughput (MB/s) and
+    per-block latency percentiles are printed and, if given, stored in
+    ``report``. The test fails without touching the card unless every file
+    size is at least ``block_size``, and ``block_size`` is positive.
+
+    In ``MODE_SWEEP``, the card is remounted at every rate in ``baud_rates``
+    and a fixed write and read back is repeated at each one. Throughput per
+    step and the fastest stable rate are printed and stored in ``report``.
+
+    Pass the same `SDSession` to repeated calls to keep the card mounted in
+    between. The card is unmounted whenever a test fails, so the next test
+    starts from a fresh mount.
+
     :param list[str] pins: list of pins to run the test on
     :param str mosi_pin: pin name of SPI MOSI
     :param str miso_pin: pin name of SPI MISO
     :param str sck_pin: pin name of SPI SCK
     :param str cs_pin: pin name of SPI CS
     :param str filename: name of file to use as test on SD card
+    :param int num_bytes: number of bytes written to the test file
+    :param str mode: ``MODE_RANDOM``, ``MODE_BENCHMARK`` or ``MODE_SWEEP``
+    :param dict report: optional dictionary that is filled with measurements
+    :param list[int] file_sizes: file sizes (bytes) used by the benchmark
+    :param int block_size: bytes per write or read in the benchmark
+    :param int baud_rate: SPI clock used to talk to the card
+    :param list[int] baud_rates: SPI clocks used by the sweep mode
+    :param SDSession session: optional session that keeps the card mounted
+        between tests. Without one, the card is mounted for this test only
+    :param instrument: optional callable from `adafruit_boardtest.fixture`.
+        When given, the prompt to insert the card is skipped
+    :param PhaseTimer timer: optional `adafruit_boardtest.timing.PhaseTimer`
+        that records how long each phase takes
     :return: tuple(str, list[str]): test result followed by list of pins tested
     """
 
     # Write characters to file on SD card and verify they were written
     if list(set(pins).intersection(set([mosi_pin, miso_pin, sck_pin]))):
-        # Tell user to connect SD card
-        print("Insert SD card into holder and connect SPI lines to holder.")
-        print("Connect " + cs_pin + " to the CS (DAT3) pin on the SD " + "card holder.")
-        print("WARNING: " + filename + " will be created or overwritten.")
-        print("Press enter to continue.")
-        input()
-
-        # Configure CS pin
-        csel = digitalio.DigitalInOut(getattr(board, cs_pin))
-        csel.direction = digitalio.Direction.OUTPUT
-        csel.value = True
-
-        # Set up SPI
-        spi = busio.SPI(
-            getattr(board, sck_pin),
-            MOSI=getattr(board, mosi_pin),
-            MISO=getattr(board, miso_pin),
-        )
-
-        # Try to connect to the card and mount the filesystem
-        try:
-            sdcard = adafruit_sdcard.SDCard(spi, csel)
-            vfs = storage.VfsFat(sdcard)
-            storage.mount(vfs, "/sd")
-        except OSError:
-            print("Could not mount SD card")
+        # Every benchmark file needs at least one whole block
+        if mode == MODE_BENCHMARK and not _bench_sizes_valid(file_sizes, block_size):
+            print("FAIL: Every file size must be at least the block size")
             return FAIL, [mosi_pin, miso_pin, sck_pin]
 
-        # Generate test string
-        test_str = ""
-        for _ in range(NUM_UART_BYTES):
-            test_str += chr(random.randint(ASCII_MIN, ASCII_MAX))
+        timer = timing.resolve(timer)
 
-        # Write test string to a text file on the card
-        try:
-            with open("/sd/" + filename, "w") as file:
-                print("Writing:\t" + test_str)
-                file.write(test_str)
-        except OSError:
-            print("Could not write to SD card")
-            return FAIL, [mosi_pin, miso_pin, sck_pin]
+        # Use a private session if none was given
+        own_session = session is None
+        if own_session:
+            session = SDSession()
 
-        # Read from test file on the card
-        read_str = ""
-        try:
-            with open("/sd/" + filename, "r") as file:
-                lines = file.readlines()
-                for line in lines:
-                    read_str += line
-            print("Read:\t\t" + read_str)
-        except OSError:
-            print("Could not write to SD card")
-            return FAIL, [mosi_pin, miso_pin, sck_pin]
+        # Tell user to connect SD card, unless it is mounted already
+        if instrument is None and not session.mounted:
+            timer.phase("prompt")
+            print("Insert SD card into holder and connect SPI lines to holder.")
+            print(
+                "Connect "
+                + cs_pin
+                + " to the CS (DAT3) pin on the SD "
+                + "card holder."
+            )
+            print("WARNING: " + filename + " will be created or overwritten.")
+            print("Press enter to continue.")
+            input()
 
-        # Release SPI
-        spi.deinit()
+        # Run the selected test. The sweep mounts the card itself, once for
+        # every baud rate, the other tests need it mounted beforehand
+        pass_test = False
+        try:
+            timer.phase("setup")
+            session.open(sck_pin, mosi_pin, miso_pin, cs_pin)
+            path = session.path(filename)
+            if mode == MODE_SWEEP:
+                timer.phase("test")
+                pass_test = _run_sweep(session, path, baud_rates, report)
+            elif not session.mount(baud_rate):
+                print("Could not mount SD card")
+            elif mode == MODE_BENCHMARK:
+                timer.phase("test")
+                pass_test = _run_benchmark(path, file_sizes, block_size, report)
+            else:
+                timer.phase("test")
+                pass_test = _run_random_test(path, num_bytes)
+        finally:
+            timer.phase("teardown")
+            # Don't leave a card that misbehaved mounted, and release SPI
+            # unless the caller owns the session
+            if not pass_test:
+                session.unmount()
+            if own_session:
+                session.close()
+            timer.stop()
 
-        # Compare strings
-        if read_str == test_str:
+        if pass_test:
             return PASS, [mosi_pin, miso_pin, sck_pin]
 
         return FAIL, [mosi_pin, miso_pin, sck_pin]
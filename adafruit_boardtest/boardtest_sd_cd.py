@@ -29,8 +29,13 @@ Implementation Notes
 import board
 import digitalio
 
+from adafruit_boardtest import fixture, pinnames, timing
+
 try:
-    from typing import Sequence, Tuple, List
+    from typing import Any, Dict, Sequence, Tuple, List, Optional
+    from adafruit_boardtest.fixture import Instrument
+    from adafruit_boardtest.timing import PhaseTimer
+    from adafruit_boardtest.sdsession import SDSession
 except ImportError:
     pass
 
@@ -38,7 +43,7 @@ __version__ = "0.0.0+auto.0"
 __repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_BoardTest.git"
 
 # Constants
-SD_CD_PIN_NAME = "SD_CD"
+SD_CD_PIN_NAME = pinnames.SD_CD
 
 # Test result strings
 PASS = "PASS"
@@ -46,42 +51,111 @@ FAIL = "FAIL"
 NA = "N/A"
 
 
-def run_test(
-    pins: Sequence[str], cd_pin: str = SD_CD_PIN_NAME
+# Ask for the card to be inserted and removed, checking the CD pin each time.
+# Returns False as soon as a check fails
+def _check_card(  # pylint: disable=too-many-arguments
+    cdt: digitalio.DigitalInOut,
+    session: Optional[SDSession],
+    instrument: Optional[Instrument],
+    report: Optional[Dict[str, Any]],
+    timer: PhaseTimer,
+    cd_pin: str,
+) -> bool:
+    # Tell user to insert SD card
+    timer.phase("prompt")
+    if instrument is None:
+        print("Connect " + cd_pin + " to CD pin on SD card holder.")
+        print("Insert SD card into holder.")
+        print("Press enter to continue.")
+        input()
+    elif not fixture.ask("Insert SD card into holder.", instrument):
+        print("Error: Card not inserted")
+        return False
+
+    # Make sure we see that the pin is low
+    timer.phase("test")
+    if report is not None:
+        report["inserted_level"] = cdt.value
+    if cdt.value:
+        print("Error: Card not detected")
+        return False
+
+    # Make sure the card responds through the shared session by mounting it
+    # afresh, as it may still be mounted from before it was inserted, and
+    # unmount it before it is pulled out
+    if session is not None and session.is_open:
+        session.unmount()
+        if not session.mount():
+            print("Error: Card detected but could not be mounted")
+            return False
+        session.unmount()
+
+    # Tell user to remove SD card
+    timer.phase("prompt")
+    if instrument is None:
+        print("Card detected. Remove card and press enter to continue.")
+        input()
+    elif not fixture.ask("Card detected. Remove card.", instrument):
+        print("Error: Card not removed")
+        return False
+
+    # Make sure we see that the pin is high
+    timer.phase("test")
+    if report is not None:
+        report["removed_level"] = cdt.value
+    if not cdt.value:
+        print("Error: Card detected")
+        return False
+
+    return True
+
+
+def run_test(  # pylint: disable=too-many-arguments
+    pins: Sequence[str],
+    cd_pin: str = SD_CD_PIN_NAME,
+    session: Optional[SDSession] = None,
+    instrument: Optional[Instrument] = None,
+    report: Optional[Dict[str, Any]] = None,
+    timer: Optional[PhaseTimer] = None,
 ) -> Tuple[str, List[str]]:
     """
     Checks status of CD pin as user inserts and removes SD card.
 
+    If an `SDSession` that has been used by the SD card test is given, the
+    inserted card is mounted afresh through it to check that it responds, and
+    it is unmounted before the card is removed. The CD pin is released
+    whether the test passes or not.
+
     :param list[str] pins: list of pins to run the test on
     :param str cd_pin: pin name of chip detect (CD) line
+    :param SDSession session: optional session shared with the SD card test
+    :param instrument: optional callable from `adafruit_boardtest.fixture`.
+        When given, it is asked to insert and remove the card instead of the
+        operator, and should answer once it has done so
+    :param dict report: optional dictionary that is filled with the CD pin
+        level seen with the card inserted and removed
+    :param PhaseTimer timer: optional `adafruit_boardtest.timing.PhaseTimer`
+        that records how long each phase takes
     :return: tuple(str, list[str]): test result followed by list of pins tested
     """
 
     # Ask user to insert and remove SD card
     if list(set(pins).intersection(set([cd_pin]))):
+        timer = timing.resolve(timer)
+
         # Configure CD pin as input with pullup
+        timer.phase("setup")
         cdt = digitalio.DigitalInOut(getattr(board, cd_pin))
-        cdt.direction = digitalio.Direction.INPUT
-        cdt.pull = digitalio.Pull.UP
-
-        # Tell user to insert SD card
-        print("Connect " + cd_pin + " to CD pin on SD card holder.")
-        print("Insert SD card into holder.")
-        print("Press enter to continue.")
-        input()
-
-        # Make sure we see that the pin is low
-        if cdt.value:
-            print("Error: Card not detected")
-            return FAIL, [cd_pin]
-
-        # Tell user to remove SD card
-        print("Card detected. Remove card and press enter to continue.")
-        input()
-
-        # Make sure we see that the pin is high
-        if not cdt.value:
-            print("Error: Card detected")
+        try:
+            cdt.direction = digitalio.Direction.INPUT
+            cdt.pull = digitalio.Pull.UP
+            pass_test = _check_card(cdt, session, instrument, report, timer, cd_pin)
+        finally:
+            # Release the CD pin
+            cdt.deinit()
+            timer.stop()
+
+        if not pass_test:
             return FAIL, [cd_pin]
 
         # Test passed
@@ -5,7 +5,10 @@
 """
 `adafruit_boardtest.boardtest_spi`
 ====================================================
-Performs random writes and reads to SPI EEPROM.
+Performs random writes and reads to SPI EEPROM. A burst mode is also available
+that writes the whole EEPROM one page at a time and reads it back in a single
+sequential read, using preallocated buffers. The burst verify can also be
+repeated over a range of baud rates to find the fastest reliable SPI clock.
 
 Run this script as its own main.py to individually run the test, or compile
 with mpy-cross and call from separate test script.
@@ -36,8 +39,12 @@ import board
 import digitalio
 import busio
 
+from adafruit_boardtest import payload, pinnames, timing
+
 try:
-    from typing import Tuple, Sequence, List
+    from typing import Any, Dict, Optional, Tuple, Sequence, List
+    from adafruit_boardtest.fixture import Instrument
+    from adafruit_boardtest.timing import PhaseTimer
 except ImportError:
     pass
 
@@ -45,12 +52,14 @@ __version__ = "0.0.0+auto.0"
 __repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_BoardTest.git"
 
 # Constants
-MOSI_PIN_NAME = "MOSI"
-MISO_PIN_NAME = "MISO"
-SCK_PIN_NAME = "SCK"
-CS_PIN_NAME = "D2"
+MOSI_PIN_NAME = pinnames.SPI_MOSI
+MISO_PIN_NAME = pinnames.SPI_MISO
+SCK_PIN_NAME = pinnames.SPI_SCK
+CS_PIN_NAME = pinnames.SPI_CS
 BAUD_RATE = 100000  # Bits per second
 NUM_SPI_TESTS = 10  # Number of times to write and read EEPROM values
+SWEEP_BAUD_RATES = (100000, 250000, 500000, 1000000, 2000000, 4000000, 8000000)
+SEARCH_STEPS = 6  # Number of bisection steps between the search bounds
 
 # Microchip 25AA040A EEPROM SPI commands and bits
 EEPROM_SPI_WRSR = 0x01
@@ -60,9 +69,18 @@ EEPROM_SPI_WRDI = 0x04
 EEPROM_SPI_RDSR = 0x05
 EEPROM_SPI_WREN = 0x06
 EEPROM_SPI_WIP_BIT = 0
+EEPROM_SPI_A8_BIT = 3  # Instruction bit that carries address bit 8
+EEPROM_SPI_PAGE_SIZE = 16  # Bytes per 25AA040A page write
+EEPROM_SPI_SIZE = 512  # Total 25AA040A memory size (bytes)
 EEPROM_SPI_MAX_ADDR = 255  # Self-imposed max memory address
 EEPROM_I2C_MAX_ADDR = 255  # Self-imposed max memory address
 
+# Test modes
+MODE_RANDOM = "random"  # Single byte writes and reads to random addresses
+MODE_BURST = "burst"  # Page writes and one sequential read of the whole EEPROM
+MODE_SWEEP = "sweep"  # Burst verify at every baud rate in a list
+MODE_SEARCH = "search"  # Burst verify while bisecting between two baud rates
+
 # Test result strings
 PASS = "PASS"
 FAIL = "FAIL"
@@ -145,42 +163,384 @@ def _eeprom_spi_read_byte(
     return True, result
 
 
-def run_test(
+class SPIBurstBuffers:  # pylint: disable=too-few-public-methods
+    """
+    Transfer buffers for burst access to the SPI EEPROM. They are allocated
+    once so that writing and reading the EEPROM does not allocate.
+
+    :param int size: number of bytes covered by a sequential read
+    """
+
+    def __init__(self, size: int = EEPROM_SPI_SIZE) -> None:
+        self.size = size
+        self.wren = bytearray([EEPROM_SPI_WREN])
+        self.status_out = bytearray([EEPROM_SPI_RDSR, 0])
+        self.status_in = bytearray(2)
+        self.page_out = bytearray(2 + EEPROM_SPI_PAGE_SIZE)
+        self.read_out = bytearray(2 + size)
+        self.read_in = bytearray(2 + size)
+
+
+# Wait for WIP bit to go low, using preallocated buffers
+def _eeprom_spi_burst_wait(
+    spi: busio.SPI,
+    csel: digitalio.DigitalInOut,
+    bufs: SPIBurstBuffers,
+    timeout: float = 1.0,
+) -> bool:
+    # Continually read from STATUS register
+    timestamp = time.monotonic()
+    while time.monotonic() < timestamp + timeout:
+        # Perform RDSR operation
+        csel.value = False
+        spi.write_readinto(bufs.status_out, bufs.status_in)
+        csel.value = True
+
+        # Mask out and compare WIP bit
+        if (bufs.status_in[1] & (1 << EEPROM_SPI_WIP_BIT)) == 0:
+            return True
+
+    return False
+
+
+# Write one page from data (starting at offset) to address. Returns status
+# (True for successful write, False otherwise)
+def _eeprom_spi_write_page(  # pylint: disable=too-many-arguments
+    spi: busio.SPI,
+    csel: digitalio.DigitalInOut,
+    bufs: SPIBurstBuffers,
+    address: int,
+    data: bytearray,
+    offset: int = 0,
+    timeout: float = 1.0,
+) -> bool:
+    # Make sure address is on a page boundary and inside the EEPROM
+    if address % EEPROM_SPI_PAGE_SIZE or address >= EEPROM_SPI_SIZE:
+        return False
+
+    # Wait for WIP to be low
+    if not _eeprom_spi_burst_wait(spi, csel, bufs, timeout):
+        return False
+
+    # Enable writing
+    csel.value = False
+    spi.write(bufs.wren)
+    csel.value = True
+
+    # Write the whole page in one transaction
+    page_out = bufs.page_out
+    page_out[0] = EEPROM_SPI_WRITE | (((address >> 8) & 1) << EEPROM_SPI_A8_BIT)
+    page_out[1] = address & 0xFF
+    for i in range(EEPROM_SPI_PAGE_SIZE):
+        page_out[i + 2] = data[offset + i]
+    csel.value = False
+    spi.write(page_out)
+    csel.value = True
+
+    return True
+
+
+# Sequential read starting at address. The data ends up in bufs.read_in,
+# starting at index 2. Returns status (True for successful read, False otherwise)
+def _eeprom_spi_read_burst(
+    spi: busio.SPI,
+    csel: digitalio.DigitalInOut,
+    bufs: SPIBurstBuffers,
+    address: int = 0,
+    timeout: float = 1.0,
+) -> bool:
+    # Make sure address is inside the EEPROM
+    if address >= EEPROM_SPI_SIZE:
+        return False
+
+    # Wait for WIP to be low
+    if not _eeprom_spi_burst_wait(spi, csel, bufs, timeout):
+        return False
+
+    # Read the whole region in one transaction
+    bufs.read_out[0] = EEPROM_SPI_READ | (((address >> 8) & 1) << EEPROM_SPI_A8_BIT)
+    bufs.read_out[1] = address & 0xFF
+    csel.value = False
+    spi.write_readinto(bufs.read_out, bufs.read_in)
+    csel.value = True
+
+    return True
+
+
+# Convert a byte count and a duration to bytes per second
+def _bytes_per_s(num_bytes: int, duration_ns: int) -> int:
+    return (num_bytes * 1000000000) // max(duration_ns, 1)
+
+
+# Write test data to the EEPROM page by page and read it back in one go.
+# Returns tuple [status, errors, first error address, write ns, read ns]
+def _burst_verify(
+    spi: busio.SPI,
+    csel: digitalio.DigitalInOut,
+    bufs: SPIBurstBuffers,
+    test_data: bytearray,
+) -> Tuple[bool, int, int, int, int]:
+    # Write every page
+    write_start = time.monotonic_ns()
+    for address in range(0, bufs.size, EEPROM_SPI_PAGE_SIZE):
+        if not _eeprom_spi_write_page(spi, csel, bufs, address, test_data, address):
+            return False, 0, -1, 0, 0
+    if not _eeprom_spi_burst_wait(spi, csel, bufs):
+        return False, 0, -1, 0, 0
+    write_ns = time.monotonic_ns() - write_start
+
+    # Read everything back
+    read_start = time.monotonic_ns()
+    if not _eeprom_spi_read_burst(spi, csel, bufs):
+        return False, 0, -1, 0, 0
+    read_ns = time.monotonic_ns() - read_start
+
+    # Compare in place, skipping the command bytes at the start of read_in
+    errors, first_error = payload.compare(
+        test_data, bufs.read_in, bufs.size, actual_start=2
+    )
+
+    return True, errors, first_error, write_ns, read_ns
+
+
+# Write the whole EEPROM with random data in bursts and read it back
+def _run_burst_test(
+    spi: busio.SPI, csel: digitalio.DigitalInOut, report: Optional[Dict[str, Any]]
+) -> bool:
+    # Preallocate buffers and generate random test data
+    bufs = SPIBurstBuffers()
+    test_data = bytearray(bufs.size)
+    seed = payload.random_seed()
+    payload.fill(test_data, seed)
+
+    print(
+        "Writing " + str(bufs.size) + " bytes in pages of " + str(EEPROM_SPI_PAGE_SIZE)
+    )
+    status, errors, first_error, write_ns, read_ns = _burst_verify(
+        spi, csel, bufs, test_data
+    )
+    if not status:
+        print("FAIL: SPI could not communicate")
+        return False
+
+    # Print out bus statistics
+    write_rate = _bytes_per_s(bufs.size, write_ns)
+    read_rate = _bytes_per_s(bufs.size, read_ns)
+    print("Write:\t\t" + str(write_rate) + " bytes/s")
+    print("Read:\t\t" + str(read_rate) + " bytes/s")
+    print()
+
+    if report is not None:
+        report["seed"] = seed
+        report["bytes"] = bufs.size
+        report["write_bytes_per_s"] = write_rate
+        report["read_bytes_per_s"] = read_rate
+        report["errors"] = errors
+        report["first_error"] = first_error
+
+    if errors:
+        print("FAIL: Data does not match at address " + hex(first_error))
+        return False
+
+    return True
+
+
+# Configure the bus and run one randomized burst verify at the given baud rate.
+# Returns a dictionary describing the step
+def _sweep_step(
+    spi: busio.SPI,
+    csel: digitalio.DigitalInOut,
+    bufs: SPIBurstBuffers,
+    test_data: bytearray,
+    baud_rate: int,
+) -> Dict[str, Any]:
+    # Use fresh data every step so stale EEPROM contents cannot pass
+    spi.configure(baudrate=baud_rate, phase=0, polarity=0)
+    payload.fill(test_data, payload.random_seed())
+    status, errors, _, _, read_ns = _burst_verify(spi, csel, bufs, test_data)
+    if not status:
+        errors = bufs.size
+
+    step = {
+        "baud_rate": baud_rate,
+        "frequency": spi.frequency,
+        "passed": status and not errors,
+        "errors": errors,
+        "error_rate": errors / bufs.size,
+        "read_bytes_per_s": _bytes_per_s(bufs.size, read_ns) if status else 0,
+    }
+    print(
+        str(baud_rate)
+        + " baud:\t"
+        + (PASS if step["passed"] else FAIL)
+        + ", "
+        + str(errors)
+        + " errors, "
+        + str(step["read_bytes_per_s"])
+        + " bytes/s"
+    )
+    return step
+
+
+# Run burst verifies over a list of baud rates (or bisect between the lowest
+# and highest of them) and report the fastest one that passed
+def _run_sweep_test(
+    spi: busio.SPI,
+    csel: digitalio.DigitalInOut,
+    baud_rates: Sequence[int],
+    search: bool,
+    report: Optional[Dict[str, Any]],
+) -> bool:
+    bufs = SPIBurstBuffers()
+    test_data = bytearray(bufs.size)
+    steps = []
+
+    if search:
+        # Make sure the lower bound works and check whether the upper one does
+        low = min(baud_rates)
+        high = max(baud_rates)
+        steps.append(_sweep_step(spi, csel, bufs, test_data, low))
+        if steps[-1]["passed"]:
+            steps.append(_sweep_step(spi, csel, bufs, test_data, high))
+            # Bisect between the last passing and the first failing rate
+            if not steps[-1]["passed"]:
+                for _ in range(SEARCH_STEPS):
+                    baud_rate = (low + high) // 2
+                    steps.append(_sweep_step(spi, csel, bufs, test_data, baud_rate))
+                    if steps[-1]["passed"]:
+                        low = baud_rate
+                    else:
+                        high = baud_rate
+    else:
+        for baud_rate in baud_rates:
+            steps.append(_sweep_step(spi, csel, bufs, test_data, baud_rate))
+    print()
+
+    # Find the fastest step that passed
+    best = {"baud_rate": 0, "frequency": 0, "read_bytes_per_s": 0}
+    for step in steps:
+        if step["passed"] and step["baud_rate"] > best["baud_rate"]:
+            best = step
+
+    if report is not None:
+        report["steps"] = steps
+        report["max_baud_rate"] = best["baud_rate"]
+        report["max_frequency"] = best["frequency"]
+        report["read_bytes_per_s"] = best["read_bytes_per_s"]
+
+    if not best["baud_rate"]:
+        print("FAIL: No baud rate passed")
+        return False
+
+    print(
+        "Fastest reliable clock:\t"
+        + str(best["baud_rate"])
+        + " baud ("
+        + str(best["frequency"])
+        + " Hz actual), "
+        + str(best["read_bytes_per_s"])
+        + " bytes/s"
+    )
+    return True
+
+
+# Pick random addresses, write to them, read from them, and see if they match
+def _run_random_test(spi: busio.SPI, csel: digitalio.DigitalInOut) -> bool:
+    for _ in range(NUM_SPI_TESTS):
+        # Randomly pick an address and a data value (one byte)
+        mem_addr = random.randint(0, EEPROM_SPI_MAX_ADDR)
+        mem_data = random.randint(0, 255)
+        print("Address:\t" + hex(mem_addr))
+        print("Writing:\t" + hex(mem_data))
+
+        # Try writing this random value to the random address
+        result = _eeprom_spi_write_byte(spi, csel, mem_addr, mem_data)
+        if not result:
+            print("FAIL: SPI could not communicate")
+            return False
+
+        # Try reading the written value back from EEPROM
+        result = _eeprom_spi_read_byte(spi, csel, mem_addr)
+        if not result[0]:
+            print("FAIL: SPI could not communicate")
+            return False
+        print("Read:\t\t" + hex(result[1][0]))
+        print()
+
+        # Compare the read value to the original value
+        if result[1][0] != mem_data:
+            print("FAIL: Data does not match")
+            return False
+
+    return True
+
+
+def run_test(  # pylint: disable=too-many-arguments
     pins: Sequence[str],
     mosi_pin: str = MOSI_PIN_NAME,
     miso_pin: str = MISO_PIN_NAME,
     sck_pin: str = SCK_PIN_NAME,
     cs_pin: str = CS_PIN_NAME,
+    mode: str = MODE_RANDOM,
+    report: Optional[Dict[str, Any]] = None,
+    baud_rates: Sequence[int] = SWEEP_BAUD_RATES,
+    instrument: Optional[Instrument] = None,
+    timer: Optional[PhaseTimer] = None,
 ) -> Tuple[str, List[str]]:
     """
-    Performs random writes and reads to file on attached SD card.
+    Performs random writes and reads to SPI EEPROM.
+
+    In ``MODE_BURST``, the whole EEPROM is written one page per transaction
+    and read back with a single sequential read, using preallocated buffers.
+    Throughput is printed and, if given, stored in ``report``.
+
+    ``MODE_SWEEP`` repeats a randomized burst verify at every rate in
+    ``baud_rates``. ``MODE_SEARCH`` bisects between the lowest and highest
+    rate in ``baud_rates`` instead. Both store the list of steps (baud rate,
+    actual frequency, errors, error rate and throughput) and the fastest
+    passing rate in ``report``.
 
     :param list[str] pins: list of pins to run the test on
     :param str mosi_pin: pin name of SPI MOSI
     :param str miso_pin: pin name of SPI MISO
     :param str sck_pin: pin name of SPI SCK
     :param str cs_pin: pin name of SPI CS
+    :param str mode: ``MODE_RANDOM``, ``MODE_BURST``, ``MODE_SWEEP`` or
+        ``MODE_SEARCH``
+    :param dict report: optional dictionary that is filled with measurements
+    :param list[int] baud_rates: baud rates used by the sweep and search modes
+    :param instrument: optional callable from `adafruit_boardtest.fixture`.
+        When given, the prompt to connect the hardware is skipped
+    :param PhaseTimer timer: optional `adafruit_boardtest.timing.PhaseTimer`
+        that records how long each phase and bus transaction takes
     :return: tuple(str, list[str]): test result followed by list of pins tested
     """
 
     # Write values to SPI EEPROM and verify the values match
     if list(set(pins).intersection(set([mosi_pin, miso_pin, sck_pin]))):
+        timer = timing.resolve(timer)
+
         # Tell user to connect EEPROM chip
-        print("Connect a Microchip 25AA040A EEPROM SPI chip.")
-        print("Connect " + cs_pin + " to the CS pin on the 25AA040.")
-        print("Press enter to continue.")
-        input()
+        if instrument is None:
+            timer.phase("prompt")
+            print("Connect a Microchip 25AA040A EEPROM SPI chip.")
+            print("Connect " + cs_pin + " to the CS pin on the 25AA040.")
+            print("Press enter to continue.")
+            input()
 
         # Configure CS pin
+        timer.phase("setup")
         csel = digitalio.DigitalInOut(getattr(board, cs_pin))
         csel.direction = digitalio.Direction.OUTPUT
         csel.value = True
 
         # Set up SPI
-        spi = busio.SPI(
-            getattr(board, sck_pin),
-            MOSI=getattr(board, mosi_pin),
-            MISO=getattr(board, miso_pin),
+        spi = timer.wrap(
+            busio.SPI(
+                getattr(board, sck_pin),
+                MOSI=getattr(board, mosi_pin),
+                MISO=getattr(board, miso_pin),
+            )
         )
 
         # Wait for SPI lock
@@ -188,39 +548,21 @@ def run_test(
             pass
         spi.configure(baudrate=BAUD_RATE, phase=0, polarity=0)
 
-        # Pick a random address, write to it, read from it, and see if they match
-        pass_test = True
-        for _ in range(NUM_SPI_TESTS):
-            # Randomly pick an address and a data value (one byte)
-            mem_addr = random.randint(0, EEPROM_SPI_MAX_ADDR)
-            mem_data = random.randint(0, 255)
-            print("Address:\t" + hex(mem_addr))
-            print("Writing:\t" + hex(mem_data))
-
-            # Try writing this random value to the random address
-            result = _eeprom_spi_write_byte(spi, csel, mem_addr, mem_data)
-            if not result:
-                print("FAIL: SPI could not communicate")
-                pass_test = False
-                break
-
-            # Try reading the written value back from EEPRom
-            result = _eeprom_spi_read_byte(spi, csel, mem_addr)
-            print("Read:\t\t" + hex(result[1][0]))
-            print()
-            if not result[0]:
-                print("FAIL: SPI could not communicate")
-                pass_test = False
-                break
-
-            # Compare the read value to the original value
-            if result[1][0] != mem_data:
-                print("FAIL: Data does not match")
-                pass_test = False
-                break
+        # Run the selected test
+        timer.phase("test")
+        if mode == MODE_BURST:
+            pass_test = _run_burst_test(spi, csel, report)
+        elif mode in (MODE_SWEEP, MODE_SEARCH):
+            pass_test = _run_sweep_test(
+                spi, csel, baud_rates, mode == MODE_SEARCH, report
+            )
+        else:
+            pass_test = _run_random_test(spi, csel)
 
         # Release SPI pins
+        timer.phase("teardown")
         spi.deinit()
+        timer.stop()
 
         # Return results
         if pass_test:
@@ -6,6 +6,8 @@
 `adafruit_boardtest.boardtest_uart`
 ====================================================
 Performs random writes and reads across UART. Connect a wire from TX pin to RX pin.
+A sustained mode is also available that streams binary data through the
+loopback at several baud rates and reports throughput and errors.
 
 Run this script as its own main.py to individually run the test, or compile
 with mpy-cross and call from separate test script.
@@ -24,13 +26,17 @@ Implementation Notes
 
 """
 
-import random
+import time
 
 import board
 import busio
 
+from adafruit_boardtest import payload, pinnames, timing
+
 try:
-    from typing import Sequence, Tuple, List
+    from typing import Any, Dict, Optional, Sequence, Tuple, List
+    from adafruit_boardtest.fixture import Instrument
+    from adafruit_boardtest.timing import PhaseTimer
 except ImportError:
     pass
 
@@ -38,12 +44,22 @@ __version__ = "0.0.0+auto.0"
 __repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_BoardTest.git"
 
 # Constants
-TX_PIN_NAME = "TX"
-RX_PIN_NAME = "RX"
+TX_PIN_NAME = pinnames.UART_TX
+RX_PIN_NAME = pinnames.UART_RX
 BAUD_RATE = 9600
 NUM_UART_BYTES = 40  # Number of bytes to transmit over UART
 ASCII_MIN = 0x21  # '!' Lowest ASCII char in random range (inclusive)
 ASCII_MAX = 0x7E  # '~' Highest ASCII char in random range (inclusive)
+SUSTAINED_BAUD_RATES = (9600, 115200, 250000, 500000, 1000000)
+SUSTAINED_VOLUME = 4096  # Number of bytes streamed at each baud rate
+SUSTAINED_CHUNK_SIZE = 64  # Number of bytes written between reads
+RX_BUFFER_SIZE = 512  # UART receive buffer size used in sustained mode
+DRAIN_TIMEOUT = 0.1  # Seconds to wait for the last bytes to arrive
+MAX_PRINT_BYTES = 80  # Longest payload that is echoed to the console
+
+# Test modes
+MODE_RANDOM = "random"  # Printable characters sent once at a single baud rate
+MODE_SUSTAINED = "sustained"  # Binary data streamed at several baud rates
 
 # Test result strings
 PASS = "PASS"
@@ -51,55 +67,273 @@ FAIL = "FAIL"
 NA = "N/A"
 
 
-def run_test(
+class _StreamChecker:  # pylint: disable=too-few-public-methods
+    """
+    Regenerates the expected byte stream from its seed as data arrives and
+    compares it in place, so the payload never has to be kept in memory.
+    """
+
+    def __init__(self, seed: int, volume: int) -> None:
+        self.generator = payload.Xorshift16(seed)
+        self.volume = volume
+        self.expected = bytearray(SUSTAINED_CHUNK_SIZE)
+        self.rx_buf = bytearray(SUSTAINED_CHUNK_SIZE)
+        self.rx_view = memoryview(self.rx_buf)
+        self.received = 0
+        self.corrupted = 0
+        self.first_error = -1
+
+    def read(self, uart: busio.UART) -> int:
+        """Reads whatever has arrived and returns the number of bytes read."""
+        count = min(uart.in_waiting, SUSTAINED_CHUNK_SIZE, self.volume - self.received)
+        if count:
+            # Only a partial chunk needs a slice of the view
+            view = self.rx_view
+            if count < SUSTAINED_CHUNK_SIZE:
+                view = view[:count]
+            count = uart.readinto(view) or 0
+            self.generator.fill(self.expected, 0, count)
+            errors, first_error = payload.compare(self.expected, self.rx_buf, count)
+            if errors and self.first_error < 0:
+                self.first_error = self.received + first_error
+            self.corrupted += errors
+            self.received += count
+        return count
+
+
+# Stream the payload through the loopback at one baud rate, reading while
+# writing. Returns a dictionary describing the step
+def _sustained_step(  # pylint: disable=too-many-locals,too-many-arguments
+    tx_pin: str,
+    rx_pin: str,
+    baud_rate: int,
+    seed: int,
+    volume: int,
+    timer: PhaseTimer,
+) -> Dict[str, Any]:
+    timer.phase("setup")
+    uart = timer.wrap(
+        busio.UART(
+            getattr(board, tx_pin),
+            getattr(board, rx_pin),
+            baudrate=baud_rate,
+            timeout=0,
+            receiver_buffer_size=RX_BUFFER_SIZE,
+        )
+    )
+    uart.reset_input_buffer()  # pylint: disable=no-member
+
+    # Write the payload in chunks, reading back after every chunk
+    generator = payload.Xorshift16(seed)
+    checker = _StreamChecker(seed, volume)
+    tx_buf = bytearray(SUSTAINED_CHUNK_SIZE)
+    tx_view = memoryview(tx_buf)
+    timer.phase("test")
+    start = time.monotonic_ns()
+    for offset in range(0, volume, SUSTAINED_CHUNK_SIZE):
+        count = min(SUSTAINED_CHUNK_SIZE, volume - offset)
+        generator.fill(tx_buf, 0, count)
+        if count == SUSTAINED_CHUNK_SIZE:
+            uart.write(tx_buf)
+        else:
+            uart.write(tx_view[:count])
+        checker.read(uart)
+
+    # Wait for the rest, giving up once nothing arrives for a while
+    timestamp = time.monotonic()
+    while checker.received < volume and time.monotonic() < timestamp + DRAIN_TIMEOUT:
+        if checker.read(uart):
+            timestamp = time.monotonic()
+    duration = time.monotonic_ns() - start
+
+    # Release UART pins
+    timer.phase("teardown")
+    uart.deinit()
+
+    # Anything that never arrived was dropped
+    dropped = volume - checker.received
+    first_error = checker.first_error
+    if dropped and first_error < 0:
+        first_error = checker.received
+    step = {
+        "baud_rate": baud_rate,
+        "bytes_per_s": (checker.received * 1000000000) // max(duration, 1),
+        "dropped": dropped,
+        "corrupted": checker.corrupted,
+        "first_error": first_error,
+        "passed": not dropped and not checker.corrupted,
+    }
+    print(
+        str(baud_rate)
+        + " baud:\t"
+        + (PASS if step["passed"] else FAIL)
+        + ", "
+        + str(step["bytes_per_s"])
+        + " bytes/s, "
+        + str(dropped)
+        + " dropped, "
+        + str(checker.corrupted)
+        + " corrupted"
+    )
+    return step
+
+
+# Stream binary data at every baud rate
+def _run_sustained_test(  # pylint: disable=too-many-arguments
+    tx_pin: str,
+    rx_pin: str,
+    baud_rates: Sequence[int],
+    volume: int,
+    report: Optional[Dict[str, Any]],
+    timer: PhaseTimer,
+) -> bool:
+    # Binary test data covers all byte values and is regenerated from the seed
+    seed = payload.random_seed()
+    print("Streaming " + str(volume) + " bytes at each baud rate")
+    steps = []
+    for baud_rate in baud_rates:
+        steps.append(_sustained_step(tx_pin, rx_pin, baud_rate, seed, volume, timer))
+    print()
+
+    # Find the fastest clean baud rate
+    max_baud_rate = 0
+    for step in steps:
+        if step["passed"] and step["baud_rate"] > max_baud_rate:
+            max_baud_rate = step["baud_rate"]
+
+    if report is not None:
+        report["seed"] = seed
+        report["bytes"] = volume
+        report["steps"] = steps
+        report["max_baud_rate"] = max_baud_rate
+
+    for step in steps:
+        if not step["passed"]:
+            print(
+                "FAIL: Errors at "
+                + str(step["baud_rate"])
+                + " baud starting at byte "
+                + str(step["first_error"])
+            )
+            return False
+
+    return True
+
+
+# Send random printable characters once and compare what comes back
+def _run_random_test(  # pylint: disable=too-many-arguments
+    tx_pin: str,
+    rx_pin: str,
+    baud_rate: int,
+    num_bytes: int,
+    report: Optional[Dict[str, Any]],
+    timer: PhaseTimer,
+) -> bool:
+    # Initialize UART
+    timer.phase("setup")
+    uart = timer.wrap(
+        busio.UART(getattr(board, tx_pin), getattr(board, rx_pin), baudrate=baud_rate)
+    )
+    uart.reset_input_buffer()  # pylint: disable=no-member
+
+    # Generate test payload
+    seed = payload.random_seed()
+    test_buf = bytearray(num_bytes)
+    recv_buf = bytearray(num_bytes)
+    payload.fill(test_buf, seed, ASCII_MIN, ASCII_MAX)
+
+    # Transmit test payload
+    timer.phase("test")
+    uart.write(test_buf)
+    if num_bytes <= MAX_PRINT_BYTES:
+        print("Transmitting:\t" + str(test_buf, "ascii"))
+    else:
+        print("Transmitting:\t" + str(num_bytes) + " bytes")
+
+    # Wait for received payload
+    received = uart.readinto(recv_buf) or 0
+    print("Received:\t" + str(received) + " bytes")
+
+    # Release UART pins
+    timer.phase("teardown")
+    uart.deinit()
+
+    # Compare payloads
+    timer.phase("verify")
+    offsets = []
+    errors, first_error = payload.compare(test_buf, recv_buf, received, offsets=offsets)
+    if report is not None:
+        report["seed"] = seed
+        report["bytes"] = num_bytes
+        report["received"] = received
+        report["errors"] = errors
+        report["mismatch_offsets"] = offsets
+    if errors:
+        print("Mismatch at byte " + str(first_error))
+
+    return not errors and received == num_bytes
+
+
+def run_test(  # pylint: disable=too-many-arguments
     pins: Sequence[str],
     tx_pin: str = TX_PIN_NAME,
     rx_pin: str = RX_PIN_NAME,
     baud_rate: int = BAUD_RATE,
+    mode: str = MODE_RANDOM,
+    report: Optional[Dict[str, Any]] = None,
+    baud_rates: Sequence[int] = SUSTAINED_BAUD_RATES,
+    volume: int = SUSTAINED_VOLUME,
+    num_bytes: int = NUM_UART_BYTES,
+    instrument: Optional[Instrument] = None,
+    timer: Optional[PhaseTimer] = None,
 ) -> Tuple[str, List[str]]:
     """
     Performs random writes out of TX pin and reads on RX.
 
+    In ``MODE_SUSTAINED``, ``volume`` bytes of random binary data are
+    streamed at every rate in ``baud_rates``, reading while writing. The
+    achieved throughput, dropped and corrupted byte counts and the offset of
+    the first error at each rate are printed and, if given, stored in
+    ``report``.
+
     :param list[str] pins: list of pins to run the test on
     :param str tx_pin: pin name of UART TX
     :param str rx_pin: pin name of UART RX
     :param int baudrate: the baudrate to use
+    :param str mode: ``MODE_RANDOM`` or ``MODE_SUSTAINED``
+    :param dict report: optional dictionary that is filled with measurements
+    :param list[int] baud_rates: baud rates used by the sustained mode
+    :param int volume: number of bytes streamed at each rate in sustained mode
+    :param int num_bytes: number of bytes sent in random mode
+    :param instrument: optional callable from `adafruit_boardtest.fixture`.
+        When given, the prompt to connect the hardware is skipped
+    :param PhaseTimer timer: optional `adafruit_boardtest.timing.PhaseTimer`
+        that records how long each phase and bus transaction takes
     :return: tuple(str, list[str]): test result followed by list of pins tested
     """
 
     # Echo some values over the UART
     if list(set(pins).intersection(set([tx_pin, rx_pin]))):
-        # Tell user to create loopback connection
-        print("Connect a wire from TX to RX. Press enter to continue.")
-        input()
+        timer = timing.resolve(timer)
 
-        # Initialize UART
-        uart = busio.UART(
-            getattr(board, tx_pin), getattr(board, rx_pin), baudrate=baud_rate
-        )
-        uart.reset_input_buffer()  # pylint: disable=no-member
-
-        # Generate test string
-        test_str = ""
-        for _ in range(NUM_UART_BYTES):
-            test_str += chr(random.randint(ASCII_MIN, ASCII_MAX))
-
-        # Transmit test string
-        uart.write(bytearray(test_str))
-        print("Transmitting:\t" + test_str)
-
-        # Wait for received string
-        data = uart.read(len(test_str))
-        recv_str = ""
-        if data is not None:
-            recv_str = "".join([chr(b) for b in data])
-            print("Received:\t" + recv_str)
+        # Tell user to create loopback connection
+        if instrument is None:
+            timer.phase("prompt")
+            print("Connect a wire from TX to RX. Press enter to continue.")
+            input()
 
-        # Release UART pins
-        uart.deinit()
+        # Run the selected test
+        if mode == MODE_SUSTAINED:
+            pass_test = _run_sustained_test(
+                tx_pin, rx_pin, baud_rates, volume, report, timer
+            )
+        else:
+            pass_test = _run_random_test(
+                tx_pin, rx_pin, baud_rate, num_bytes, report, timer
+            )
+        timer.stop()
 
-        # Compare strings
-        if recv_str == test_str:
+        if pass_test:
             return PASS, [tx_pin, rx_pin]
 
         return FAIL, [tx_pin, rx_pin]
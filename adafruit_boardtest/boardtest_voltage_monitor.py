@@ -9,6 +9,15 @@ Prints out the measured voltage on any onboard voltage/battery monitor pins.
 Note that some boards have an onboard voltage divider to decrease the voltage
 to these pins.
 
+In oversample mode, every pin is read many times into a preallocated buffer
+(with ``analogbufio`` where the port has it) and the readings are checked
+against a voltage window automatically instead of by the operator.
+
+In stream mode, every pin is sampled at a fixed rate for minutes at a time
+into a ring buffer that holds the latest readings. Running statistics are
+kept as the samples come in, a summary is printed every interval and any
+brown-out dip is caught, however short, as long as it spans a sample.
+
 Run this script as its own main.py to individually run the test, or compile
 with mpy-cross and call from separate test script.
 
@@ -28,11 +37,23 @@ Implementation Notes
 
 """
 
+import array
+import time
+
 import board
 import analogio
 
 try:
-    from typing import Sequence, Tuple, List
+    import analogbufio
+except ImportError:
+    analogbufio = None
+
+from adafruit_boardtest import fixture, pinnames, timing
+
+try:
+    from typing import Any, Dict, Optional, Sequence, Tuple, List
+    from adafruit_boardtest.fixture import Instrument
+    from adafruit_boardtest.timing import PhaseTimer
 except ImportError:
     pass
 
@@ -40,9 +61,28 @@ __version__ = "0.0.0+auto.0"
 __repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_BoardTest.git"
 
 # Constants
-VOLTAGE_MONITOR_PIN_NAMES = ["VOLTAGE_MONITOR", "BATTERY"]
+VOLTAGE_MONITOR_PIN_NAMES = list(pinnames.VOLTAGE_MONITORS)
 ANALOG_REF = 3.3  # Reference analog voltage
 ANALOGIN_BITS = 16  # ADC resolution (bits) for CircuitPython
+SAMPLE_COUNT = 256  # Readings taken per pin in oversample mode
+SAMPLE_RATE = 20000  # Samples per second when analogbufio is available
+MIN_VOLTAGE = 0.1  # Below this the pin looks shorted to ground
+MAX_VOLTAGE = ANALOG_REF - 0.1  # Above this the pin looks tied to the rail
+MAX_NOISE = 0.05  # Largest standard deviation (V) of a stable reading
+TOLERANCE_SIGMAS = 3  # Standard deviations added around the mean
+ADC_STEP = ANALOG_REF / 4096  # One step of a 12-bit converter, in volts
+STREAM_DURATION = 60.0  # Seconds to stream for in stream mode
+STREAM_RATE = 1000  # Samples per second per pin in stream mode
+SUMMARY_INTERVAL = 1.0  # Seconds between printed summaries in stream mode
+RING_SIZE = 256  # Latest readings kept per pin in stream mode
+BROWNOUT_DROP = 0.1  # A dip is a reading this fraction below the running mean
+BASELINE_SAMPLES = 16  # Readings taken before dips are looked for
+MAX_DIPS = 16  # Dips recorded in detail per pin, later ones are only counted
+
+# Test modes
+MODE_PROMPT = "prompt"  # One reading per pin, checked by the operator
+MODE_OVERSAMPLE = "oversample"  # Many readings per pin, checked automatically
+MODE_STREAM = "stream"  # Readings at a fixed rate for a long time
 
 # Test result strings
 PASS = "PASS"
@@ -50,11 +90,344 @@ FAIL = "FAIL"
 NA = "N/A"
 
 
-def run_test(pins: Sequence[str]) -> Tuple[str, List[str]]:
+# Fill the buffer with readings from a pin. Returns the time taken in
+# nanoseconds and whether analogbufio did the sampling
+def _acquire(pin: str, samples: array.array) -> Tuple[int, bool]:
+    count = len(samples)
+    if analogbufio is not None:
+        try:
+            adc = analogbufio.BufferedIn(getattr(board, pin), sample_rate=SAMPLE_RATE)
+        except (ValueError, NotImplementedError):
+            adc = None
+        if adc is not None:
+            start = time.monotonic_ns()
+            adc.readinto(samples)
+            duration_ns = time.monotonic_ns() - start
+            adc.deinit()
+            return duration_ns, True
+
+    # Fall back to reading one value at a time
+    monitor = analogio.AnalogIn(getattr(board, pin))
+    start = time.monotonic_ns()
+    for i in range(count):
+        samples[i] = monitor.value
+    duration_ns = time.monotonic_ns() - start
+    monitor.deinit()
+    return duration_ns, False
+
+
+# Mean, minimum, maximum and standard deviation of the readings, in one pass
+def _statistics(samples: array.array) -> Tuple[float, int, int, float]:
+    count = 0
+    mean = 0.0
+    squares = 0.0
+    lowest = samples[0]
+    highest = samples[0]
+    for value in samples:
+        count += 1
+        delta = value - mean
+        mean += delta / count
+        squares += delta * (value - mean)
+        if value < lowest:
+            lowest = value
+        elif value > highest:
+            highest = value
+    return mean, lowest, highest, (squares / count) ** 0.5
+
+
+# Convert a 16-bit reading to volts
+def _volts(value: float) -> float:
+    return (value * ANALOG_REF) / (2**ANALOGIN_BITS)
+
+
+# Read every pin many times and check the readings against the window
+def _run_oversample_test(  # pylint: disable=too-many-locals
+    monitor_pins: Sequence[str],
+    sample_count: int,
+    window: Tuple[float, float],
+    report: Optional[Dict[str, Any]],
+    timer: PhaseTimer,
+) -> bool:
+    timer.phase("setup")
+    samples = array.array("H", (0 for _ in range(sample_count)))
+
+    timer.phase("test")
+    passed = True
+    for pin in monitor_pins:
+        duration_ns, buffered = _acquire(pin, samples)
+        mean, lowest, highest, deviation = _statistics(samples)
+        mean = _volts(mean)
+        deviation = _volts(deviation)
+        tolerance = TOLERANCE_SIGMAS * deviation + ADC_STEP
+        sample_rate = (sample_count * 1000000000) // max(duration_ns, 1)
+        ok = (
+            deviation <= MAX_NOISE
+            and window[0] <= mean - tolerance
+            and mean + tolerance <= window[1]
+        )
+        passed = passed and ok
+
+        print(pin + ": {:.3f}".format(mean) + " V", end=" ")
+        print("+/- {:.3f}".format(tolerance) + " V", end=" ")
+        print("({:.3f}".format(_volts(lowest)), end=" - ")
+        print("{:.3f}".format(_volts(highest)) + " V),", end=" ")
+        print(str(sample_rate) + " samples/s", end=" ")
+        print(PASS if ok else FAIL)
+        if report is not None:
+            report.setdefault("voltages", {})[pin] = mean
+            report.setdefault("samples", {})[pin] = {
+                "count": sample_count,
+                "mean": mean,
+                "min": _volts(lowest),
+                "max": _volts(highest),
+                "stddev": deviation,
+                "tolerance": tolerance,
+                "sample_rate": sample_rate,
+                "buffered": buffered,
+                "passed": ok,
+            }
+    print()
+
+    timer.stop()
+    return passed
+
+
+class _Stream:  # pylint: disable=too-many-instance-attributes
+    # Readings of one pin in stream mode. Only the ring buffer grows with the
+    # number of samples kept. The means are updated in place with every
+    # reading rather than kept as sums, so they never outgrow a small int
+
+    def __init__(self, pin: str, ring_size: int) -> None:
+        self.pin = pin
+        self.adc = analogio.AnalogIn(getattr(board, pin))
+        self.ring = array.array("H", (0 for _ in range(ring_size)))
+        self.count = 0
+        self.mean = 0.0
+        self.lowest = 2**ANALOGIN_BITS
+        self.highest = 0
+        self.dips = []
+        self.dip_count = 0
+        self._dip_start = None
+        self._dip_lowest = 0
+        self.interval_count = 0
+        self.interval_mean = 0.0
+        self.interval_lowest = 2**ANALOGIN_BITS
+        self.interval_highest = 0
+
+    def restart_interval(self) -> None:
+        """Starts the statistics of the next summary interval."""
+        self.interval_count = 0
+        self.interval_mean = 0.0
+        self.interval_lowest = 2**ANALOGIN_BITS
+        self.interval_highest = 0
+
+    def sample(self, now: int) -> None:
+        """Takes a reading, ``now`` nanoseconds into the stream."""
+        value = self.adc.value
+        self.ring[self.count % len(self.ring)] = value
+
+        # Look for a dip against the mean of the readings before this one
+        if self.count >= BASELINE_SAMPLES:
+            low = value < self.mean * (1 - BROWNOUT_DROP)
+            if low and self._dip_start is None:
+                self._dip_start = now
+                self._dip_lowest = value
+                self.dip_count += 1
+            elif low:
+                self._dip_lowest = min(self._dip_lowest, value)
+            elif self._dip_start is not None:
+                self.end_dip(now)
+
+        self.count += 1
+        self.mean += (value - self.mean) / self.count
+        self.lowest = min(self.lowest, value)
+        self.highest = max(self.highest, value)
+        self.interval_count += 1
+        self.interval_mean += (value - self.interval_mean) / self.interval_count
+        self.interval_lowest = min(self.interval_lowest, value)
+        self.interval_highest = max(self.interval_highest, value)
+
+    def end_dip(self, now: int) -> None:
+        """Ends the dip in progress, if any."""
+        if self._dip_start is not None and len(self.dips) < MAX_DIPS:
+            self.dips.append(
+                (self._dip_start, now - self._dip_start, _volts(self._dip_lowest))
+            )
+        self._dip_start = None
+
+    def print_interval(self, now: int) -> None:
+        """Prints the readings since the last summary and restarts them."""
+        print("{:7.1f}".format(now / 1000000000) + " s", end=" ")
+        print(self.pin + ":", end=" ")
+        print("min {:.3f}".format(_volts(self.interval_lowest)), end=", ")
+        print("mean {:.3f}".format(_volts(self.interval_mean)), end=", ")
+        print("max {:.3f}".format(_volts(self.interval_highest)), end=" V, ")
+        print(str(self.dip_count) + " dips")
+        self.restart_interval()
+
+    def recent(self) -> List[float]:
+        """Latest readings, oldest first, in volts."""
+        size = min(self.count, len(self.ring))
+        first = self.count - size
+        return [_volts(self.ring[i % len(self.ring)]) for i in range(first, self.count)]
+
+
+class _SampleClock:
+    # Paces the samples of stream mode and counts the sample times that went
+    # by before the loop got to them
+
+    def __init__(self, rate: int, duration: float) -> None:
+        self.period_ns = 1000000000 // rate
+        self.start = time.monotonic_ns()
+        self.end = self.start + int(duration * 1000000000)
+        self.deadline = self.start
+        self.overruns = 0
+
+    def running(self) -> bool:
+        """True until the stream duration is over."""
+        return self.deadline < self.end
+
+    def wait(self) -> int:
+        """Waits for the next sample time and returns nanoseconds since start."""
+        # Sleep through most of the gap, then spin for the rest
+        now = time.monotonic_ns()
+        if self.deadline - now > 2000000:
+            time.sleep((self.deadline - now - 1000000) / 1000000000)
+        while time.monotonic_ns() < self.deadline:
+            pass
+        now = time.monotonic_ns()
+
+        # Skip the sample times that have already gone by
+        self.deadline += self.period_ns
+        if now > self.deadline:
+            missed = (now - self.deadline) // self.period_ns + 1
+            self.overruns += missed
+            self.deadline += missed * self.period_ns
+        return now - self.start
+
+
+# Print the outcome of one pin in stream mode. A pin passes if it never
+# dipped and its mean stayed inside the window
+def _stream_result(
+    stream: _Stream,
+    window: Tuple[float, float],
+    elapsed: int,
+    overruns: int,
+    report: Optional[Dict[str, Any]],
+) -> bool:
+    mean = _volts(stream.mean)
+    ok = not stream.dip_count and window[0] <= mean <= window[1]
+    print(stream.pin + ": {:.3f}".format(mean) + " V mean", end=", ")
+    print(str(stream.count) + " samples", end=", ")
+    print(str(stream.dip_count) + " brown-out dips", end=" ")
+    print(PASS if ok else FAIL)
+    for dip in stream.dips:
+        print("  dip at {:.3f}".format(dip[0] / 1000000000) + " s", end=", ")
+        print(str(dip[1] // 1000) + " us", end=", ")
+        print("down to {:.3f}".format(dip[2]) + " V")
+    if report is not None:
+        report.setdefault("voltages", {})[stream.pin] = mean
+        report.setdefault("stream", {})[stream.pin] = {
+            "samples": stream.count,
+            "sample_rate": (stream.count * 1000000000) // max(elapsed, 1),
+            "overruns": overruns,
+            "mean": mean,
+            "min": _volts(stream.lowest),
+            "max": _volts(stream.highest),
+            "dips": stream.dip_count,
+            "dip_events": list(stream.dips),
+            "recent": stream.recent(),
+            "passed": ok,
+        }
+    return ok
+
+
+# Sample every pin at a fixed rate, printing a summary every interval and
+# catching brown-out dips
+def _run_stream_test(  # pylint: disable=too-many-arguments
+    monitor_pins: Sequence[str],
+    duration: float,
+    rate: int,
+    window: Tuple[float, float],
+    report: Optional[Dict[str, Any]],
+    timer: PhaseTimer,
+) -> bool:
+    timer.phase("setup")
+    streams = [_Stream(pin, RING_SIZE) for pin in monitor_pins]
+    interval_ns = int(SUMMARY_INTERVAL * 1000000000)
+
+    timer.phase("test")
+    clock = _SampleClock(rate, duration)
+    summary_at = interval_ns
+    while clock.running():
+        now = clock.wait()
+        for stream in streams:
+            stream.sample(now)
+
+        # Print the readings since the last summary
+        if now >= summary_at:
+            for stream in streams:
+                stream.print_interval(now)
+            summary_at += interval_ns
+    elapsed = time.monotonic_ns() - clock.start
+    overruns = clock.overruns
+
+    # Release pins
+    timer.phase("teardown")
+    for stream in streams:
+        stream.end_dip(elapsed)
+        stream.adc.deinit()
+    timer.stop()
+    print()
+
+    passed = True
+    for stream in streams:
+        passed = _stream_result(stream, window, elapsed, overruns, report) and passed
+    print("Missed sample times:", overruns)
+    print()
+
+    return passed
+
+
+def run_test(  # pylint: disable=too-many-arguments
+    pins: Sequence[str],
+    instrument: Optional[Instrument] = None,
+    report: Optional[Dict[str, Any]] = None,
+    timer: Optional[PhaseTimer] = None,
+    mode: str = MODE_PROMPT,
+    sample_count: int = SAMPLE_COUNT,
+    window: Tuple[float, float] = (MIN_VOLTAGE, MAX_VOLTAGE),
+    duration: float = STREAM_DURATION,
+    rate: int = STREAM_RATE,
+) -> Tuple[str, List[str]]:
     """
     Prints out voltage on the battery monitor or voltage monitor pin.
 
+    ``MODE_OVERSAMPLE`` takes ``sample_count`` readings per pin instead of
+    one. A pin passes if the readings are stable and their mean, give or take
+    `TOLERANCE_SIGMAS` standard deviations, lies inside ``window``. No
+    question is asked.
+
+    ``MODE_STREAM`` samples every pin ``rate`` times a second for
+    ``duration`` seconds. The running minimum, mean and maximum are printed
+    every `SUMMARY_INTERVAL` seconds. A reading more than `BROWNOUT_DROP`
+    below the running mean starts a brown-out dip, and the start, length and
+    lowest voltage of every dip are recorded. A pin passes if it never dipped
+    and its mean lies inside ``window``.
+
     :param list[str] pins: list of pins to run the test on
+    :param instrument: optional callable from `adafruit_boardtest.fixture`
+        that answers the question instead of the operator
+    :param dict report: optional dictionary that is filled with the measured
+        voltage of each pin
+    :param PhaseTimer timer: optional `adafruit_boardtest.timing.PhaseTimer`
+        that records how long each phase takes
+    :param str mode: ``MODE_PROMPT``, ``MODE_OVERSAMPLE`` or ``MODE_STREAM``
+    :param int sample_count: readings per pin in ``MODE_OVERSAMPLE``
+    :param tuple(float, float) window: lowest and highest voltage a pin may
+        read in ``MODE_OVERSAMPLE`` and ``MODE_STREAM``
+    :param float duration: seconds to stream for in ``MODE_STREAM``
+    :param int rate: samples per second per pin in ``MODE_STREAM``
     :return: tuple(str, list[str]): test result followed by list of pins tested
     """
 
@@ -69,22 +442,42 @@ def run_test(pins: Sequence[str]) -> Tuple[str, List[str]]:
             print(pin, end=" ")
         print("\n")
 
+        # Check the readings without asking in oversample and stream modes
+        timer = timing.resolve(timer)
+        if mode in (MODE_OVERSAMPLE, MODE_STREAM):
+            if mode == MODE_OVERSAMPLE:
+                result = _run_oversample_test(
+                    monitor_pins, sample_count, window, report, timer
+                )
+            else:
+                result = _run_stream_test(
+                    monitor_pins, duration, rate, window, report, timer
+                )
+            if result:
+                return PASS, monitor_pins
+            return FAIL, monitor_pins
+
         # Print out the voltage found on each pin
+        timer.phase("test")
         for pin in monitor_pins:
             monitor = analogio.AnalogIn(getattr(board, pin))
-            voltage = (monitor.value * ANALOG_REF) / (2**ANALOGIN_BITS)
+            voltage = _volts(monitor.value)
             print(pin + ": {:.2f}".format(voltage) + " V")
+            if report is not None:
+                report.setdefault("voltages", {})[pin] = voltage
             monitor.deinit()
         print()
 
         # Ask the user to check these voltages
+        timer.phase("prompt")
         print("Use a multimeter to verify these voltages.")
         print(
             "Note that some battery monitor pins might have onboard "
             + "voltage dividers."
         )
-        print("Do the values look reasonable? [y/n]")
-        if input() == "y":
+        answer = fixture.ask("Do the values look reasonable? [y/n]", instrument)
+        timer.stop()
+        if answer:
             return PASS, monitor_pins
 
         return FAIL, monitor_pins
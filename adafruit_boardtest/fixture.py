@@ -0,0 +1,173 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_boardtest.fixture`
+====================================================
+Answers the questions the tests would otherwise ask an operator.
+
+Every ``run_test`` function takes an optional ``instrument``. Without one, the
+tests prompt on the serial console as usual. With one, the "connect this and
+press enter" prompts are skipped and every question is passed to the
+instrument instead. An instrument is any callable that takes the question as
+a string and returns True (yes), False (no) or None (no answer yet, ask again
+later), so it can watch a GPIO or ADC while a test is running. This module
+provides a few ready made instruments.
+
+* Author(s): Adafruit Industries
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://github.com/adafruit/circuitpython/releases
+
+"""
+
+import time
+
+import analogio
+import board
+import digitalio
+import supervisor
+
+try:
+    from typing import Callable, Optional
+
+    Instrument = Callable[[str], Optional[bool]]
+except ImportError:
+    pass
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_BoardTest.git"
+
+# Constants
+INSTRUMENT_TIMEOUT = 5.0  # Seconds to wait for an instrument to answer
+POLL_INTERVAL = 0.01  # Seconds between questions to an instrument
+ANALOG_REF = 3.3  # Reference analog voltage
+ANALOGIN_BITS = 16  # ADC resolution (bits) for CircuitPython
+
+
+def poll_answer(
+    question: str, instrument: Optional[Instrument] = None
+) -> Optional[bool]:
+    """
+    Checks for an answer without blocking. Without an instrument, this reads a
+    "y" or "n" from the serial console if one has been typed.
+
+    :param str question: the question being asked
+    :param instrument: optional callable that answers the question
+    :return: bool: the answer, or None if there is none yet
+    """
+    if instrument is not None:
+        return instrument(question)
+
+    if supervisor.runtime.serial_bytes_available:
+        return input() == "y"
+
+    return None
+
+
+def ask(
+    question: str,
+    instrument: Optional[Instrument] = None,
+    timeout: float = INSTRUMENT_TIMEOUT,
+) -> bool:
+    """
+    Prints a question and waits for the answer. Without an instrument, this
+    waits for the operator to type "y" or "n". An instrument that has not
+    answered within ``timeout`` seconds counts as a no.
+
+    :param str question: the question to ask
+    :param instrument: optional callable that answers the question
+    :param float timeout: seconds to wait for the instrument
+    :return: bool: True for yes, False for no
+    """
+    print(question)
+    if instrument is None:
+        return input() == "y"
+
+    timestamp = time.monotonic()
+    while True:
+        answer = instrument(question)
+        if answer is not None:
+            return bool(answer)
+        if time.monotonic() > timestamp + timeout:
+            print("No answer from instrument")
+            return False
+        time.sleep(POLL_INTERVAL)
+
+
+def fixed(answer: bool) -> Instrument:
+    """
+    Makes an instrument that always gives the same answer, for stubbing out
+    checks that a fixture cannot make.
+
+    :param bool answer: the answer to every question
+    :return: the instrument
+    """
+
+    def _instrument(_: str) -> Optional[bool]:
+        return answer
+
+    return _instrument
+
+
+class GPIOReadback:
+    """
+    Instrument that watches a digital input wired to a pin under test. It
+    answers yes once it has seen the input change level ``edges`` times.
+    Until then it has no answer, so `ask` eventually times out on a pin that
+    is stuck.
+
+    :param str pin: pin name of the input
+    :param int edges: number of level changes to wait for
+    """
+
+    def __init__(self, pin: str, edges: int = 4) -> None:
+        self._input = digitalio.DigitalInOut(getattr(board, pin))
+        self._input.direction = digitalio.Direction.INPUT
+        self._edges = edges
+        self._seen = 0
+        self._last = self._input.value
+
+    def __call__(self, question: str) -> Optional[bool]:
+        value = self._input.value
+        if value != self._last:
+            self._last = value
+            self._seen += 1
+        if self._seen >= self._edges:
+            self._seen = 0
+            return True
+        return None
+
+    def deinit(self) -> None:
+        """Releases the input pin."""
+        self._input.deinit()
+
+
+class ADCThreshold:
+    """
+    Instrument that answers yes if the voltage on an analog input is inside a
+    window, and no otherwise.
+
+    :param str pin: pin name of the analog input
+    :param float low: lowest acceptable voltage
+    :param float high: highest acceptable voltage
+    """
+
+    def __init__(self, pin: str, low: float, high: float) -> None:
+        self._input = analogio.AnalogIn(getattr(board, pin))
+        self._low = low
+        self._high = high
+
+    def __call__(self, question: str) -> Optional[bool]:
+        voltage = (self._input.value * ANALOG_REF) / (2**ANALOGIN_BITS)
+        return self._low <= voltage <= self._high
+
+    def deinit(self) -> None:
+        """Releases the analog input pin."""
+        self._input.deinit()
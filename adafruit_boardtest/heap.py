@@ -0,0 +1,172 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_boardtest.heap`
+====================================================
+Tracks heap usage while a test runs.
+
+A `HeapMonitor` reads ``gc.mem_alloc()`` and ``gc.mem_free()`` before and
+after a test. Attached to a `adafruit_boardtest.timing.PhaseTimer`, it also
+samples the heap at every phase change and after every timed bus transaction,
+which gives the peak usage of each phase. CircuitPython does not count garbage
+collections, so a drop in allocated memory between two samples is counted as
+one collection instead.
+
+On CPython, where ``gc`` has no ``mem_alloc``, the sizes come from
+``tracemalloc`` and free memory is reported as -1.
+
+* Author(s): Adafruit Industries
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://github.com/adafruit/circuitpython/releases
+
+"""
+
+import gc
+
+try:
+    from typing import Any, Dict, Optional
+except ImportError:
+    pass
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_BoardTest.git"
+
+
+def mem_alloc() -> int:
+    """
+    Returns the number of heap bytes in use.
+
+    :return: int: allocated bytes
+    """
+    try:
+        return gc.mem_alloc()  # pylint: disable=no-member
+    except AttributeError:
+        return _host_mem_alloc()
+
+
+def mem_free() -> int:
+    """
+    Returns the number of free heap bytes.
+
+    :return: int: free bytes, or -1 if the heap size is not known
+    """
+    try:
+        return gc.mem_free()  # pylint: disable=no-member
+    except AttributeError:
+        return -1
+
+
+def _host_mem_alloc() -> int:
+    import tracemalloc  # pylint: disable=import-outside-toplevel
+
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    return tracemalloc.get_traced_memory()[0]
+
+
+class HeapMonitor:
+    """
+    Records heap usage before and after a test, and per phase.
+
+    :param int budget: optional number of bytes the test may have allocated
+        at any time, on top of what was allocated before it started.
+        `exceeded` tells if it went over
+    :param bool collect: True to run ``gc.collect()`` before the test starts,
+        so it starts from a compacted heap
+    """
+
+    def __init__(self, budget: Optional[int] = None, collect: bool = True) -> None:
+        self.budget = budget
+        self.collect = collect
+        self.before_alloc = 0
+        self.before_free = 0
+        self.after_alloc = 0
+        self.after_free = 0
+        self.peak_alloc = 0
+        self.collections = 0
+        self.phases = {}
+        self._phase = None
+        self._last = 0
+
+    def start(self) -> None:
+        """Takes the readings before the test."""
+        if self.collect:
+            gc.collect()
+        self.before_alloc = mem_alloc()
+        self.before_free = mem_free()
+        self.peak_alloc = self.before_alloc
+        self._last = self.before_alloc
+
+    def sample(self) -> int:
+        """
+        Samples the heap, updating the peak of the test and of the current
+        phase and the collection count.
+
+        :return: int: allocated bytes
+        """
+        alloc = mem_alloc()
+        if alloc < self._last:
+            self.collections += 1
+        self._last = alloc
+        if alloc > self.peak_alloc:
+            self.peak_alloc = alloc
+        if self._phase is not None and alloc > self.phases.get(self._phase, 0):
+            self.phases[self._phase] = alloc
+        return alloc
+
+    def phase(self, name: Optional[str]) -> None:
+        """
+        Ends the current phase and starts another.
+
+        :param str name: name of the new phase, or None to end the phase only
+        """
+        self.sample()
+        self._phase = name
+        if name is not None:
+            self.sample()
+
+    def finish(self) -> None:
+        """Takes the readings after the test."""
+        self.phase(None)
+        self.after_alloc = mem_alloc()
+        self.after_free = mem_free()
+
+    @property
+    def peak_used(self) -> int:
+        """Bytes the test had allocated at its peak, on top of the start."""
+        return self.peak_alloc - self.before_alloc
+
+    @property
+    def exceeded(self) -> bool:
+        """True if the test used more than the budget at its peak."""
+        return self.budget is not None and self.peak_used > self.budget
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Collects the measurements.
+
+        :return: dict: ``before`` and ``after`` (``alloc`` and ``free``
+            bytes), ``peak_alloc``, ``peak_used`` (``peak_alloc`` less the
+            bytes allocated before the test), ``growth`` (bytes still
+            allocated after the test), ``collections``, ``phases`` (peak
+            allocated bytes per phase), ``budget`` and ``exceeded``
+        """
+        return {
+            "before": {"alloc": self.before_alloc, "free": self.before_free},
+            "after": {"alloc": self.after_alloc, "free": self.after_free},
+            "peak_alloc": self.peak_alloc,
+            "peak_used": self.peak_used,
+            "growth": self.after_alloc - self.before_alloc,
+            "collections": self.collections,
+            "phases": dict(self.phases),
+            "budget": self.budget,
+            "exceeded": self.exceeded,
+        }
@@ -0,0 +1,146 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_boardtest.loader`
+====================================================
+Imports test modules only when the board can run them.
+
+Importing every test up front costs time and RAM on small boards, and some
+tests pull in heavy libraries: `adafruit_boardtest.boardtest_sd` imports
+``adafruit_sdcard`` and ``storage`` even on boards without an SD card slot. A
+`ModuleLoader` first checks the pins a test needs against the
+`adafruit_boardtest.pincatalog.PinCatalog`, without importing anything, and
+only then imports the module, recording how long the import took and how
+much heap it kept.
+
+A test applies if any of the pins it would use is on the board, the same
+rule its ``run_test`` follows. The default pins come from
+`adafruit_boardtest.pinnames`, which the test modules take their own
+defaults from, so the loader can read them without importing the tests.
+
+* Author(s): Adafruit Industries
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://github.com/adafruit/circuitpython/releases
+
+"""
+
+import gc
+import sys
+import time
+
+from adafruit_boardtest import heap, pincatalog, pinnames
+
+try:
+    from typing import Any, Dict, Tuple
+    from types import ModuleType
+    from adafruit_boardtest.pincatalog import PinCatalog
+except ImportError:
+    pass
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_BoardTest.git"
+
+# Constants
+PACKAGE = "adafruit_boardtest"  # Package that short module names are in
+
+# Pins a test checks for, by the ``run_test`` argument that names them and its
+# default. A pin given as an argument replaces the default
+PIN_ARGUMENTS = {
+    "boardtest_uart": {"tx_pin": pinnames.UART_TX, "rx_pin": pinnames.UART_RX},
+    "boardtest_spi": {
+        "mosi_pin": pinnames.SPI_MOSI,
+        "miso_pin": pinnames.SPI_MISO,
+        "sck_pin": pinnames.SPI_SCK,
+    },
+    "boardtest_i2c": {"sda_pin": pinnames.I2C_SDA, "scl_pin": pinnames.I2C_SCL},
+    "boardtest_sd": {
+        "mosi_pin": pinnames.SD_MOSI,
+        "miso_pin": pinnames.SD_MISO,
+        "sck_pin": pinnames.SD_SCK,
+    },
+    "boardtest_sd_cd": {"cd_pin": pinnames.SD_CD},
+}
+
+# Pin names or pin classes a test looks for on its own
+ANY_PINS = {
+    "boardtest_led": pinnames.LEDS,
+    "boardtest_gpio": (pincatalog.CLASS_DIGITAL,),
+    "boardtest_voltage_monitor": pinnames.VOLTAGE_MONITORS,
+    "boardtest_analog": (pincatalog.CLASS_ANALOG,),
+}
+
+
+class ModuleLoader:
+    """
+    Decides which test modules apply to the board and imports them.
+
+    :param PinCatalog catalog: the board's pins
+    """
+
+    def __init__(self, catalog: PinCatalog) -> None:
+        self.catalog = catalog
+        self.loads = {}
+
+    def applies(self, name: str, kwargs: Dict[str, Any]) -> bool:
+        """
+        Tells if the board has any of the pins a test module would use.
+        Modules that are not in `PIN_ARGUMENTS` or `ANY_PINS` always apply.
+
+        :param str name: module name, such as ``"boardtest_sd"``
+        :param dict kwargs: keyword arguments the test will be run with
+        :return: bool: True if the test can run
+        """
+        choices = [
+            kwargs.get(argument, default)
+            for argument, default in PIN_ARGUMENTS.get(name, {}).items()
+        ]
+        choices.extend(ANY_PINS.get(name, ()))
+        if not choices:
+            return True
+        for choice in choices:
+            if choice in pincatalog.CLASSES:
+                if self.catalog.with_class(choice):
+                    return True
+            elif choice in self.catalog.names:
+                return True
+        return False
+
+    def load(self, name: str) -> ModuleType:
+        """
+        Imports a module, recording the time it took and the heap it kept in
+        `loads`. A module that was already imported costs nothing.
+
+        :param str name: module name. Names without a dot are looked up in
+            `PACKAGE`
+        :return: the module
+        """
+        path = name if "." in name else PACKAGE + "." + name
+        if path in sys.modules:
+            return sys.modules[path]
+
+        gc.collect()
+        before = heap.mem_alloc()
+        start = time.monotonic_ns()
+        module = __import__(path)
+        for part in path.split(".")[1:]:
+            module = getattr(module, part)
+        import_ns = time.monotonic_ns() - start
+        gc.collect()
+        self.loads[name] = (import_ns, heap.mem_alloc() - before)
+        return module
+
+    def summary(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Collects the import costs.
+
+        :return: dict: nanoseconds and heap bytes per imported module name
+        """
+        return dict(self.loads)
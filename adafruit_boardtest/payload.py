@@ -0,0 +1,177 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_boardtest.payload`
+====================================================
+Test payload helpers shared by the bus tests. Payloads are generated straight
+into preallocated buffers from a seeded xorshift generator and compared in
+place, so no Python strings or temporary lists are built and payload size is
+only limited by the buffers the caller allocates.
+
+The generator state is 16 bits wide, so it always fits in a small int and
+generating data does not allocate on CircuitPython.
+
+* Author(s): Adafruit Industries
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://github.com/adafruit/circuitpython/releases
+
+"""
+
+import random
+
+try:
+    from typing import List, Optional, Tuple
+except ImportError:
+    pass
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_BoardTest.git"
+
+# Constants
+BYTE_MIN = 0x00  # Lowest byte value (inclusive)
+BYTE_MAX = 0xFF  # Highest byte value (inclusive)
+ASCII_MIN = 0x21  # '!' Lowest printable ASCII char (inclusive)
+ASCII_MAX = 0x7E  # '~' Highest printable ASCII char (inclusive)
+MAX_OFFSETS = 16  # Default number of mismatch offsets collected by compare()
+
+
+def random_seed() -> int:
+    """
+    Picks a random, non-zero seed for `Xorshift16`.
+
+    :return: int: seed value
+    """
+    return random.randint(1, 0xFFFF)
+
+
+class Xorshift16:
+    """
+    Seeded 16-bit xorshift generator (shifts 7, 9, 8). Each step yields two
+    bytes, so the byte stream repeats every 131070 bytes. The same seed always
+    produces the same stream, so a receiver can regenerate the expected data
+    instead of keeping a copy of it.
+
+    :param int seed: seed value, only the lower 16 bits are used
+    """
+
+    def __init__(self, seed: int) -> None:
+        self.state = 1
+        self._low_byte = -1
+        self.seed(seed)
+
+    def seed(self, seed: int) -> None:
+        """
+        Restarts the stream from a seed. Zero is replaced by one, as xorshift
+        would otherwise only ever produce zeros.
+
+        :param int seed: seed value, only the lower 16 bits are used
+        """
+        self.state = (seed & 0xFFFF) or 1
+        self._low_byte = -1
+
+    def next_byte(self) -> int:
+        """
+        Returns the next byte of the stream.
+
+        :return: int: value between 0 and 255
+        """
+        # Hand out the second half of the last step first
+        if self._low_byte >= 0:
+            value = self._low_byte
+            self._low_byte = -1
+            return value
+
+        x = self.state
+        x ^= (x << 7) & 0xFFFF
+        x ^= x >> 9
+        x ^= (x << 8) & 0xFFFF
+        self.state = x
+        self._low_byte = x & 0xFF
+        return x >> 8
+
+    def fill(  # pylint: disable=too-many-arguments
+        self,
+        buf: bytearray,
+        start: int = 0,
+        end: Optional[int] = None,
+        low: int = BYTE_MIN,
+        high: int = BYTE_MAX,
+    ) -> None:
+        """
+        Fills ``buf[start:end]`` with the next bytes of the stream, mapped
+        into the range ``low`` to ``high`` (inclusive).
+
+        :param bytearray buf: buffer to fill
+        :param int start: first index to fill
+        :param int end: index to stop at, defaults to the end of the buffer
+        :param int low: lowest byte value
+        :param int high: highest byte value
+        """
+        if end is None:
+            end = len(buf)
+        span = high - low + 1
+        if span == 256:
+            for i in range(start, end):
+                buf[i] = self.next_byte()
+        else:
+            for i in range(start, end):
+                buf[i] = low + self.next_byte() % span
+
+
+def fill(buf: bytearray, seed: int, low: int = BYTE_MIN, high: int = BYTE_MAX) -> None:
+    """
+    Fills a whole buffer with the stream for a seed.
+
+    :param bytearray buf: buffer to fill
+    :param int seed: seed value
+    :param int low: lowest byte value
+    :param int high: highest byte value
+    """
+    Xorshift16(seed).fill(buf, low=low, high=high)
+
+
+def compare(  # pylint: disable=too-many-arguments
+    expected: bytearray,
+    actual: bytearray,
+    length: Optional[int] = None,
+    expected_start: int = 0,
+    actual_start: int = 0,
+    offsets: Optional[List[int]] = None,
+    max_offsets: int = MAX_OFFSETS,
+) -> Tuple[int, int]:
+    """
+    Compares two buffers in place.
+
+    :param bytearray expected: the data that was sent
+    :param bytearray actual: the data that came back
+    :param int length: number of bytes to compare, defaults to the length of
+        ``expected`` after ``expected_start``
+    :param int expected_start: index of the first byte to compare in ``expected``
+    :param int actual_start: index of the first byte to compare in ``actual``
+    :param list[int] offsets: optional list that mismatch offsets (relative to
+        ``expected_start``) are appended to
+    :param int max_offsets: maximum number of offsets to append
+    :return: tuple(int, int): number of mismatches followed by the offset of the
+        first mismatch (-1 if there is none)
+    """
+    if length is None:
+        length = len(expected) - expected_start
+    errors = 0
+    first_error = -1
+    for i in range(length):
+        if expected[expected_start + i] != actual[actual_start + i]:
+            if first_error < 0:
+                first_error = i
+            if offsets is not None and errors < max_offsets:
+                offsets.append(i)
+            errors += 1
+
+    return errors, first_error
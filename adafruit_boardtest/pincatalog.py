@@ -0,0 +1,231 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_boardtest.pincatalog`
+====================================================
+Finds out which names on ``board`` are the same physical pin.
+
+Many boards give one pin several names, such as ``D13`` and ``LED`` or ``A0``
+and ``D14``. A `PinCatalog` groups the names by the ``microcontroller.Pin``
+they refer to, picks one name for each physical pin, and sorts the pins into
+classes by what they can do (analog, digital, I2C, SPI, UART), so that a test
+does not exercise a pin twice and a pin tested under one name is not reported
+as untested under another.
+
+Building a catalog scans ``board`` once. `catalog` keeps the last catalog it
+built, so the runner and the tests of a session share it.
+
+* Author(s): Adafruit Industries
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://github.com/adafruit/circuitpython/releases
+
+"""
+
+import board
+import microcontroller
+
+try:
+    from typing import List, Optional, Sequence
+except ImportError:
+    pass
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_BoardTest.git"
+
+# Pin classes
+CLASS_ANALOG = "analog"  # Named A0, A1...
+CLASS_DIGITAL = "digital"  # Named D0, D1... or A0, A1...
+CLASS_I2C = "i2c"
+CLASS_SPI = "spi"
+CLASS_UART = "uart"
+CLASSES = (CLASS_ANALOG, CLASS_DIGITAL, CLASS_I2C, CLASS_SPI, CLASS_UART)
+
+# Bus role names and the class they put a pin in
+BUS_ROLES = {
+    "SDA": CLASS_I2C,
+    "SCL": CLASS_I2C,
+    "SCK": CLASS_SPI,
+    "MOSI": CLASS_SPI,
+    "MISO": CLASS_SPI,
+    "TX": CLASS_UART,
+    "RX": CLASS_UART,
+}
+
+
+def is_numbered(name: str, prefix: str) -> bool:
+    """
+    Tells if a pin name is a prefix followed by a number, like ``D13``.
+
+    :param str name: pin name
+    :param str prefix: the letter(s) before the number
+    :return: bool: True if everything after the prefix is digits
+    """
+    number = name[len(prefix) :]
+    return name.startswith(prefix) and number.isdigit()
+
+
+# Order in which names are preferred as the name of a physical pin
+def _rank(name: str) -> int:
+    if is_numbered(name, "A"):
+        return 0
+    if is_numbered(name, "D"):
+        return 1
+    return 2
+
+
+class PinCatalog:
+    """
+    Index of the physical pins behind a list of ``board`` names. Names that
+    are not ``microcontroller.Pin`` objects are left out.
+
+    Each physical pin is known by its primary name: its first ``A`` name if
+    it has one, then its first ``D`` name, then its first name.
+
+    :param list[str] names: names to index, defaults to every name in
+        ``board``
+    """
+
+    def __init__(self, names: Optional[Sequence[str]] = None) -> None:
+        self.names = list(dir(board)) if names is None else list(names)
+        self._primary = {}
+        self._aliases = {}
+        self._classes = {}
+
+        # Group the names by the pin object they refer to
+        groups = {}
+        for name in self.names:
+            pin = getattr(board, name, None)
+            if isinstance(pin, microcontroller.Pin):
+                groups.setdefault(pin, []).append(name)
+
+        for aliases in groups.values():
+            primary = aliases[0]
+            for name in aliases:
+                if _rank(name) < _rank(primary):
+                    primary = name
+            for name in aliases:
+                self._primary[name] = primary
+            self._aliases[primary] = aliases
+            self._classes[primary] = [
+                pin_class
+                for pin_class in CLASSES
+                if any(_has_class(name, pin_class) for name in aliases)
+            ]
+
+    @property
+    def physical(self) -> List[str]:
+        """Primary names of the physical pins, in the order of ``names``."""
+        return [name for name in self.names if self._primary.get(name) == name]
+
+    def primary(self, name: str) -> Optional[str]:
+        """
+        Looks up the primary name of a pin.
+
+        :param str name: any name of the pin
+        :return: str: the primary name, or None if the name is not a pin
+        """
+        return self._primary.get(name)
+
+    def aliases(self, name: str) -> List[str]:
+        """
+        Lists every name of a pin.
+
+        :param str name: any name of the pin
+        :return: list[str]: the names, or an empty list if it is not a pin
+        """
+        primary = self._primary.get(name)
+        return list(self._aliases[primary]) if primary is not None else []
+
+    def classes(self, name: str) -> List[str]:
+        """
+        Lists the classes of a pin, such as `CLASS_ANALOG` or `CLASS_I2C`.
+
+        :param str name: any name of the pin
+        :return: list[str]: the classes
+        """
+        primary = self._primary.get(name)
+        return list(self._classes[primary]) if primary is not None else []
+
+    def with_class(self, pin_class: str) -> List[str]:
+        """
+        Lists the physical pins in a class, by the name that gives them the
+        class. An analog pin is listed as ``A0`` even if ``D14`` is the same
+        pin, and a pin is listed once however many names it has.
+
+        :param str pin_class: one of the ``CLASS_*`` constants
+        :return: list[str]: pin names
+        """
+        found = {}
+        for name in self.names:
+            primary = self._primary.get(name)
+            if primary is None or primary in found:
+                continue
+            if _has_class(name, pin_class):
+                found[primary] = name
+        return list(found.values())
+
+    def unique(self, names: Sequence[str]) -> List[str]:
+        """
+        Drops names that refer to a pin already in the list.
+
+        :param list[str] names: pin names
+        :return: list[str]: the names, one per physical pin, in order
+        """
+        seen = []
+        unique = []
+        for name in names:
+            primary = self._primary.get(name, name)
+            if primary not in seen:
+                seen.append(primary)
+                unique.append(name)
+        return unique
+
+    def covered(self, names: Sequence[str]) -> List[str]:
+        """
+        Lists every name of the pins given.
+
+        :param list[str] names: pin names
+        :return: list[str]: the names and all their aliases
+        """
+        covered = []
+        for name in names:
+            for alias in self.aliases(name) or [name]:
+                if alias not in covered:
+                    covered.append(alias)
+        return covered
+
+
+# Whether a single name puts its pin in a class
+def _has_class(name: str, pin_class: str) -> bool:
+    if pin_class == CLASS_ANALOG:
+        return is_numbered(name, "A")
+    if pin_class == CLASS_DIGITAL:
+        return _rank(name) < 2
+    return BUS_ROLES.get(name) == pin_class
+
+
+_CATALOG = None
+
+
+def catalog(names: Optional[Sequence[str]] = None) -> PinCatalog:
+    """
+    Returns a catalog of the given names, reusing the last one built if it
+    was built from the same names.
+
+    :param list[str] names: names to index, defaults to every name in
+        ``board``
+    :return: PinCatalog: the catalog
+    """
+    global _CATALOG  # pylint: disable=global-statement
+    names = list(dir(board)) if names is None else list(names)
+    if _CATALOG is None or _CATALOG.names != names:
+        _CATALOG = PinCatalog(names)
+    return _CATALOG
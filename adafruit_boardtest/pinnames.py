@@ -0,0 +1,53 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_boardtest.pinnames`
+====================================================
+Default pin names of the tests.
+
+The test modules take their ``*_PIN_NAME`` constants from here, and the
+`adafruit_boardtest.loader.ModuleLoader` reads them here to decide whether a
+test applies to the board without importing the test and its libraries.
+
+* Author(s): Adafruit Industries
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://github.com/adafruit/circuitpython/releases
+
+"""
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_BoardTest.git"
+
+# UART loopback test
+UART_TX = "TX"
+UART_RX = "RX"
+
+# SPI EEPROM test
+SPI_MOSI = "MOSI"
+SPI_MISO = "MISO"
+SPI_SCK = "SCK"
+SPI_CS = "D2"
+
+# I2C EEPROM test
+I2C_SDA = "SDA"
+I2C_SCL = "SCL"
+
+# SD card tests
+SD_MOSI = "SD_MOSI"
+SD_MISO = "SD_MISO"
+SD_SCK = "SD_SCK"
+SD_CS = "SD_CS"
+SD_CD = "SD_CD"
+
+# LED, voltage monitor and analog tests
+LEDS = ("L", "LED", "RED_LED", "YELLOW_LED", "GREEN_LED", "BLUE_LED")
+VOLTAGE_MONITORS = ("VOLTAGE_MONITOR", "BATTERY")
+DAC = "A0"
@@ -0,0 +1,310 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_boardtest.runner`
+====================================================
+Runs a set of board tests and collects their results.
+
+Register the test modules to run with `TestRunner.register`, then call
+`TestRunner.run`. The runner looks up the board's pins once, runs the tests in
+registration order (or any order given), skips any test asked to, times each
+test and keeps a `TestRecord` for every one of them. `TestRunner.print_summary`
+prints the results table and the lists of tested and untested pins. A pin
+counts as tested whichever of its names a test used, see
+`adafruit_boardtest.pincatalog`.
+
+Tests can be registered by module name instead of by module. They are then
+imported by a `adafruit_boardtest.loader.ModuleLoader` just before they run,
+and only if the board has the pins they need.
+
+* Author(s): Adafruit Industries
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://github.com/adafruit/circuitpython/releases
+
+"""
+
+import time
+
+import board
+
+from adafruit_boardtest import heap, loader, pincatalog, timing
+
+try:
+    from typing import Any, Dict, List, Optional, Sequence, Union
+    from types import ModuleType
+    from adafruit_boardtest.fixture import Instrument
+except ImportError:
+    pass
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_BoardTest.git"
+
+
+class TestRecord:  # pylint: disable=too-few-public-methods
+    """
+    Outcome of a single test.
+
+    :param str name: name the test was registered under
+    :param str result: PASS, FAIL or N/A
+    :param list[str] pins: pins the test exercised
+    :param int duration_ns: how long the test took, in nanoseconds
+    :param dict report: measurements reported by the test
+    :param dict timings: phase and bus transaction times from
+        `adafruit_boardtest.timing.PhaseTimer.summary`, if they were recorded
+    :param dict heap_usage: heap readings from
+        `adafruit_boardtest.heap.HeapMonitor.summary`, if they were recorded
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        name: str,
+        result: str,
+        pins: List[str],
+        duration_ns: int,
+        report: Dict[str, Any],
+        timings: Optional[Dict[str, Any]] = None,
+        heap_usage: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.name = name
+        self.result = result
+        self.pins = pins
+        self.duration_ns = duration_ns
+        self.report = report
+        self.timings = timings
+        self.heap_usage = heap_usage
+
+    @property
+    def duration(self) -> float:
+        """How long the test took, in seconds."""
+        return self.duration_ns / 1000000000
+
+
+class TestRunner:
+    """
+    Keeps a registry of test modules and runs them.
+
+    :param list[str] pins: pins to test, defaults to every name in ``board``
+    :param instrument: optional callable from `adafruit_boardtest.fixture`
+        that is passed to every test to run them without an operator
+    :param bool timed: True to time the phases and bus transactions of every
+        test with a `adafruit_boardtest.timing.PhaseTimer`
+    :param bool track_heap: True to record the heap usage of every test with
+        a `adafruit_boardtest.heap.HeapMonitor`
+    :param int heap_budget: optional number of heap bytes each test may use,
+        on top of what was allocated before it started. Tests that go over it
+        are flagged in the summary
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        pins: Optional[Sequence[str]] = None,
+        instrument: Optional[Instrument] = None,
+        timed: bool = False,
+        track_heap: bool = False,
+        heap_budget: Optional[int] = None,
+    ) -> None:
+        self.pins = list(dir(board)) if pins is None else list(pins)
+        self.catalog = pincatalog.catalog(self.pins)
+        self.loader = loader.ModuleLoader(self.catalog)
+        self.instrument = instrument
+        self.timed = timed
+        self.track_heap = track_heap
+        self.heap_budget = heap_budget
+        self.records = []
+        self._tests = []
+
+    @property
+    def names(self) -> List[str]:
+        """Names of the registered tests, in registration order."""
+        return [test[0] for test in self._tests]
+
+    def register(
+        self, name: str, module: Union[ModuleType, str], **kwargs: Any
+    ) -> None:
+        """
+        Adds a test module to the end of the registry. Registering a name
+        again replaces the earlier registration in place.
+
+        :param str name: name shown in banners and in the summary
+        :param module: a ``boardtest_*`` module with a ``run_test`` function,
+            or the name of one to import when the test runs
+        :param kwargs: extra keyword arguments passed to ``run_test``, such as
+            pin names, a mode or an ``instrument`` that overrides the runner's
+        """
+        for test in self._tests:
+            if test[0] == name:
+                test[1] = module
+                test[2] = kwargs
+                return
+        self._tests.append([name, module, kwargs])
+
+    def run_one(self, name: str) -> TestRecord:
+        """
+        Runs one registered test and records its outcome.
+
+        :param str name: name the test was registered under
+        :return: TestRecord: the outcome
+        """
+        for test_name, module, kwargs in self._tests:
+            if test_name == name:
+                break
+        else:
+            raise ValueError("No test registered as " + name)
+
+        print("@)}---^-----  " + name.upper() + "  -----^---{(@")
+        print()
+
+        # Import the module now, unless the board lacks the pins for it
+        if isinstance(module, str):
+            if not self.loader.applies(module, kwargs):
+                print("No pins found for " + module + ", not loading it")
+                print()
+                record = TestRecord(name, "N/A", [], 0, {})
+                self.records.append(record)
+                return record
+            module = self.loader.load(module)
+
+        kwargs = dict(kwargs)
+        if "instrument" not in kwargs:
+            kwargs["instrument"] = self.instrument
+        monitor = None
+        if self.track_heap:
+            monitor = heap.HeapMonitor(self.heap_budget)
+        timer = None
+        if self.timed or monitor is not None:
+            timer = timing.PhaseTimer(heap=monitor)
+            kwargs["timer"] = timer
+        report = {}
+        if monitor is not None:
+            monitor.start()
+        start = time.monotonic_ns()
+        result, pins = module.run_test(self.pins, report=report, **kwargs)
+        duration_ns = time.monotonic_ns() - start
+        if timer is not None:
+            timer.stop()
+        if monitor is not None:
+            monitor.finish()
+        record = TestRecord(
+            name,
+            result,
+            pins,
+            duration_ns,
+            report,
+            timer.summary() if self.timed else None,
+            monitor.summary() if monitor is not None else None,
+        )
+        print()
+        print(result)
+        print()
+
+        self.records.append(record)
+        return record
+
+    def run(
+        self,
+        order: Optional[Sequence[str]] = None,
+        skip: Sequence[str] = (),
+    ) -> List[TestRecord]:
+        """
+        Runs the registered tests.
+
+        :param list[str] order: names of the tests to run, in order. Defaults
+            to every registered test in registration order
+        :param list[str] skip: names of tests not to run
+        :return: list[TestRecord]: the outcome of every test that ran
+        """
+        records = []
+        for name in self.names if order is None else order:
+            if name not in skip:
+                records.append(self.run_one(name))
+
+        return records
+
+    @property
+    def tested_pins(self) -> List[str]:
+        """
+        Pins exercised by the tests that have run so far, one name per
+        physical pin.
+        """
+        tested = []
+        for record in self.records:
+            tested.extend(record.pins)
+        return self.catalog.unique(tested)
+
+    @property
+    def untested_pins(self) -> List[str]:
+        """
+        Physical pins that none of the tests that have run so far exercised
+        under any of their names, by their primary names.
+        """
+        tested = self.catalog.covered(self.tested_pins)
+        return [pin for pin in self.catalog.physical if pin not in tested]
+
+    def print_summary(self) -> None:  # pylint: disable=too-many-branches
+        """Prints the results and timing of every test, then the pin lists."""
+        print("@)}---^-----  TEST RESULTS  -----^---{(@")
+        print()
+
+        # Find appropriate spaces for printing test results
+        num_spaces = 0
+        for record in self.records:
+            num_spaces = max(num_spaces, len(record.name))
+
+        # Print test results
+        for record in self.records:
+            print(record.name + ":", end=" ")
+            print(" " * (num_spaces - len(record.name)), end="")
+            print(record.result, end="\t")
+            print("{:.2f}".format(record.duration) + " s")
+        print()
+
+        # Print where the time went in each test
+        for record in self.records:
+            if record.timings is not None:
+                print(record.name + ":", end=" ")
+                for phase in timing.phase_names(record.timings):
+                    duration_ns = record.timings["phases"][phase]
+                    print(phase + " " + timing.format_ns(duration_ns), end=", ")
+                print("bus " + timing.format_ns(record.timings["bus_ns"]))
+        if self.timed:
+            print()
+
+        # Print the heap usage of each test
+        for record in self.records:
+            if record.heap_usage is not None:
+                usage = record.heap_usage
+                print(record.name + ":", end=" ")
+                print("peak " + str(usage["peak_alloc"]) + " bytes", end=", ")
+                print("used " + str(usage["peak_used"]) + " bytes", end=", ")
+                print("growth " + str(usage["growth"]) + " bytes", end=", ")
+                print(str(usage["collections"]) + " collections", end="")
+                print(" OVER BUDGET" if usage["exceeded"] else "")
+        if self.track_heap:
+            print()
+
+        # Print what importing the tests cost
+        for module, cost in self.loader.summary().items():
+            print("Loaded " + module + " in " + timing.format_ns(cost[0]), end=", ")
+            print(str(cost[1]) + " bytes")
+        if self.loader.loads:
+            print()
+
+        # Print tested pins
+        print("The following pins were tested:", end=" ")
+        for pin in self.tested_pins:
+            print(pin, end=" ")
+        print("\n")
+
+        # Print pins not tested
+        print("The following pins were NOT tested:", end=" ")
+        for pin in self.untested_pins:
+            print(pin, end=" ")
+        print("\n")
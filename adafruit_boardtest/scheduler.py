@@ -0,0 +1,158 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_boardtest.scheduler`
+====================================================
+Blinks pins on a schedule while waiting for something else.
+
+A `BlinkScheduler` sets up each pin once. It works out from the clock
+whether each pin should be on or off, writes a pin only when that changes,
+and sleeps until the next change is due. A poll function (usually a check for
+an answer on the serial console) runs at least every ``poll_interval``
+seconds in between.
+
+* Author(s): Adafruit Industries
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://github.com/adafruit/circuitpython/releases
+
+"""
+
+import time
+
+import board
+import digitalio
+
+try:
+    from typing import Callable, Optional, Type
+    from types import TracebackType
+except ImportError:
+    pass
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_BoardTest.git"
+
+# Constants
+POLL_INTERVAL = 0.02  # Longest time between two calls to the poll function
+
+
+class BlinkScheduler:
+    """
+    Blinks a set of pins, each with its own period, on time and offset.
+
+    A pin is on for ``on_time`` seconds at the start of every period, and its
+    periods start ``offset`` seconds after the scheduler starts. Giving pins
+    the same period and staggered offsets blinks them one after another.
+
+    :param float poll_interval: longest time, in seconds, to sleep before
+        calling the poll function again
+    """
+
+    def __init__(self, poll_interval: float = POLL_INTERVAL) -> None:
+        self.poll_ns = int(poll_interval * 1000000000)
+        self.writes = 0
+        self._pins = []
+        self._periods = []
+        self._on_times = []
+        self._offsets = []
+        self._states = []
+
+    def add(self, pin: str, period: float, on_time: float, offset: float = 0.0) -> None:
+        """
+        Sets up a pin as an output, starting off, and adds it to the schedule.
+
+        :param str pin: pin name
+        :param float period: seconds between the starts of two blinks
+        :param float on_time: seconds the pin is on in each period
+        :param float offset: seconds from the start of the schedule to the
+            start of the first period
+        """
+        gpio = digitalio.DigitalInOut(getattr(board, pin))
+        gpio.direction = digitalio.Direction.OUTPUT
+        gpio.value = False
+        self._pins.append(gpio)
+        self._periods.append(int(period * 1000000000))
+        self._on_times.append(int(on_time * 1000000000))
+        self._offsets.append(int(offset * 1000000000))
+        self._states.append(False)
+
+    def _update(self, elapsed: int) -> int:
+        # Write the pins whose state changed and find the next change
+        deadline = elapsed + self.poll_ns
+        for i, gpio in enumerate(self._pins):
+            phase = (elapsed - self._offsets[i]) % self._periods[i]
+            state = phase < self._on_times[i]
+            if state != self._states[i]:
+                gpio.value = state
+                self._states[i] = state
+                self.writes += 1
+            if state:
+                change = elapsed + self._on_times[i] - phase
+            else:
+                change = elapsed + self._periods[i] - phase
+            deadline = min(deadline, change)
+        return deadline
+
+    def run(
+        self, poll: Callable[[], Optional[bool]], timeout: Optional[float] = None
+    ) -> Optional[bool]:
+        """
+        Blinks the pins until ``poll`` returns an answer or the time is up.
+        The pins are switched off before returning.
+
+        :param poll: called between pin changes, returns None to keep going
+        :param float timeout: optional number of seconds to give up after
+        :return: bool: the answer from ``poll``, or None on a timeout
+        """
+        start = time.monotonic_ns()
+        end = None if timeout is None else int(timeout * 1000000000)
+        answer = None
+        while answer is None:
+            elapsed = time.monotonic_ns() - start
+            if end is not None and elapsed > end:
+                break
+            deadline = self._update(elapsed)
+            answer = poll()
+            if answer is None:
+                wait = deadline - (time.monotonic_ns() - start)
+                if wait > 0:
+                    time.sleep(wait / 1000000000)
+
+        self.off()
+        return answer
+
+    def off(self) -> None:
+        """Switches every pin off."""
+        for i, gpio in enumerate(self._pins):
+            if self._states[i]:
+                gpio.value = False
+                self._states[i] = False
+                self.writes += 1
+
+    def deinit(self) -> None:
+        """Releases every pin."""
+        for gpio in self._pins:
+            gpio.deinit()
+        self._pins = []
+        self._periods = []
+        self._on_times = []
+        self._offsets = []
+        self._states = []
+
+    def __enter__(self) -> "BlinkScheduler":
+        return self
+
+    def __exit__(
+        self,
+        exception_type: Optional[Type[BaseException]],
+        exception_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.deinit()
@@ -0,0 +1,173 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_boardtest.sdsession`
+====================================================
+Keeps an SD card mounted across tests. Initialising a card takes hundreds of
+milliseconds, so repeated SD tests (and the card detect test) can share one
+`SDSession` instead of setting up the bus and mounting the card every time.
+
+* Author(s): Adafruit Industries
+
+Implementation Notes
+--------------------
+
+**Hardware:**
+
+* `SD Card <https://www.adafruit.com/product/1294>`_
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://github.com/adafruit/circuitpython/releases
+* Adafruit CircuitPython SD card driver:
+  https://github.com/adafruit/Adafruit_CircuitPython_SD
+
+"""
+
+import board
+import busio
+import digitalio
+import adafruit_sdcard
+import storage
+
+try:
+    from typing import Optional, Tuple, Type
+    from types import TracebackType
+except ImportError:
+    pass
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_BoardTest.git"
+
+# Constants
+MOUNT_POINT = "/sd"
+DEFAULT_BAUD_RATE = 1320000  # Bits per second (adafruit_sdcard default)
+
+
+class SDSession:
+    """
+    Owns the SPI bus and CS pin used to talk to an SD card and caches the
+    mounted filesystem. The card stays mounted until `unmount` or `close` is
+    called, or until it is mounted again at a different baud rate.
+
+    Use it as a context manager to make sure the card is unmounted and the
+    pins are released at the end of a session.
+
+    :param str mount_point: where to mount the card's filesystem
+    """
+
+    def __init__(self, mount_point: str = MOUNT_POINT) -> None:
+        self.mount_point = mount_point
+        self.baud_rate = DEFAULT_BAUD_RATE
+        self.mounted = False
+        self._pins = None
+        self._spi = None
+        self._csel = None
+
+    @property
+    def is_open(self) -> bool:
+        """True if the SPI bus has been set up with `open`."""
+        return self._spi is not None
+
+    @property
+    def pins(self) -> Optional[Tuple[str, str, str, str]]:
+        """Names of the SCK, MOSI, MISO and CS pins in use, or None."""
+        return self._pins
+
+    def path(self, filename: str) -> str:
+        """
+        Returns the full path of a file on the card.
+
+        :param str filename: name of the file
+        :return: str: path below the mount point
+        """
+        return self.mount_point + "/" + filename
+
+    def open(self, sck_pin: str, mosi_pin: str, miso_pin: str, cs_pin: str) -> None:
+        """
+        Sets up the SPI bus and CS pin. Does nothing if they are already set up
+        on the same pins, otherwise anything opened before is closed first.
+
+        :param str sck_pin: pin name of SPI SCK
+        :param str mosi_pin: pin name of SPI MOSI
+        :param str miso_pin: pin name of SPI MISO
+        :param str cs_pin: pin name of SPI CS
+        """
+        pins = (sck_pin, mosi_pin, miso_pin, cs_pin)
+        if self._pins == pins:
+            return
+        self.close()
+
+        # Configure CS pin
+        self._csel = digitalio.DigitalInOut(getattr(board, cs_pin))
+        self._csel.direction = digitalio.Direction.OUTPUT
+        self._csel.value = True
+
+        # Set up SPI
+        self._spi = busio.SPI(
+            getattr(board, sck_pin),
+            MOSI=getattr(board, mosi_pin),
+            MISO=getattr(board, miso_pin),
+        )
+        self._pins = pins
+
+    def mount(self, baud_rate: Optional[int] = None) -> bool:
+        """
+        Connects to the card and mounts its filesystem, unless it is already
+        mounted at the same baud rate.
+
+        :param int baud_rate: SPI clock, defaults to the last one used
+        :return: bool: True if the card is mounted
+        """
+        if not self.is_open:
+            return False
+        if baud_rate is None:
+            baud_rate = self.baud_rate
+        if self.mounted and baud_rate == self.baud_rate:
+            return True
+        self.unmount()
+
+        # Try to connect to the card and mount the filesystem
+        self.baud_rate = baud_rate
+        try:
+            sdcard = adafruit_sdcard.SDCard(self._spi, self._csel, baudrate=baud_rate)
+            vfs = storage.VfsFat(sdcard)
+            storage.mount(vfs, self.mount_point)
+        except OSError:
+            return False
+
+        self.mounted = True
+        return True
+
+    def unmount(self) -> None:
+        """Unmounts the card, if it is mounted."""
+        if self.mounted:
+            self.mounted = False
+            try:
+                storage.umount(self.mount_point)
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        """Unmounts the card and releases the SPI bus and CS pin."""
+        self.unmount()
+        if self._spi is not None:
+            self._spi.deinit()
+            self._csel.deinit()
+        self._spi = None
+        self._csel = None
+        self._pins = None
+
+    def __enter__(self) -> "SDSession":
+        return self
+
+    def __exit__(
+        self,
+        exception_type: Optional[Type[BaseException]],
+        exception_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
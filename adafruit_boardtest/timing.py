@@ -0,0 +1,256 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_boardtest.timing`
+====================================================
+Records where the time goes while a test runs.
+
+Every ``run_test`` function takes an optional `PhaseTimer`. The test marks
+the start of each of its phases (waiting for the operator, setting up the
+pins, running, tearing down) and wraps its bus with `PhaseTimer.wrap`, so
+every transaction on the bus is timed as well. All times are taken with
+``time.monotonic_ns()``.
+
+A `adafruit_boardtest.heap.HeapMonitor` can be attached to a timer to sample
+the heap at the same points.
+
+Without a timer the tests use `DISABLED`, whose methods return straight away
+and whose `PhaseTimer.wrap` hands back the bus itself, so the only cost is a
+few method calls per test.
+
+* Author(s): Adafruit Industries
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://github.com/adafruit/circuitpython/releases
+
+"""
+
+import time
+
+try:
+    from typing import Any, Callable, Dict, List, Optional
+    from adafruit_boardtest.heap import HeapMonitor
+except ImportError:
+    pass
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_BoardTest.git"
+
+# Constants
+MAX_SPANS = 64  # Phase spans kept in order, later ones are only totalled
+TIMED_METHODS = (
+    "try_lock",
+    "scan",
+    "writeto",
+    "readfrom_into",
+    "writeto_then_readfrom",
+    "configure",
+    "write",
+    "readinto",
+    "write_readinto",
+    "read",
+)
+
+
+class PhaseTimer:
+    """
+    Times the phases of a test and the transactions on its buses.
+
+    Phases run one after the other: starting a phase ends the one before it.
+    The first `MAX_SPANS` phases are kept as ``(name, start_ns, end_ns)``
+    spans, and every phase and bus method is totalled by name.
+
+    :param bool enabled: False to make every method a no-op
+    :param HeapMonitor heap: optional monitor that samples the heap at every
+        phase change and bus transaction
+    """
+
+    def __init__(
+        self, enabled: bool = True, heap: Optional[HeapMonitor] = None
+    ) -> None:
+        self.enabled = enabled
+        self.heap = heap
+        self.spans = []
+        self.phases = {}
+        self.transactions = {}
+        self._phase = None
+        self._start = 0
+
+    def phase(self, name: str) -> None:
+        """
+        Ends the current phase, if any, and starts a new one.
+
+        :param str name: name of the new phase
+        """
+        if not self.enabled:
+            return
+        now = time.monotonic_ns()
+        self._end(now)
+        self._phase = name
+        if self.heap is not None:
+            self.heap.phase(name)
+        self._start = now
+
+    def stop(self) -> None:
+        """Ends the current phase."""
+        if not self.enabled:
+            return
+        self._end(time.monotonic_ns())
+        self._phase = None
+        if self.heap is not None:
+            self.heap.phase(None)
+
+    def _end(self, now: int) -> None:
+        if self._phase is None:
+            return
+        if len(self.spans) < MAX_SPANS:
+            self.spans.append((self._phase, self._start, now))
+        self.phases[self._phase] = self.phases.get(self._phase, 0) + now - self._start
+
+    def record(self, name: str, duration_ns: int) -> None:
+        """
+        Adds one bus transaction to the totals.
+
+        :param str name: name of the bus method
+        :param int duration_ns: how long it took, in nanoseconds
+        """
+        if self.heap is not None:
+            self.heap.sample()
+        totals = self.transactions.get(name)
+        if totals is None:
+            self.transactions[name] = [1, duration_ns, duration_ns]
+        else:
+            totals[0] += 1
+            totals[1] += duration_ns
+            if duration_ns > totals[2]:
+                totals[2] = duration_ns
+
+    def wrap(self, bus: Any) -> Any:
+        """
+        Wraps a bus so that its transactions are timed.
+
+        :param bus: a ``busio.I2C``, ``busio.SPI`` or ``busio.UART``
+        :return: the wrapped bus, or the bus itself if the timer is disabled
+        """
+        if not self.enabled:
+            return bus
+        return TimedBus(bus, self)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Collects the measurements.
+
+        :return: dict: ``spans`` (list of name, start and end), ``phases``
+            (total nanoseconds per phase), ``transactions`` (count, total and
+            longest nanoseconds per bus method) and ``bus_ns`` (time spent in
+            bus methods altogether)
+        """
+        transactions = {}
+        bus_ns = 0
+        for name, totals in self.transactions.items():
+            transactions[name] = {
+                "count": totals[0],
+                "total_ns": totals[1],
+                "max_ns": totals[2],
+            }
+            bus_ns += totals[1]
+        return {
+            "spans": list(self.spans),
+            "phases": dict(self.phases),
+            "transactions": transactions,
+            "bus_ns": bus_ns,
+        }
+
+
+class TimedBus:
+    """
+    Stands in for a bus and times the methods listed in `TIMED_METHODS`.
+    Everything else is passed straight through to the bus.
+
+    :param bus: the bus to time
+    :param PhaseTimer timer: where to record the transactions
+    """
+
+    def __init__(self, bus: Any, timer: PhaseTimer) -> None:
+        self._bus = bus
+        self._timer = timer
+        self._methods = {}
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._bus, name)
+        if name not in TIMED_METHODS:
+            return attribute
+
+        # Build each timed method once and reuse it
+        method = self._methods.get(name)
+        if method is None:
+            method = _timed(name, attribute, self._timer)
+            self._methods[name] = method
+        return method
+
+    @property
+    def bus(self) -> Any:
+        """The bus being timed."""
+        return self._bus
+
+
+def _timed(name: str, method: Callable, timer: PhaseTimer) -> Callable:
+    def _method(*args: Any, **kwargs: Any) -> Any:
+        start = time.monotonic_ns()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            timer.record(name, time.monotonic_ns() - start)
+
+    return _method
+
+
+def resolve(timer: Optional[PhaseTimer]) -> PhaseTimer:
+    """
+    Returns the timer to use in a test.
+
+    :param PhaseTimer timer: the timer passed to ``run_test``, or None
+    :return: PhaseTimer: the timer, or `DISABLED`
+    """
+    return DISABLED if timer is None else timer
+
+
+def format_ns(duration_ns: int) -> str:
+    """
+    Formats a duration for printing.
+
+    :param int duration_ns: duration in nanoseconds
+    :return: str: the duration in microseconds, milliseconds or seconds
+    """
+    if duration_ns < 1000000:
+        return str(duration_ns // 1000) + " us"
+    if duration_ns < 1000000000:
+        return str(duration_ns // 1000000) + " ms"
+    return "{:.2f}".format(duration_ns / 1000000000) + " s"
+
+
+def phase_names(summary: Dict[str, Any]) -> List[str]:
+    """
+    Lists the phases of a summary in the order they first ran.
+
+    :param dict summary: result of `PhaseTimer.summary`
+    :return: list[str]: phase names
+    """
+    names = []
+    for span in summary["spans"]:
+        if span[0] not in names:
+            names.append(span[0])
+    for name in summary["phases"]:
+        if name not in names:
+            names.append(name)
+    return names
+
+
+DISABLED = PhaseTimer(enabled=False)
@@ -0,0 +1,52 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+# SPDX-License-Identifier: MIT
+
+"""
+Benchmarks the test harness against simulated hardware on a host computer and
+checks the results against a baseline. Run it with CPython from the root of
+the repository, not on a board:
+
+    python3 examples/boardtest_benchmark.py [baseline.json] [--save]
+
+With --save, the results are written to the baseline file. Otherwise they are
+compared with it, and the script exits with status 1 if a result changed, a
+benchmark makes more bus transactions, or it allocates more than the baseline
+allows. Times are printed but not compared, as they depend on the host.
+"""
+
+import sys
+
+sys.path.insert(0, ".")
+
+# pylint: disable=wrong-import-position
+from tools.simulated import SimulatedBackend
+
+BACKEND = SimulatedBackend(seed=1).install()
+
+from tools import benchmark
+
+BASELINE_FILE = "benchmark_baseline.json"
+
+args = [arg for arg in sys.argv[1:] if arg != "--save"]
+path = args[0] if args else BASELINE_FILE
+
+BENCH = benchmark.run_suite(BACKEND)
+BENCH.print_results()
+print()
+
+if "--save" in sys.argv:
+    BENCH.save(path)
+    print("Baseline written to " + path)
+    sys.exit(0)
+
+baseline = benchmark.load_baseline(path)
+if baseline is None:
+    print("No baseline in " + path + ", run with --save to write one")
+    sys.exit(0)
+
+regressions = BENCH.compare(baseline)
+for regression in regressions:
+    print("REGRESSION " + regression)
+if regressions:
+    sys.exit(1)
+print("No regressions against " + path)
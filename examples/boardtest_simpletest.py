@@ -38,6 +38,7 @@ following:
 * Onboard LEDs
 * GPIO output
 * Onboard battery voltage monitor
+* Analog inputs
 * SPI
 * I2C
 
@@ -47,6 +48,7 @@ You will need the following components:
 * LED
 * 1x 330 Ohm resistor or 220 Ohm resistor
 * 2x 4.7k Ohm resistor
+* 1x 1k Ohm resistor per analog pin
 * Microchip 25AA040A SPI EEPROM
 * Microchip AT24HC04B I2C EEPROM
 * Breadboard
@@ -55,26 +57,36 @@ You will need the following components:
 Copy the following files to the adafruit_boardtest folder on your CIRCUITPY drive:
 
 * __init__.py
+* boardtest_analog.mpy
 * boardtest_gpio.mpy
 * boardtest_i2c.mpy
 * boardtest_led.mpy
 * boardtest_spi.mpy
 * boardtest_uart.mpy
-* boardtest_voltage_monitor
+* boardtest_voltage_monitor.mpy
+* fixture.mpy
+* heap.mpy
+* loader.mpy
+* payload.mpy
+* pincatalog.mpy
+* pinnames.mpy
+* runner.mpy
+* scheduler.mpy
+* timing.mpy
+
+The SD card tests, which this script does not run, also need these files and
+the adafruit_sdcard library:
+
+* boardtest_sd.mpy
+* boardtest_sd_cd.mpy
+* sdsession.mpy
 
 Copy this file to the root directory of your CIRCUITPY drive and rename the
 filename to code.py. Open a serial terminal, and follow the prompts to run
 the various tests.
 """
 
-import board
-
-from adafruit_boardtest import boardtest_led
-from adafruit_boardtest import boardtest_gpio
-from adafruit_boardtest import boardtest_voltage_monitor
-from adafruit_boardtest import boardtest_uart
-from adafruit_boardtest import boardtest_spi
-from adafruit_boardtest import boardtest_i2c
+from adafruit_boardtest.runner import TestRunner
 
 # Constants
 UART_TX_PIN_NAME = "TX"
@@ -87,169 +99,90 @@ SPI_CS_PIN_NAME = "D2"
 I2C_SDA_PIN_NAME = "SDA"
 I2C_SCL_PIN_NAME = "SCL"
 
-# Results dictionary
-TEST_RESULTS = {}
-
-# Save tested pins
-PINS_TESTED = []
-
-# Print welcome message
-print()
-print("                            ....                                      ")
-print("                        #@@%%%%%%&@@/                                 ")
-print("                     (&@%%%%%%%%%%%%%@&                               ")
-print("                  .(@&%%%@*    *&%%%%%%@.                             ")
-print("            ,@@&&%%%%%%%%//@%,/ /&%%%%%%@                             ")
-print("            %@%%%&%%%%%%%#(@@@&&%%%%%%%%@*                            ")
-print("             @&%%&%%%%%%%%%%%%%%%%%%%%%%@/                            ")
-print("               &@@&%%%%&&&%%%%%%%%%%%%%%@,                            ")
-print("                ,/ &@&&%%%%%%%%%%%%%%%%%@                             ")
-print("               ,*        *@&%%%%%%%%%%%%#                             ")
-print("               (           @%%%%%%%%%%%@                              ")
-print("              ,            @%%%%%%%%%%&@                              ")
-print("                          #&%%%%%%%%%%@.                              ")
-print("                         #@###%%%%%%%@/                               ")
-print("                        (@##(%%%%%%%@%                                ")
-print("                       /@###(#%%%%%&@                                 ")
-print("                      #@####%%%%%%%@                                  ")
-print("                     (@###(%%%%%%%@,                                  ")
-print("                    .@##(((#%%%%%&(         .,,.                      ")
-print("                   ,@#####%%%%%%%@    ,%@@%%%%%%%&@%                  ")
-print("                ,#&@####(%%%%%%%@@@@@&%%%%%%%%%%%###&                 ")
-print("               @%%@%####(#%%%%%&@%%%%%%%%%%%%%%##/((@@@@&*            ")
-print("              (##@%#####%%%%%%%@(#%%%(/####(/####(%@%%%%%%@/          ")
-print("           (@&%@@###(#%%%%%%@&/####(/#####/#&@@&%%%%%%%##@            ")
-print("          #@%%%%@#####(#%%%%%%@@@@@@@@@@@@@&%%%%%%%%%%%%#/(@@@@@/     ")
-print("          @%(/#@%######%%%%%%%@%%%%%%%%%%%%%%%%%%%%%(/(###@%%%%%%@%   ")
-print("         .@@#(#@#####(#%%%%%%&@###//#####/#####/(####/#%@&%%%%%%%%&&  ")
-print("        /@%%&@@@(#((((#%%%%%%&@###((#####/#####((##%@@&%%%%%%%%%%%/@. ")
-print("       ,@%%%%%%#####%%%%%%%%@@@@&&&&&&&%&@@@@@@&%%%%%%%%%%%%%%%##@,   ")
-print("       %%%%%%%%@######(%%%%%%%@&%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#/(#&&  ")
-print("       (@###/(%@##((##(%%%%%%%%@%%%%%%%%%%%%%%%%%%%%%%%%%##%###/(&&   ")
-print("    ,@@%@%##((#%@#######%%%%%%%%@&%%%%##%%%%##%%%%#/#####((####(@*    ")
-print("  *&(,    %@@%##%@#######(%%%%%%%%@#/#####((#####(#####(/#&@&.        ")
-print("                 .@###((#%%%%%%%%%&@@###((#####(###%@@&,              ")
-print("                   #@#(#######%&@@&* .*#&@@@@@@@%(,                   ")
-print("                          .,,,..                                      ")
-print()
+# Tests to skip, by name (e.g. ["UART Test"])
+SKIP_TESTS = []
+
+# Print the ASCII art banner before the tests
+SHOW_BANNER = False
+
+# Print the welcome banner if asked to, it is slow over a serial link
+if SHOW_BANNER:
+    print()
+    print("                            ....                                      ")
+    print("                        #@@%%%%%%&@@/                                 ")
+    print("                     (&@%%%%%%%%%%%%%@&                               ")
+    print("                  .(@&%%%@*    *&%%%%%%@.                             ")
+    print("            ,@@&&%%%%%%%%//@%,/ /&%%%%%%@                             ")
+    print("            %@%%%&%%%%%%%#(@@@&&%%%%%%%%@*                            ")
+    print("             @&%%&%%%%%%%%%%%%%%%%%%%%%%@/                            ")
+    print("               &@@&%%%%&&&%%%%%%%%%%%%%%@,                            ")
+    print("                ,/ &@&&%%%%%%%%%%%%%%%%%@                             ")
+    print("               ,*        *@&%%%%%%%%%%%%#                             ")
+    print("               (           @%%%%%%%%%%%@                              ")
+    print("              ,            @%%%%%%%%%%&@                              ")
+    print("                          #&%%%%%%%%%%@.                              ")
+    print("                         #@###%%%%%%%@/                               ")
+    print("                        (@##(%%%%%%%@%                                ")
+    print("                       /@###(#%%%%%&@                                 ")
+    print("                      #@####%%%%%%%@                                  ")
+    print("                     (@###(%%%%%%%@,                                  ")
+    print("                    .@##(((#%%%%%&(         .,,.                      ")
+    print("                   ,@#####%%%%%%%@    ,%@@%%%%%%%&@%                  ")
+    print("                ,#&@####(%%%%%%%@@@@@&%%%%%%%%%%%###&                 ")
+    print("               @%%@%####(#%%%%%&@%%%%%%%%%%%%%%##/((@@@@&*            ")
+    print("              (##@%#####%%%%%%%@(#%%%(/####(/####(%@%%%%%%@/          ")
+    print("           (@&%@@###(#%%%%%%@&/####(/#####/#&@@&%%%%%%%##@            ")
+    print("          #@%%%%@#####(#%%%%%%@@@@@@@@@@@@@&%%%%%%%%%%%%#/(@@@@@/     ")
+    print("          @%(/#@%######%%%%%%%@%%%%%%%%%%%%%%%%%%%%%(/(###@%%%%%%@%   ")
+    print("         .@@#(#@#####(#%%%%%%&@###//#####/#####/(####/#%@&%%%%%%%%&&  ")
+    print("        /@%%&@@@(#((((#%%%%%%&@###((#####/#####((##%@@&%%%%%%%%%%%/@. ")
+    print("       ,@%%%%%%#####%%%%%%%%@@@@&&&&&&&%&@@@@@@&%%%%%%%%%%%%%%%##@,   ")
+    print("       %%%%%%%%@######(%%%%%%%@&%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#/(#&&  ")
+    print("       (@###/(%@##((##(%%%%%%%%@%%%%%%%%%%%%%%%%%%%%%%%%%##%###/(&&   ")
+    print("    ,@@%@%##((#%@#######%%%%%%%%@&%%%%##%%%%##%%%%#/#####((####(@*    ")
+    print("  *&(,    %@@%##%@#######(%%%%%%%%@#/#####((#####(#####(/#&@&.        ")
+    print("                 .@###((#%%%%%%%%%&@@###((#####(###%@@&,              ")
+    print("                   #@#(#######%&@@&* .*#&@@@@@@@%(,                   ")
+    print("                          .,,,..                                      ")
+    print()
 print("**********************************************************************")
 print("*           Welcome to the CircuitPython board test suite!           *")
 print("*              Follow the directions to run each test.               *")
 print("**********************************************************************")
 print()
 
-# List out all the pins available to us
-PINS = list(dir(board))
-print("All pins found:", end=" ")
-
-# Print pins
-for pin in PINS:
-    print(pin, end=" ")
-print("\n")
-
-# Run LED test
-print("@)}---^-----  LED TEST  -----^---{(@")
-print()
-RESULT = boardtest_led.run_test(PINS)
-TEST_RESULTS["LED Test"] = RESULT[0]
-PINS_TESTED.append(RESULT[1])
-print()
-print(RESULT[0])
-print()
-
-# Run GPIO test
-print("@)}---^-----  GPIO TEST  -----^---{(@")
-print()
-RESULT = boardtest_gpio.run_test(PINS)
-TEST_RESULTS["GPIO Test"] = RESULT[0]
-PINS_TESTED.append(RESULT[1])
-print()
-print(RESULT[0])
-print()
-
-# Run voltage monitor test
-print("@)}---^-----  VOLTAGE MONITOR TEST  -----^---{(@")
-print()
-RESULT = boardtest_voltage_monitor.run_test(PINS)
-TEST_RESULTS["Voltage Monitor Test"] = RESULT[0]
-PINS_TESTED.append(RESULT[1])
-print()
-print(RESULT[0])
-print()
-
-# Run UART test
-print("@)}---^-----  UART TEST  -----^---{(@")
-print()
-RESULT = boardtest_uart.run_test(
-    PINS, UART_TX_PIN_NAME, UART_RX_PIN_NAME, UART_BAUD_RATE
+# Register the tests in the order they should run. They are given by module
+# name, so each one is only imported if the board has the pins it needs
+RUNNER = TestRunner()
+RUNNER.register("LED Test", "boardtest_led")
+RUNNER.register("GPIO Test", "boardtest_gpio")
+RUNNER.register("Voltage Monitor Test", "boardtest_voltage_monitor")
+RUNNER.register("Analog Test", "boardtest_analog")
+RUNNER.register(
+    "UART Test",
+    "boardtest_uart",
+    tx_pin=UART_TX_PIN_NAME,
+    rx_pin=UART_RX_PIN_NAME,
+    baud_rate=UART_BAUD_RATE,
 )
-TEST_RESULTS["UART Test"] = RESULT[0]
-PINS_TESTED.append(RESULT[1])
-print()
-print(RESULT[0])
-print()
-
-# Run SPI test
-print("@)}---^-----  SPI TEST  -----^---{(@")
-print()
-RESULT = boardtest_spi.run_test(
-    PINS,
+RUNNER.register(
+    "SPI Test",
+    "boardtest_spi",
     mosi_pin=SPI_MOSI_PIN_NAME,
     miso_pin=SPI_MISO_PIN_NAME,
     sck_pin=SPI_SCK_PIN_NAME,
     cs_pin=SPI_CS_PIN_NAME,
 )
-TEST_RESULTS["SPI Test"] = RESULT[0]
-PINS_TESTED.append(RESULT[1])
-print()
-print(RESULT[0])
-print()
-
-# Run I2C test
-print("@)}---^-----  I2C TEST  -----^---{(@")
-print()
-RESULT = boardtest_i2c.run_test(
-    PINS, sda_pin=I2C_SDA_PIN_NAME, scl_pin=I2C_SCL_PIN_NAME
+RUNNER.register(
+    "I2C Test", "boardtest_i2c", sda_pin=I2C_SDA_PIN_NAME, scl_pin=I2C_SCL_PIN_NAME
 )
-TEST_RESULTS["I2C Test"] = RESULT[0]
-PINS_TESTED.append(RESULT[1])
-print()
-print(RESULT[0])
-print()
-
-# Print out test results
-print("@)}---^-----  TEST RESULTS  -----^---{(@")
-print()
-
-# Find appropriate spaces for printing test results
-NUM_SPACES = 0
-for key in TEST_RESULTS:
-    if len(key) > NUM_SPACES:
-        NUM_SPACES = len(key)
-
-# Print test results
-for key, val in TEST_RESULTS.items():
-    print(key + ":", end=" ")
-    for i in range(NUM_SPACES - len(key)):
-        print(end=" ")
-    print(val)
-print()
 
-# Figure out which pins were tested and not tested
-TESTED = []
-for sublist in PINS_TESTED:
-    for pin in sublist:
-        TESTED.append(pin)
-NOT_TESTED = list(set(PINS).difference(set(TESTED)))
-
-# Print tested pins
-print("The following pins were tested:", end=" ")
-for pin in TESTED:
+# List out all the pins available to us
+print("All pins found:", end=" ")
+for pin in RUNNER.pins:
     print(pin, end=" ")
 print("\n")
 
-# Print pins not tested
-print("The following pins were NOT tested:", end=" ")
-for pin in NOT_TESTED:
-    print(pin, end=" ")
-print("\n")
+# Run the tests and print out the results
+RUNNER.run(skip=SKIP_TESTS)
+RUNNER.print_summary()
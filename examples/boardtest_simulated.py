@@ -0,0 +1,64 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+# SPDX-License-Identifier: MIT
+
+"""
+Runs the bus and analog tests against simulated hardware on a host computer. Run it with
+CPython from the root of the repository, not on a board:
+
+    python3 examples/boardtest_simulated.py
+
+The simulated backend has to be installed before any test module is imported.
+The script then injects an address decoder fault into the I2C EEPROM and exits
+with status 1 if the March test does not find it.
+"""
+
+import sys
+
+sys.path.insert(0, ".")
+
+# pylint: disable=wrong-import-position
+from tools.simulated import SimulatedBackend
+
+BACKEND = SimulatedBackend(latency=0.0001, error_rate=0.0, seed=1).install()
+
+# Wire the DAC to the other analog pins
+BACKEND.connect("A0", "A1", "A2", "A3", "A4", "A5")
+
+from adafruit_boardtest import fixture
+from adafruit_boardtest import boardtest_analog
+from adafruit_boardtest import boardtest_i2c
+from adafruit_boardtest import boardtest_sd
+from adafruit_boardtest import boardtest_spi
+from adafruit_boardtest import boardtest_uart
+from adafruit_boardtest.runner import TestRunner
+
+# Nobody is there to answer the prompts, so say yes to everything
+RUNNER = TestRunner(instrument=fixture.fixed(True), timed=True)
+RUNNER.register("UART Test", boardtest_uart, mode=boardtest_uart.MODE_SUSTAINED)
+RUNNER.register("SPI Test", boardtest_spi, mode=boardtest_spi.MODE_BURST)
+RUNNER.register("I2C Test", boardtest_i2c, mode=boardtest_i2c.MODE_PAGE)
+RUNNER.register("SD Test", boardtest_sd, mode=boardtest_sd.MODE_BENCHMARK)
+RUNNER.register("Analog Test", boardtest_analog)
+
+RUNNER.run()
+RUNNER.print_summary()
+
+print("Bus transactions:", BACKEND.transactions)
+print("Bits flipped:", BACKEND.bit_errors)
+print()
+
+# Make address 5 of the I2C EEPROM decode to address 6, in the same page, and
+# check that the March test finds it
+BACKEND.i2c_eeprom.aliases[5] = 6
+REPORT = {}
+boardtest_i2c.run_test(
+    BACKEND.pin_names,
+    mode=boardtest_i2c.MODE_MARCH,
+    report=REPORT,
+    instrument=fixture.fixed(True),
+)
+del BACKEND.i2c_eeprom.aliases[5]
+if 5 not in REPORT["faulty_addresses"]:
+    print("March test missed the decoder fault at address 5")
+    sys.exit(1)
+print("March test found the decoder fault at address 5")
@@ -0,0 +1,9 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Host computer tools for the board tests. They need CPython and are not part of
+the `adafruit_boardtest` library, so they are left out of the bundle that is
+copied to boards.
+"""
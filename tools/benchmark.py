@@ -0,0 +1,373 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`tools.benchmark`
+====================================================
+Benchmarks the test harness itself on a host computer.
+
+`run_suite` runs every ``run_test`` function, and the byte-wise EEPROM
+helpers of the I2C and SPI tests, against a
+`tools.simulated.SimulatedBackend` with no latency and no errors, so that any
+change in the numbers comes from the harness and not from the hardware. For
+every benchmark, a `Benchmark` records:
+
+* the time per call and per bus transaction
+* the bus transactions per call
+* the heap a call allocates, and that divided over its transactions
+* the result of the call, so a benchmark that starts failing is noticed
+
+along with the wall time of the whole suite and the time and heap it took to
+import each test module. The results can be saved as a JSON baseline and
+later runs compared against it with `compare`.
+
+Every call starts from the same ``random`` seed, so it does the same work
+each time. `compare` only fails on the figures that then repeat from run to
+run: the result, the transactions per call and the allocations per
+transaction. Times depend on the load of the host and are reported, not
+checked.
+
+On CircuitPython, allocations are the growth of ``gc.mem_alloc()`` with the
+garbage collector disabled, which counts every byte allocated. On CPython,
+memory is freed as soon as it is unused, so the figure is the peak that
+``tracemalloc`` saw above the starting point, a lower bound. Either way it is
+measured on a call made after a warm-up call, so caches filled by the first
+call are not counted.
+
+Like `tools.simulated`, this module is for CPython on a host computer and is
+not part of the library.
+
+* Author(s): Adafruit Industries
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* CPython 3 on a host computer
+
+"""
+
+import contextlib
+import gc
+import io
+import json
+import random
+import time
+
+from adafruit_boardtest import heap, loader, pincatalog
+
+try:
+    from typing import Any, Callable, Dict, List, Optional
+    from tools.simulated import SimulatedBackend
+except ImportError:
+    pass
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_BoardTest.git"
+
+# Constants
+HELPER_REPEATS = 200  # Calls per helper benchmark
+TEST_REPEATS = 3  # Calls per run_test benchmark
+SEED = 1  # Seed of the random module before every call
+TOLERANCE = 0.1  # Fraction allocations may grow over the baseline
+EEPROM_ADDRESS = 0x50  # I2C address of the simulated EEPROM
+
+
+def _allocated(function: Callable, args: Any, kwargs: Any) -> int:
+    # Heap bytes one call allocates, after a warm-up call
+    random.seed(SEED)
+    function(*args, **kwargs)
+    random.seed(SEED)
+    gc.collect()
+    if hasattr(gc, "mem_alloc"):
+        gc.disable()
+        before = heap.mem_alloc()
+        function(*args, **kwargs)
+        allocated = heap.mem_alloc() - before
+        gc.enable()
+        return allocated
+
+    import tracemalloc  # pylint: disable=import-outside-toplevel
+
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    function(*args, **kwargs)
+    return max(tracemalloc.get_traced_memory()[1] - before, 0)
+
+
+class Benchmark:
+    """
+    Times calls against a simulated backend and keeps the results.
+
+    :param SimulatedBackend backend: the installed backend, whose transaction
+        count is read around every benchmark
+    :param bool quiet: True to hide what the benchmarked calls print
+    """
+
+    def __init__(self, backend: SimulatedBackend, quiet: bool = True) -> None:
+        self.backend = backend
+        self.quiet = quiet
+        self.results = {}
+        self.wall_ns = 0
+        self.imports = {}
+
+    def measure(  # pylint: disable=too-many-locals
+        self,
+        name: str,
+        function: Callable,
+        *args: Any,
+        repeats: int = HELPER_REPEATS,
+        **kwargs: Any
+    ) -> Dict[str, Any]:
+        """
+        Calls a function ``repeats`` times and records how long the fastest
+        call took, which is steadier from run to run than the mean, and how
+        many bus transactions the calls made. Then calls it twice more, a
+        warm-up call and one to measure its allocations. ``random`` is seeded
+        with `SEED` before every call.
+
+        :param str name: name of the benchmark
+        :param function: the function to call
+        :param args: positional arguments for the function
+        :param int repeats: number of timed calls
+        :param kwargs: keyword arguments for the function
+        :return: dict: the result, also kept in `results`
+        """
+        with contextlib.redirect_stdout(io.StringIO()) if self.quiet else _nothing():
+            transactions = self.backend.transactions
+            duration_ns = 0
+            best_ns = None
+            for _ in range(repeats):
+                random.seed(SEED)
+                start = time.monotonic_ns()
+                value = function(*args, **kwargs)
+                call_ns = time.monotonic_ns() - start
+                duration_ns += call_ns
+                if best_ns is None or call_ns < best_ns:
+                    best_ns = call_ns
+            transactions = self.backend.transactions - transactions
+        # A fresh output buffer, so the allocations do not depend on how full
+        # the first one got
+        with contextlib.redirect_stdout(io.StringIO()) if self.quiet else _nothing():
+            allocated = _allocated(function, args, kwargs)
+
+        per_call = max(transactions // repeats, 1)
+        result = {
+            "calls": repeats,
+            "total_ns": duration_ns,
+            "ns_per_call": best_ns,
+            "mean_ns_per_call": duration_ns // repeats,
+            "transactions": transactions,
+            "transactions_per_call": transactions // repeats,
+            "ns_per_transaction": best_ns // per_call,
+            "alloc_per_call": allocated,
+            "alloc_per_transaction": allocated // per_call,
+            "value": _describe(value),
+        }
+        self.results[name] = result
+        return result
+
+    def print_results(self) -> None:
+        """Prints a table of the results and the suite totals."""
+        width = max([len(name) for name in self.results] + [9])
+        print("Benchmark".ljust(width), end=" ")
+        print("       ns/call   transactions    bytes/call  result")
+        for name, result in self.results.items():
+            print(name.ljust(width), end=" ")
+            print("{:14d}".format(result["ns_per_call"]), end=" ")
+            print("{:14d}".format(result["transactions_per_call"]), end=" ")
+            print("{:13d}".format(result["alloc_per_call"]), end="  ")
+            print(result["value"])
+        print()
+        for module, cost in self.imports.items():
+            print(
+                "Imported " + module + " in " + str(cost[0] // 1000) + " us", end=", "
+            )
+            print(str(cost[1]) + " bytes")
+        print("Suite wall time: {:.3f}".format(self.wall_ns / 1000000000) + " s")
+
+    def save(self, path: str) -> None:
+        """
+        Writes the results to a JSON file, to be used as a baseline.
+
+        :param str path: file to write
+        """
+        with open(path, "w") as baseline:
+            json.dump({"wall_ns": self.wall_ns, "results": self.results}, baseline)
+
+    def compare(
+        self, baseline: Dict[str, Any], tolerance: float = TOLERANCE
+    ) -> List[str]:
+        """
+        Compares the results with a baseline written by `save`. A benchmark
+        regresses if its result changed, if it makes more bus transactions
+        per call, or if its allocations per transaction grew by more than
+        ``tolerance``. Times are not compared.
+
+        :param dict baseline: the loaded baseline
+        :param float tolerance: fraction the allocations may grow before they
+            count as a regression
+        :return: list[str]: one line per regression, empty if there are none
+        """
+        regressions = []
+        for name, old in baseline["results"].items():
+            new = self.results.get(name)
+            if new is None:
+                regressions.append(name + ": no longer run")
+                continue
+            if new["value"] != old["value"]:
+                regressions.append(name + ": returned " + new["value"])
+            for figure, allowed in (
+                ("transactions_per_call", 0),
+                ("alloc_per_transaction", tolerance),
+            ):
+                if new[figure] > old[figure] * (1 + allowed):
+                    regressions.append(
+                        name
+                        + ": "
+                        + figure
+                        + " "
+                        + str(old[figure])
+                        + " -> "
+                        + str(new[figure])
+                    )
+        return regressions
+
+
+@contextlib.contextmanager
+def _nothing() -> Any:
+    yield
+
+
+# Short description of a return value, for comparing runs
+def _describe(value: Any) -> str:
+    if isinstance(value, tuple) and value and isinstance(value[0], (str, bool)):
+        return str(value[0])
+    return str(value)
+
+
+def load_baseline(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Reads a baseline written by `Benchmark.save`.
+
+    :param str path: file to read
+    :return: dict: the baseline, or None if there is no such file
+    """
+    try:
+        with open(path, "r") as baseline:
+            return json.load(baseline)
+    except OSError:
+        return None
+
+
+def _bench_i2c_helpers(bench: Benchmark, i2c_module: Any) -> None:
+    # pylint: disable=import-outside-toplevel
+    import board
+    import busio
+
+    i2c = busio.I2C(board.SCL, board.SDA)
+    while not i2c.try_lock():
+        pass
+    bench.measure(
+        "i2c write byte",
+        i2c_module._eeprom_i2c_write_byte,  # pylint: disable=protected-access
+        i2c,
+        EEPROM_ADDRESS,
+        0x10,
+        0xA5,
+    )
+    bench.measure(
+        "i2c read byte",
+        i2c_module._eeprom_i2c_read_byte,  # pylint: disable=protected-access
+        i2c,
+        EEPROM_ADDRESS,
+        0x10,
+    )
+    i2c.unlock()
+    i2c.deinit()
+
+
+def _bench_spi_helpers(bench: Benchmark, spi_module: Any) -> None:
+    # pylint: disable=import-outside-toplevel,protected-access
+    import board
+    import busio
+    import digitalio
+
+    spi = busio.SPI(board.SCK, MOSI=board.MOSI, MISO=board.MISO)
+    csel = digitalio.DigitalInOut(getattr(board, spi_module.CS_PIN_NAME))
+    csel.direction = digitalio.Direction.OUTPUT
+    csel.value = True
+    while not spi.try_lock():
+        pass
+    spi.configure(baudrate=spi_module.BAUD_RATE, phase=0, polarity=0)
+    bench.measure("spi wait", spi_module._eeprom_spi_wait, spi, csel)
+    bench.measure(
+        "spi write byte", spi_module._eeprom_spi_write_byte, spi, csel, 0x10, 0xA5
+    )
+    bench.measure("spi read byte", spi_module._eeprom_spi_read_byte, spi, csel, 0x10)
+    spi.unlock()
+    spi.deinit()
+    csel.deinit()
+
+
+def run_suite(backend: SimulatedBackend, quiet: bool = True) -> Benchmark:
+    """
+    Runs every benchmark. The test modules are imported here, through a
+    `adafruit_boardtest.loader.ModuleLoader`, so the backend must be
+    installed first. The EEPROMs' write cycle is turned off so that timings
+    do not depend on it, and the sustained UART test streams less data, as
+    the simulated UART is paced at its baud rate.
+
+    :param SimulatedBackend backend: the installed backend
+    :param bool quiet: True to hide what the tests print
+    :return: Benchmark: the results
+    """
+    # pylint: disable=import-outside-toplevel
+    from adafruit_boardtest import fixture
+
+    bench = Benchmark(backend, quiet)
+    start = time.monotonic_ns()
+    backend.i2c_eeprom.write_cycle_ns = 0
+    backend.spi_eeprom.write_cycle_ns = 0
+    backend.connect("A0", "A1", "A2", "A3", "A4", "A5")
+    pins = backend.pin_names
+    modules = loader.ModuleLoader(pincatalog.catalog(pins))
+
+    # Helpers, called many times each
+    _bench_i2c_helpers(bench, modules.load("boardtest_i2c"))
+    _bench_spi_helpers(bench, modules.load("boardtest_spi"))
+
+    # Whole tests, in each of their automatic modes
+    tests = (
+        ("led", "boardtest_led", {}),
+        ("gpio", "boardtest_gpio", {}),
+        ("voltage monitor", "boardtest_voltage_monitor", {"mode": "oversample"}),
+        ("analog", "boardtest_analog", {}),
+        ("uart", "boardtest_uart", {}),
+        ("uart sustained", "boardtest_uart", {"mode": "sustained", "volume": 256}),
+        ("spi", "boardtest_spi", {}),
+        ("spi burst", "boardtest_spi", {"mode": "burst"}),
+        ("i2c", "boardtest_i2c", {}),
+        ("i2c page", "boardtest_i2c", {"mode": "page"}),
+        ("i2c march", "boardtest_i2c", {"mode": "march"}),
+        ("i2c sweep", "boardtest_i2c", {"mode": "sweep"}),
+        ("sd", "boardtest_sd", {}),
+        ("sd benchmark", "boardtest_sd", {"mode": "benchmark"}),
+    )
+    for name, module, kwargs in tests:
+        bench.measure(
+            name + " test",
+            modules.load(module).run_test,
+            pins,
+            instrument=fixture.fixed(True),
+            repeats=TEST_REPEATS,
+            **kwargs
+        )
+
+    bench.wall_ns = time.monotonic_ns() - start
+    bench.imports = modules.summary()
+    return bench
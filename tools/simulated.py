@@ -0,0 +1,1146 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+# pylint: disable=too-many-lines
+
+"""
+`tools.simulated`
+====================================================
+Simulated hardware for running the board tests on a host computer.
+
+`SimulatedBackend.install` puts stand-ins for ``board``, ``microcontroller``,
+``busio``, ``digitalio``, ``countio``, ``analogio``, ``analogbufio``,
+``supervisor``, ``storage`` and ``adafruit_sdcard`` into ``sys.modules``
+and routes ``open`` calls below the SD card mount point to a RAM-backed card.
+The test modules imported after that run unmodified against:
+
+* a virtual AT24C04 I2C EEPROM (two 256 byte blocks at 0x50 and 0x51, 16 byte
+  pages, NAKs while a write cycle is in progress)
+* a virtual 25AA040A SPI EEPROM (512 bytes with the A8 address bit in the
+  instruction, 16 byte pages, WIP and WEL status bits)
+* a UART with its TX wired to its RX, which takes as long to send as the
+  baud rate says
+* GPIO pins that can be wired together with `SimulatedBackend.connect` and
+  stuck at a level through `SimulatedBackend.stuck`, and edge counters on
+  them
+* analog inputs that read the voltages in `SimulatedBackend.analog`, with
+  optional gaussian noise and a per pin offset and gain error, and a DAC on
+  A0 whose output reaches every pin wired to it
+* an SD card that keeps its files in RAM for as long as the backend lives
+
+Every bus transaction can be slowed down by a fixed latency, and bytes read
+back from any device can have bits flipped at random, so the tests' own
+overhead and their error paths can be measured without a board.
+
+This module is for CPython on a host computer, which is why it lives in
+``tools`` rather than in the library. It is not meant to be copied to a
+CIRCUITPY drive.
+
+* Author(s): Adafruit Industries
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* CPython 3 on a host computer
+
+"""
+
+import builtins
+import random
+import sys
+import time
+import types
+
+try:
+    from typing import Any, List, Optional, Sequence, Tuple, Type
+    from types import TracebackType
+except ImportError:
+    pass
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_BoardTest.git"
+
+# Constants
+PIN_NAMES = (
+    "A0 A1 A2 A3 A4 A5 D0 D1 D2 D4 D5 D6 D9 D10 D11 D12 D13 SCK MOSI MISO SDA SCL "
+    "VOLTAGE_MONITOR SD_SCK SD_MOSI SD_MISO SD_CS SD_CD"
+).split()
+PIN_ALIASES = {"LED": "D13", "TX": "D1", "RX": "D0", "D14": "A0"}
+SD_CD_PIN_NAME = "SD_CD"
+SPI_EEPROM_CS_PIN_NAME = "D2"
+I2C_EEPROM_ADDRESS = 0x50
+WRITE_CYCLE_TIME = 0.005  # Seconds an EEPROM is busy after a page write
+ANALOG_REF = 3.3  # Reference analog voltage
+ANALOGIN_BITS = 16  # ADC resolution (bits) for CircuitPython
+VOLTAGE_MONITOR_VOLTAGE = 1.85  # Half of a 3.7 V battery behind a divider
+DAC_PIN_NAMES = ("A0",)  # Pins that support analogio.AnalogOut
+UART_RX_BUFFER_SIZE = 64  # CircuitPython's default receiver buffer size
+ENODEV = 19  # Errno raised by CircuitPython when an I2C address NAKs
+
+# 25AA040A instructions
+SPI_READ = 0x03
+SPI_WRITE = 0x02
+SPI_WRDI = 0x04
+SPI_WREN = 0x06
+SPI_RDSR = 0x05
+SPI_WRSR = 0x01
+SPI_A8_BIT = 3
+
+
+class Pin:  # pylint: disable=too-few-public-methods
+    """
+    Stand-in for ``microcontroller.Pin``. Aliases on ``board`` are the same
+    object, as on a real board.
+
+    :param str name: name of the pin
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __repr__(self) -> str:
+        return "board." + self.name
+
+
+class AT24EEPROM:
+    """
+    Virtual AT24C04 style I2C EEPROM. The memory is split into 256 byte
+    blocks that answer on consecutive addresses. Page writes wrap around
+    inside their page, and every address NAKs for ``write_cycle`` seconds
+    after a write.
+
+    Faults can be injected per memory address: ``stuck_bits`` maps an
+    address to a ``(mask, value)`` pair whose masked bits always read as in
+    ``value``, and ``aliases`` maps an address to the address its cell
+    really is, as a faulty address decoder would.
+
+    :param int size: memory size in bytes
+    :param int page_size: page size in bytes
+    :param float write_cycle: seconds the chip is busy after a write
+    """
+
+    def __init__(
+        self,
+        size: int = 512,
+        page_size: int = 16,
+        write_cycle: float = WRITE_CYCLE_TIME,
+    ) -> None:
+        self.memory = bytearray(size)
+        self.page_size = page_size
+        self.write_cycle_ns = int(write_cycle * 1000000000)
+        self.pointer = 0
+        self.writes = 0
+        self.stuck_bits = {}
+        self.aliases = {}
+        self._busy_until = 0
+
+    @property
+    def busy(self) -> bool:
+        """True while a write cycle is in progress."""
+        return time.monotonic_ns() < self._busy_until
+
+    def _cell(self, address: int) -> int:
+        return self.aliases.get(address, address)
+
+    def write(self, block: int, data: bytes) -> bool:
+        """
+        Handles a write transaction. The first byte sets the word address,
+        anything after it is written to the current page.
+
+        :param int block: which 256 byte block was addressed
+        :param bytes data: bytes sent by the controller
+        :return: bool: False if the chip NAKed
+        """
+        if self.busy:
+            return False
+        if not data:
+            return True
+
+        size = len(self.memory)
+        self.pointer = (block * 256 + data[0]) % size
+        if len(data) > 1:
+            page = self.pointer - self.pointer % self.page_size
+            for value in data[1:]:
+                self.memory[self._cell(self.pointer)] = value
+                self.pointer = page + (self.pointer + 1 - page) % self.page_size
+            self.writes += 1
+            self._busy_until = time.monotonic_ns() + self.write_cycle_ns
+        return True
+
+    def read(self, buf: bytearray, start: int, end: int) -> bool:
+        """
+        Handles a read transaction from the current address onwards.
+
+        :param bytearray buf: buffer to read into
+        :param int start: first index to fill
+        :param int end: index to stop at
+        :return: bool: False if the chip NAKed
+        """
+        if self.busy:
+            return False
+        size = len(self.memory)
+        for i in range(start, end):
+            value = self.memory[self._cell(self.pointer)]
+            mask, stuck = self.stuck_bits.get(self.pointer, (0, 0))
+            buf[i] = (value & ~mask) | (stuck & mask)
+            self.pointer = (self.pointer + 1) % size
+        return True
+
+
+class SPIEEPROM:
+    """
+    Virtual 25AA040A SPI EEPROM. It sees every byte clocked while its CS pin
+    is low and acts on a transaction when CS goes high again, the same way
+    the real chip latches a write.
+
+    :param int size: memory size in bytes
+    :param int page_size: page size in bytes
+    :param float write_cycle: seconds the chip is busy after a write
+    """
+
+    def __init__(
+        self,
+        size: int = 512,
+        page_size: int = 16,
+        write_cycle: float = WRITE_CYCLE_TIME,
+    ) -> None:
+        self.memory = bytearray(size)
+        self.page_size = page_size
+        self.write_cycle_ns = int(write_cycle * 1000000000)
+        self.write_enabled = False
+        self.writes = 0
+        self._busy_until = 0
+        self._selected = False
+        self._received = bytearray()
+
+    @property
+    def busy(self) -> bool:
+        """True while a write cycle is in progress."""
+        return time.monotonic_ns() < self._busy_until
+
+    def select(self, selected: bool) -> None:
+        """
+        Follows the CS line. Deselecting ends the current instruction.
+
+        :param bool selected: True when CS is driven low
+        """
+        if selected and not self._selected:
+            self._received = bytearray()
+        elif self._selected and not selected:
+            self._finish()
+        self._selected = selected
+
+    def transfer(self, value: int) -> int:
+        """
+        Clocks one byte in and returns the byte clocked out.
+
+        :param int value: byte on MOSI
+        :return: int: byte on MISO
+        """
+        if not self._selected:
+            return 0xFF
+        received = self._received
+        received.append(value)
+        index = len(received) - 1
+        instruction = received[0] & ~(1 << SPI_A8_BIT)
+        if instruction == SPI_RDSR and index >= 1:
+            return (1 if self.busy else 0) | (2 if self.write_enabled else 0)
+        if instruction == SPI_READ and index >= 2 and not self.busy:
+            return self.memory[(self._address() + index - 2) % len(self.memory)]
+        return 0xFF
+
+    def _address(self) -> int:
+        return ((self._received[0] >> SPI_A8_BIT) & 1) << 8 | self._received[1]
+
+    def _finish(self) -> None:
+        received = self._received
+        if not received or self.busy:
+            return
+        instruction = received[0] & ~(1 << SPI_A8_BIT)
+        if instruction == SPI_WREN:
+            self.write_enabled = True
+        elif instruction == SPI_WRDI:
+            self.write_enabled = False
+        elif instruction == SPI_WRITE and self.write_enabled and len(received) > 2:
+            address = self._address()
+            page = address - address % self.page_size
+            for value in received[2:]:
+                self.memory[address] = value
+                address = page + (address + 1 - page) % self.page_size
+            self.write_enabled = False
+            self.writes += 1
+            self._busy_until = time.monotonic_ns() + self.write_cycle_ns
+
+
+class RAMSDCard:  # pylint: disable=too-few-public-methods
+    """
+    Virtual SD card. Files are kept in a dictionary of bytearrays, so they
+    survive unmounting and mounting again, like on a real card.
+    """
+
+    def __init__(self) -> None:
+        self.files = {}
+        self.inserted = True
+        self.inits = 0
+        self.baud_rate = 0
+
+
+class RAMFile:
+    """
+    File opened on the `RAMSDCard`. Supports the usual binary and text
+    modes, ``+`` for reading and writing, ``seek`` and ``readinto``.
+
+    :param SimulatedBackend backend: the backend the card belongs to
+    :param bytearray data: contents of the file
+    :param str mode: mode the file was opened with
+    """
+
+    def __init__(self, backend: "SimulatedBackend", data: bytearray, mode: str) -> None:
+        self._backend = backend
+        self._data = data
+        self._binary = "b" in mode
+        self._readable = "r" in mode or "+" in mode
+        self._writable = "r" not in mode or "+" in mode
+        self._position = len(data) if "a" in mode else 0
+        self.closed = False
+
+    def _check(self, allowed: bool) -> None:
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+        if not allowed:
+            raise OSError(22, "File not open for that operation")
+
+    def write(self, data: Any) -> int:
+        """Writes bytes (or a str in text mode) at the current position."""
+        self._check(self._writable)
+        self._backend.transaction()
+        if not self._binary:
+            data = data.encode()
+        end = self._position + len(data)
+        if end > len(self._data):
+            self._data.extend(bytes(end - len(self._data)))
+        self._data[self._position : end] = data
+        self._position = end
+        return len(data)
+
+    def readinto(self, buf: bytearray) -> int:
+        """Reads into a buffer and returns the number of bytes read."""
+        self._check(self._readable)
+        self._backend.transaction()
+        count = max(0, min(len(buf), len(self._data) - self._position))
+        buf[:count] = self._data[self._position : self._position + count]
+        self._position += count
+        self._backend.corrupt(buf, 0, count, self._backend.sd_card.baud_rate)
+        return count
+
+    def read(self, size: int = -1) -> Any:
+        """Reads up to ``size`` bytes, or everything that is left."""
+        remaining = max(0, len(self._data) - self._position)
+        buf = bytearray(remaining if size < 0 else min(size, remaining))
+        self.readinto(buf)
+        return bytes(buf) if self._binary else buf.decode()
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        """Moves the file position, as ``io`` does."""
+        self._check(True)
+        if whence == 1:
+            offset += self._position
+        elif whence == 2:
+            offset += len(self._data)
+        self._position = max(0, offset)
+        return self._position
+
+    def tell(self) -> int:
+        """Returns the current file position."""
+        return self._position
+
+    def flush(self) -> None:
+        """Does nothing, the data is already on the card."""
+
+    def close(self) -> None:
+        """Closes the file."""
+        self.closed = True
+
+    def __enter__(self) -> "RAMFile":
+        return self
+
+    def __exit__(
+        self,
+        exception_type: Optional[Type[BaseException]],
+        exception_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+class SimulatedBackend:  # pylint: disable=too-many-instance-attributes
+    """
+    Simulated board with its test jig attached.
+
+    :param float latency: seconds added to every bus transaction
+    :param float error_rate: chance that each byte read back from a device
+        has one of its bits flipped
+    :param int max_baud_rate: optional SPI or I2C clock above which every byte read
+        back is corrupted, to give the sweep modes a limit to find
+    :param int seed: seed for the error injection, for repeatable runs
+    :param list[str] pin_names: pins the board has, aliases are added to them
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        max_baud_rate: Optional[int] = None,
+        seed: Optional[int] = None,
+        pin_names: Sequence[str] = PIN_NAMES,
+    ) -> None:
+        self.latency = latency
+        self.error_rate = error_rate
+        self.max_baud_rate = max_baud_rate
+        self.random = random.Random(seed)
+        self.transactions = 0
+        self.bit_errors = 0
+        self.analog = {"VOLTAGE_MONITOR": VOLTAGE_MONITOR_VOLTAGE}
+        self.analog_noise = 0.0
+        self.analog_outputs = {}
+        self.adc_errors = {}
+        self.drivers = {}
+        self.nets = {}
+        self.stuck = {}
+        self.counters = []
+        self.i2c_eeprom = AT24EEPROM()
+        self.i2c_devices = {
+            I2C_EEPROM_ADDRESS: (self.i2c_eeprom, 0),
+            I2C_EEPROM_ADDRESS + 1: (self.i2c_eeprom, 1),
+        }
+        self.spi_devices = {SPI_EEPROM_CS_PIN_NAME: SPIEEPROM()}
+        self.sd_card = RAMSDCard()
+        self.mounts = {}
+        self.modules = {}
+        self.serial_bytes_available = False
+        self._saved_modules = {}
+        self._saved_open = None
+        self._pins = {name: Pin(name) for name in pin_names}
+        for alias, name in PIN_ALIASES.items():
+            if name in self._pins:
+                self._pins[alias] = self._pins[name]
+        self._build_modules()
+
+    @property
+    def spi_eeprom(self) -> SPIEEPROM:
+        """The SPI EEPROM on the default CS pin."""
+        return self.spi_devices[SPI_EEPROM_CS_PIN_NAME]
+
+    @property
+    def pin_names(self) -> List[str]:
+        """Names on the simulated ``board`` module, aliases included."""
+        return sorted(self._pins)
+
+    def pin(self, name: str) -> Pin:
+        """
+        Looks up a pin of the simulated board.
+
+        :param str name: pin name
+        :return: Pin: the pin object
+        """
+        return self._pins[name]
+
+    def connect(self, *names: str) -> None:
+        """
+        Wires pins together, like jumpers on a loopback fixture. Pins already
+        wired to others keep those connections.
+
+        :param str names: names of the pins to wire together
+        """
+        net = []
+        for name in names:
+            for other in self.nets.get(name, [name]):
+                if other not in net:
+                    net.append(other)
+        for name in net:
+            self.nets[name] = net
+
+    def level(self, name: str, pull: bool) -> bool:
+        """
+        Works out the level an input pin reads. A stuck pin always reads its
+        stuck level. Otherwise the outputs wired to the pin decide, with any
+        output driving high winning, and an undriven pin reads its pull.
+
+        :param str name: name of the input pin
+        :param bool pull: level the pin's pull resistor sets
+        :return: bool: the level
+        """
+        if name in self.stuck:
+            return self.stuck[name]
+        driven = False
+        for other in self.nets.get(name, [name]):
+            if other in self.drivers:
+                level = self.stuck.get(other, self.drivers[other])
+                if level:
+                    return True
+                driven = True
+        return pull and not driven
+
+    def update_counters(self) -> None:
+        """Lets every edge counter see the current level of its pin."""
+        for counter in self.counters:
+            counter.update()
+
+    def transaction(self) -> None:
+        """Counts one bus transaction and waits out the configured latency."""
+        self.transactions += 1
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def analog_value(self, name: str) -> int:
+        """
+        Converts the voltage on a pin the way the ADC would. A DAC wired to
+        the pin sets the voltage, otherwise it comes from ``analog``. The
+        pin's ``(offset, gain)`` in ``adc_errors`` is applied, then noise with
+        a standard deviation of ``analog_noise`` volts is added.
+
+        :param str name: pin name
+        :return: int: reading scaled to 16 bits
+        """
+        voltage = self.analog.get(name, 0.0)
+        for other in self.nets.get(name, [name]):
+            if other in self.analog_outputs:
+                voltage = self.analog_outputs[other]
+                break
+        offset, gain = self.adc_errors.get(name, (0.0, 1.0))
+        voltage = voltage * gain + offset
+        if self.analog_noise > 0:
+            voltage = self.random.gauss(voltage, self.analog_noise)
+        value = int(voltage * (2**ANALOGIN_BITS) / ANALOG_REF)
+        return max(0, min(value, 2**ANALOGIN_BITS - 1))
+
+    def corrupt(self, buf: bytearray, start: int, end: int, baud_rate: int = 0) -> None:
+        """
+        Flips random bits in bytes read back from a device.
+
+        :param bytearray buf: buffer holding the bytes read
+        :param int start: first index that was read
+        :param int end: index after the last byte that was read
+        :param int baud_rate: clock the bytes were read with, 0 if unknown
+        """
+        rate = self.error_rate
+        if self.max_baud_rate is not None and baud_rate > self.max_baud_rate:
+            rate = 1.0
+        if rate <= 0:
+            return
+        for i in range(start, end):
+            if self.random.random() < rate:
+                buf[i] ^= 1 << self.random.randrange(8)
+                self.bit_errors += 1
+
+    def install(self) -> "SimulatedBackend":
+        """
+        Puts the simulated modules into ``sys.modules`` and starts routing
+        ``open`` calls below mount points to the RAM SD card. Import the test
+        modules after calling this.
+
+        :return: SimulatedBackend: this backend, for chaining
+        """
+        for name, module in self.modules.items():
+            if name not in self._saved_modules:
+                self._saved_modules[name] = sys.modules.get(name)
+            sys.modules[name] = module
+        if self._saved_open is None:
+            self._saved_open = builtins.open
+            builtins.open = self._open
+        return self
+
+    def uninstall(self) -> None:
+        """Restores ``sys.modules`` and ``open``."""
+        for name, module in self._saved_modules.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+        self._saved_modules = {}
+        if self._saved_open is not None:
+            builtins.open = self._saved_open
+            self._saved_open = None
+
+    def __enter__(self) -> "SimulatedBackend":
+        return self.install()
+
+    def __exit__(
+        self,
+        exception_type: Optional[Type[BaseException]],
+        exception_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.uninstall()
+
+    def _open(self, file: Any, *args: Any, **kwargs: Any) -> Any:
+        if isinstance(file, str):
+            for mount_point in self.mounts:
+                if file.startswith(mount_point + "/"):
+                    mode = args[0] if args else kwargs.get("mode", "r")
+                    return self._open_on_card(file[len(mount_point) + 1 :], mode)
+        return self._saved_open(file, *args, **kwargs)
+
+    def _open_on_card(self, name: str, mode: str) -> RAMFile:
+        if not self.sd_card.inserted:
+            raise OSError(5, "Input/output error")
+        files = self.sd_card.files
+        if "w" in mode:
+            files[name] = bytearray()
+        elif name not in files:
+            if "a" not in mode:
+                raise OSError(2, "No such file or directory")
+            files[name] = bytearray()
+        return RAMFile(self, files[name], mode)
+
+    def _build_modules(self) -> None:
+        backend = self
+
+        board = types.ModuleType("board")
+        for name, pin in self._pins.items():
+            setattr(board, name, pin)
+
+        microcontroller = types.ModuleType("microcontroller")
+        microcontroller.Pin = Pin
+
+        supervisor = types.ModuleType("supervisor")
+
+        class _Runtime:  # pylint: disable=too-few-public-methods
+            @property
+            def serial_bytes_available(self) -> bool:
+                """Mirrors the backend's flag."""
+                return backend.serial_bytes_available
+
+        supervisor.runtime = _Runtime()
+
+        self.modules = {
+            "board": board,
+            "microcontroller": microcontroller,
+            "busio": _busio_module(self),
+            "digitalio": _digitalio_module(self),
+            "countio": _countio_module(self),
+            "analogio": _analogio_module(self),
+            "analogbufio": _analogbufio_module(self),
+            "supervisor": supervisor,
+            "storage": _storage_module(self),
+            "adafruit_sdcard": _sdcard_module(self),
+        }
+
+
+def _end(buf: bytearray, end: Optional[int]) -> int:
+    return len(buf) if end is None else end
+
+
+def _busio_module(  # pylint: disable=too-many-statements
+    backend: SimulatedBackend,
+) -> types.ModuleType:
+    class I2C:
+        """Simulated ``busio.I2C``."""
+
+        def __init__(self, scl: Pin, sda: Pin, *, frequency: int = 100000) -> None:
+            self.scl = scl
+            self.sda = sda
+            self.frequency = frequency
+            self._locked = False
+
+        def try_lock(self) -> bool:
+            """Claims the bus."""
+            if self._locked:
+                return False
+            self._locked = True
+            return True
+
+        def unlock(self) -> None:
+            """Releases the bus."""
+            self._locked = False
+
+        def deinit(self) -> None:
+            """Releases the pins."""
+            self._locked = False
+
+        def scan(self) -> List[int]:  # pylint: disable=no-self-use
+            """Lists the addresses that ACK."""
+            backend.transaction()
+            return sorted(
+                address
+                for address, (device, _) in backend.i2c_devices.items()
+                if not device.busy
+            )
+
+        @staticmethod
+        def _device(address: int) -> Tuple[AT24EEPROM, int]:
+            if address not in backend.i2c_devices:
+                raise OSError(ENODEV)
+            return backend.i2c_devices[address]
+
+        def writeto(
+            self, address: int, buffer: bytearray, *, start: int = 0, end: Any = None
+        ) -> None:
+            """Writes ``buffer[start:end]`` to a device."""
+            backend.transaction()
+            device, block = self._device(address)
+            data = bytes(buffer[start : _end(buffer, end)])
+            if not device.write(block, data):
+                raise OSError(ENODEV)
+
+        def readfrom_into(
+            self, address: int, buffer: bytearray, *, start: int = 0, end: Any = None
+        ) -> None:
+            """Reads from a device into ``buffer[start:end]``."""
+            backend.transaction()
+            device, _ = self._device(address)
+            end = _end(buffer, end)
+            if not device.read(buffer, start, end):
+                raise OSError(ENODEV)
+            backend.corrupt(buffer, start, end, self.frequency)
+
+        def writeto_then_readfrom(  # pylint: disable=too-many-arguments
+            self,
+            address: int,
+            out_buffer: bytearray,
+            in_buffer: bytearray,
+            *,
+            out_start: int = 0,
+            out_end: Any = None,
+            in_start: int = 0,
+            in_end: Any = None,
+        ) -> None:
+            """Writes then reads with a repeated start."""
+            self.writeto(address, out_buffer, start=out_start, end=out_end)
+            self.readfrom_into(address, in_buffer, start=in_start, end=in_end)
+
+    class SPI:
+        """Simulated ``busio.SPI``."""
+
+        def __init__(
+            self, clock: Pin, MOSI: Optional[Pin] = None, MISO: Optional[Pin] = None
+        ) -> None:
+            # pylint: disable=invalid-name
+            self.clock = clock
+            self.MOSI = MOSI
+            self.MISO = MISO
+            self.frequency = 250000
+            self._locked = False
+
+        def try_lock(self) -> bool:
+            """Claims the bus."""
+            if self._locked:
+                return False
+            self._locked = True
+            return True
+
+        def unlock(self) -> None:
+            """Releases the bus."""
+            self._locked = False
+
+        def configure(
+            self,
+            *,
+            baudrate: int = 100000,
+            polarity: int = 0,
+            phase: int = 0,
+            bits: int = 8,
+        ) -> None:
+            """Sets the clock. The simulated bus runs at any rate asked for."""
+            # pylint: disable=unused-argument
+            self.frequency = baudrate
+
+        def deinit(self) -> None:
+            """Releases the pins."""
+            self._locked = False
+
+        @staticmethod
+        def _transfer(value: int) -> int:
+            result = 0xFF
+            for device in backend.spi_devices.values():
+                result &= device.transfer(value)
+            return result
+
+        def write(self, buffer: bytearray, *, start: int = 0, end: Any = None) -> None:
+            """Clocks out ``buffer[start:end]``."""
+            backend.transaction()
+            for i in range(start, _end(buffer, end)):
+                self._transfer(buffer[i])
+
+        def readinto(
+            self,
+            buffer: bytearray,
+            *,
+            start: int = 0,
+            end: Any = None,
+            write_value: int = 0,
+        ) -> None:
+            """Clocks ``write_value`` out while reading into ``buffer``."""
+            backend.transaction()
+            end = _end(buffer, end)
+            for i in range(start, end):
+                buffer[i] = self._transfer(write_value)
+            backend.corrupt(buffer, start, end, self.frequency)
+
+        def write_readinto(  # pylint: disable=too-many-arguments
+            self,
+            out_buffer: bytearray,
+            in_buffer: bytearray,
+            *,
+            out_start: int = 0,
+            out_end: Any = None,
+            in_start: int = 0,
+            in_end: Any = None,
+        ) -> None:
+            """Clocks ``out_buffer`` out while reading into ``in_buffer``."""
+            backend.transaction()
+            out_end = _end(out_buffer, out_end)
+            in_end = _end(in_buffer, in_end)
+            for i in range(out_end - out_start):
+                in_buffer[in_start + i] = self._transfer(out_buffer[out_start + i])
+            backend.corrupt(in_buffer, in_start, in_end, self.frequency)
+
+    class UART:
+        """
+        Simulated ``busio.UART`` with TX wired to RX. Writes block for as
+        long as the frames take on the wire at the baud rate, so throughput
+        figures are realistic. Bytes that do not fit in the receive buffer
+        are dropped, as on a real board.
+        """
+
+        def __init__(  # pylint: disable=too-many-arguments
+            self,
+            tx: Pin,
+            rx: Pin,
+            *,
+            baudrate: int = 9600,
+            bits: int = 8,
+            parity: Any = None,
+            stop: int = 1,
+            timeout: float = 1,
+            receiver_buffer_size: int = UART_RX_BUFFER_SIZE,
+        ) -> None:
+            # pylint: disable=unused-argument,invalid-name
+            self.tx = tx
+            self.rx = rx
+            self.baudrate = baudrate
+            self.frame_bits = 1 + bits + (parity is not None) + stop
+            self.timeout = timeout
+            self.receiver_buffer_size = receiver_buffer_size
+            self.overruns = 0
+            self._received = bytearray()
+
+        @property
+        def in_waiting(self) -> int:
+            """Number of bytes in the receive buffer."""
+            return len(self._received)
+
+        def write(self, buf: bytearray) -> int:
+            """Sends bytes, which arrive in the receive buffer."""
+            backend.transaction()
+            time.sleep(len(buf) * self.frame_bits / self.baudrate)
+            room = self.receiver_buffer_size - len(self._received)
+            start = len(self._received)
+            self._received.extend(buf[:room])
+            backend.corrupt(self._received, start, len(self._received))
+            self.overruns += max(0, len(buf) - room)
+            return len(buf)
+
+        def readinto(self, buf: bytearray) -> Optional[int]:
+            """Reads whatever has arrived into ``buf``."""
+            backend.transaction()
+            count = min(len(buf), len(self._received))
+            if not count:
+                return None
+            buf[:count] = self._received[:count]
+            del self._received[:count]
+            return count
+
+        def read(self, nbytes: Optional[int] = None) -> Optional[bytes]:
+            """Reads up to ``nbytes`` bytes that have arrived."""
+            buf = bytearray(len(self._received) if nbytes is None else nbytes)
+            count = self.readinto(buf)
+            return None if count is None else bytes(buf[:count])
+
+        def reset_input_buffer(self) -> None:
+            """Empties the receive buffer."""
+            self._received = bytearray()
+
+        def deinit(self) -> None:
+            """Releases the pins."""
+            self._received = bytearray()
+
+    module = types.ModuleType("busio")
+    module.I2C = I2C
+    module.SPI = SPI
+    module.UART = UART
+    return module
+
+
+def _digitalio_module(backend: SimulatedBackend) -> types.ModuleType:
+    class Direction:  # pylint: disable=too-few-public-methods
+        """Simulated ``digitalio.Direction``."""
+
+        INPUT = "INPUT"
+        OUTPUT = "OUTPUT"
+
+    class Pull:  # pylint: disable=too-few-public-methods,invalid-name
+        """Simulated ``digitalio.Pull``."""
+
+        UP = "UP"
+        DOWN = "DOWN"
+
+    class DriveMode:  # pylint: disable=too-few-public-methods
+        """Simulated ``digitalio.DriveMode``."""
+
+        PUSH_PULL = "PUSH_PULL"
+        OPEN_DRAIN = "OPEN_DRAIN"
+
+    class DigitalInOut:
+        """
+        Simulated ``digitalio.DigitalInOut``. Outputs drive the pins wired to
+        them in the backend's ``nets``, the SD card detect pin reads low while
+        the card is inserted, and driving an SPI device's CS pin selects it.
+        """
+
+        def __init__(self, pin: Pin) -> None:
+            self.pin = pin
+            self.pull = None
+            self.drive_mode = DriveMode.PUSH_PULL
+            self._direction = Direction.INPUT
+            self._value = False
+
+        @property
+        def direction(self) -> str:
+            """Direction of the pin."""
+            return self._direction
+
+        @direction.setter
+        def direction(self, direction: str) -> None:
+            self._direction = direction
+            if direction == Direction.OUTPUT:
+                backend.drivers[self.pin.name] = self._value
+            else:
+                backend.drivers.pop(self.pin.name, None)
+
+        @property
+        def value(self) -> bool:
+            """Level of the pin."""
+            name = self.pin.name
+            if name == SD_CD_PIN_NAME:
+                return not backend.sd_card.inserted
+            if self._direction == Direction.OUTPUT:
+                return backend.stuck.get(name, self._value)
+            return backend.level(name, self.pull == Pull.UP)
+
+        @value.setter
+        def value(self, value: bool) -> None:
+            name = self.pin.name
+            self._value = bool(value)
+            if self._direction == Direction.OUTPUT:
+                backend.drivers[name] = self._value
+                if backend.counters:
+                    backend.update_counters()
+            if name in backend.spi_devices:
+                backend.spi_devices[name].select(not value)
+
+        def switch_to_output(
+            self, value: bool = False, drive_mode: str = DriveMode.PUSH_PULL
+        ) -> None:
+            """Makes the pin an output."""
+            self.direction = Direction.OUTPUT
+            self.drive_mode = drive_mode
+            self.value = value
+
+        def switch_to_input(self, pull: Optional[str] = None) -> None:
+            """Makes the pin an input."""
+            self.direction = Direction.INPUT
+            self.pull = pull
+
+        def deinit(self) -> None:
+            """Releases the pin."""
+            backend.drivers.pop(self.pin.name, None)
+
+    module = types.ModuleType("digitalio")
+    module.Direction = Direction
+    module.Pull = Pull
+    module.DriveMode = DriveMode
+    module.DigitalInOut = DigitalInOut
+    return module
+
+
+def _countio_module(backend: SimulatedBackend) -> types.ModuleType:
+    class Edge:  # pylint: disable=too-few-public-methods
+        """Simulated ``countio.Edge``."""
+
+        RISE = "RISE"
+        FALL = "FALL"
+        RISE_AND_FALL = "RISE_AND_FALL"
+
+    class Counter:
+        """
+        Simulated ``countio.Counter``. Counts the edges its pin sees as the
+        outputs wired to it change.
+        """
+
+        def __init__(
+            self, pin: Pin, *, edge: str = Edge.FALL, pull: Optional[str] = None
+        ) -> None:
+            # pylint: disable=unused-argument
+            self.pin = pin
+            self.edge = edge
+            self.count = 0
+            self._level = backend.level(pin.name, False)
+            backend.counters.append(self)
+
+        def update(self) -> None:
+            """Counts an edge if the level of the pin changed."""
+            level = backend.level(self.pin.name, False)
+            if level == self._level:
+                return
+            self._level = level
+            if self.edge == Edge.RISE_AND_FALL or (self.edge == Edge.RISE) == level:
+                self.count += 1
+
+        def reset(self) -> None:
+            """Sets the count back to zero."""
+            self.count = 0
+
+        def deinit(self) -> None:
+            """Releases the pin."""
+            if self in backend.counters:
+                backend.counters.remove(self)
+
+    module = types.ModuleType("countio")
+    module.Edge = Edge
+    module.Counter = Counter
+    return module
+
+
+def _analogio_module(backend: SimulatedBackend) -> types.ModuleType:
+    class AnalogIn:
+        """
+        Simulated ``analogio.AnalogIn``. It reads the voltage set for the pin
+        in the backend's ``analog`` dictionary.
+        """
+
+        def __init__(self, pin: Pin) -> None:
+            self.pin = pin
+            self.reference_voltage = ANALOG_REF
+
+        @property
+        def value(self) -> int:
+            """Reading scaled to 16 bits."""
+            return backend.analog_value(self.pin.name)
+
+        def deinit(self) -> None:
+            """Releases the pin."""
+
+    class AnalogOut:
+        """
+        Simulated ``analogio.AnalogOut``. It only works on the pins in
+        `DAC_PIN_NAMES`.
+        """
+
+        def __init__(self, pin: Pin) -> None:
+            if pin.name not in DAC_PIN_NAMES:
+                raise ValueError("AnalogOut not supported on given pin")
+            self.pin = pin
+            self._value = 0
+            backend.analog_outputs[pin.name] = 0.0
+
+        @property
+        def value(self) -> int:
+            """Output level scaled to 16 bits."""
+            return self._value
+
+        @value.setter
+        def value(self, value: int) -> None:
+            self._value = value
+            backend.analog_outputs[self.pin.name] = (
+                value * ANALOG_REF / (2**ANALOGIN_BITS)
+            )
+
+        def deinit(self) -> None:
+            """Releases the pin."""
+            backend.analog_outputs.pop(self.pin.name, None)
+
+    module = types.ModuleType("analogio")
+    module.AnalogIn = AnalogIn
+    module.AnalogOut = AnalogOut
+    return module
+
+
+def _analogbufio_module(backend: SimulatedBackend) -> types.ModuleType:
+    class BufferedIn:
+        """
+        Simulated ``analogbufio.BufferedIn``. It fills a buffer with readings
+        like `SimulatedBackend.analog_value`, taking as long as the sample
+        rate says it would.
+        """
+
+        def __init__(self, pin: Pin, *, sample_rate: int) -> None:
+            self.pin = pin
+            self.sample_rate = sample_rate
+
+        def readinto(self, buffer: Any) -> int:
+            """Fills the buffer with readings."""
+            count = len(buffer)
+            for i in range(count):
+                buffer[i] = backend.analog_value(self.pin.name)
+            time.sleep(count / self.sample_rate)
+            return count
+
+        def deinit(self) -> None:
+            """Releases the pin."""
+
+    module = types.ModuleType("analogbufio")
+    module.BufferedIn = BufferedIn
+    return module
+
+
+def _storage_module(backend: SimulatedBackend) -> types.ModuleType:
+    class VfsFat:  # pylint: disable=too-few-public-methods
+        """Simulated ``storage.VfsFat``."""
+
+        def __init__(self, block_device: Any) -> None:
+            self.block_device = block_device
+
+    def mount(filesystem: VfsFat, mount_path: str, *, readonly: bool = False) -> None:
+        """Mounts a filesystem."""
+        # pylint: disable=unused-argument
+        if mount_path in backend.mounts:
+            raise OSError(1, "Operation not permitted")
+        backend.mounts[mount_path] = filesystem
+
+    def umount(mount: str) -> None:
+        """Unmounts a filesystem."""
+        if mount not in backend.mounts:
+            raise OSError(22, "Invalid argument")
+        del backend.mounts[mount]
+
+    module = types.ModuleType("storage")
+    module.VfsFat = VfsFat
+    module.mount = mount
+    module.umount = umount
+    return module
+
+
+def _sdcard_module(backend: SimulatedBackend) -> types.ModuleType:
+    class SDCard:  # pylint: disable=too-few-public-methods
+        """
+        Simulated ``adafruit_sdcard.SDCard``. Fails like the driver does
+        when no card is inserted.
+        """
+
+        def __init__(self, spi: Any, cs: Any, baudrate: int = 1320000) -> None:
+            # pylint: disable=invalid-name
+            backend.transaction()
+            if not backend.sd_card.inserted:
+                raise OSError("no SD card")
+            self.spi = spi
+            self.cs = cs
+            self.baudrate = baudrate
+            backend.sd_card.inits += 1
+            backend.sd_card.baud_rate = baudrate
+
+    module = types.ModuleType("adafruit_sdcard")
+    module.SDCard = SDCard
+    return module